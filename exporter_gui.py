@@ -102,13 +102,15 @@ class ExportWorker(QThread):
     finished = Signal(bool, str, list)  # Success flag, message, output files
     element_count = Signal(int, int, int)  # constants, flags, tables
     
-    def __init__(self, xdf_path: str, bin_path: str, output_path: str, formats: list, skip_validation: bool = False):
+    def __init__(self, xdf_path: str, bin_path: str, output_path: str, formats: list,
+                 skip_validation: bool = False, profile: bool = False):
         super().__init__()
         self.xdf_path = xdf_path
         self.bin_path = bin_path
         self.output_path = output_path
         self.formats = formats
         self.skip_validation = skip_validation
+        self.profile = profile
         self.output_files = []
     
     def run(self):
@@ -116,6 +118,11 @@ class ExportWorker(QThread):
         try:
             self.progress.emit("Loading XDF definition...")
             exporter = UniversalXDFExporter(self.xdf_path, self.bin_path)
+            profiler = None
+            if self.profile:
+                from tunerpro_profile import PhaseProfiler
+                profiler = PhaseProfiler()
+                profiler.instrument(exporter)
             
             if self.skip_validation:
                 self.progress.emit("Skipping validation (forced mode)...")
@@ -166,56 +173,25 @@ class ExportWorker(QThread):
                 elif fmt == 'md':
                     exporter.export_to_markdown(output_file)
                 elif fmt == 'csv':
-                    # Export to CSV format
-                    self._export_csv(exporter, output_file)
+                    exporter.export_to_csv(output_file)
                 
                 self.output_files.append(output_file)
             
+            if profiler is not None:
+                for line in profiler.format_summary():
+                    self.progress.emit(line)
+                output_base = Path(self.output_path)
+                if output_base.suffix.lower() in ['.txt', '.json', '.md', '.text', '.test', '.csv']:
+                    output_base = output_base.with_suffix('')
+                trace_file = f"{output_base}.trace.json"
+                profiler.write_trace(trace_file)
+                self.progress.emit(f"Trace written: {trace_file} (open in chrome://tracing)")
+            
             files_str = ", ".join([Path(f).name for f in self.output_files])
             self.finished.emit(True, f"Export complete!\n\nCreated: {files_str}", self.output_files)
         
         except Exception as e:
             self.finished.emit(False, f"Export failed!\n\nError: {str(e)}", [])
-    
-    def _export_csv(self, exporter, output_file: str):
-        """Export to CSV format for spreadsheet analysis"""
-        import csv
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Type', 'Category', 'Title', 'Address', 'Value', 'Units', 'Description'])
-            
-            for const in exporter.elements['constants']:
-                writer.writerow([
-                    'Constant',
-                    const.get('category', 'Uncategorized'),
-                    const.get('title', 'Unknown'),
-                    f"0x{const.get('address', 0):X}",
-                    const.get('value', ''),
-                    const.get('units', ''),
-                    const.get('description', '')[:100]
-                ])
-            
-            for flag in exporter.elements['flags']:
-                writer.writerow([
-                    'Flag',
-                    flag.get('category', 'Uncategorized'),
-                    flag.get('title', 'Unknown'),
-                    f"0x{flag.get('address', 0):X}",
-                    'Set' if flag.get('value', False) else 'Not Set',
-                    '',
-                    flag.get('description', '')[:100]
-                ])
-            
-            for table in exporter.elements['tables']:
-                writer.writerow([
-                    'Table',
-                    table.get('category', 'Uncategorized'),
-                    table.get('title', 'Unknown'),
-                    f"0x{table.get('address', 0):X}",
-                    f"{table.get('rows', 0)}x{table.get('cols', 0)}",
-                    table.get('units', ''),
-                    table.get('description', '')[:100]
-                ])
 
 
 class TunerProExporterGUI(QMainWindow):
@@ -514,8 +490,16 @@ class TunerProExporterGUI(QMainWindow):
         self.open_folder_cb.setToolTip("Open the output folder when export completes")
         self.open_folder_cb.setChecked(True)
         
+        # Per-phase timings in the log plus a Chrome trace file
+        self.profile_cb = QCheckBox("Profile export")
+        self.profile_cb.setToolTip(
+            "Log time and call counts per export phase\n"
+            "and write <output>.trace.json (open in chrome://tracing)"
+        )
+        
         layout.addWidget(self.skip_validation_cb)
         layout.addWidget(self.open_folder_cb)
+        layout.addWidget(self.profile_cb)
         layout.addStretch()
         
         return group
@@ -725,7 +709,8 @@ class TunerProExporterGUI(QMainWindow):
         
         # Start worker thread
         skip_validation = self.skip_validation_cb.isChecked()
-        self.worker = ExportWorker(xdf_path, bin_path, output_path, formats, skip_validation)
+        self.worker = ExportWorker(xdf_path, bin_path, output_path, formats, skip_validation,
+                                   self.profile_cb.isChecked())
         self.worker.progress.connect(self.on_progress)
         self.worker.finished.connect(self.on_finished)
         self.worker.element_count.connect(self.on_element_count)
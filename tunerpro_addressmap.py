@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Address Map
+===============================================================================
+
+ Global view of which BIN bytes every XDF element claims.
+
+ - Every constant, flag, table (data block and axes) and patch entry
+   becomes a byte interval, after BASEOFFSET translation
+ - One sweep finds partial overlaps, exact aliases (two elements on the
+   same bytes) and elements that reach past the end of the BIN
+ - Shared axes (many tables pointing at one RPM axis) are reported
+   separately - that aliasing is normal
+ - So are packed flags (several XDFFLAGs on one byte with different mask
+   bits) and flags inside a constant's bytes; flags on one byte are an
+   alias only when their masks share a bit
+ - The sweep also cuts the address space into disjoint segments, so
+   "what is defined at address A" is a binary search: O(log n)
+
+ Usage:
+   python tunerpro_exporter.py addresses <xdf> [bin] [--at ADDR ...] [--json]
+
+   --at takes BIN file offsets (hex 0x... or decimal); add --xdf-address
+   to give XDF/ECU addresses and have BASEOFFSET applied.
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import logging
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+
+
+class AddressIndex:
+    """Sorted disjoint segments over element byte intervals"""
+
+    def __init__(self, intervals: List[Dict], bin_size: Optional[int] = None):
+        """
+        Build the index
+
+        Args:
+            intervals: Dicts with 'start' and 'end' (exclusive) file offsets,
+                       e.g. from UniversalXDFExporter.element_intervals()
+            bin_size: BIN size for out-of-range checks (None = unchecked)
+        """
+        self.intervals = intervals
+        self.bin_size = bin_size
+
+        self._starts: List[int] = []
+        self._segments: List[Tuple[int, int, Tuple[int, ...]]] = []
+        self._build_segments()
+
+    def _build_segments(self):
+        """Sweep start/end events into disjoint (start, end, owners) segments"""
+        events = []
+        for idx, iv in enumerate(self.intervals):
+            events.append((iv['start'], 1, idx))
+            events.append((iv['end'], -1, idx))
+        events.sort()
+
+        active = set()
+        i = 0
+        while i < len(events):
+            pos = events[i][0]
+            while i < len(events) and events[i][0] == pos:
+                _, delta, idx = events[i]
+                if delta > 0:
+                    active.add(idx)
+                else:
+                    active.discard(idx)
+                i += 1
+            if active and i < len(events):
+                self._starts.append(pos)
+                self._segments.append((pos, events[i][0], tuple(sorted(active))))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def at(self, offset: int) -> List[Dict]:
+        """Intervals containing a file offset (O(log n) + result size)"""
+        pos = bisect.bisect_right(self._starts, offset) - 1
+        if pos < 0:
+            return []
+        start, end, owners = self._segments[pos]
+        if offset >= end:
+            return []
+        return [self.intervals[idx] for idx in owners]
+
+    def overlapping(self, start: int, end: int) -> List[Dict]:
+        """Intervals intersecting the file offset range [start, end)"""
+        pos = max(0, bisect.bisect_right(self._starts, start) - 1)
+        seen = {}
+        while pos < len(self._segments) and self._segments[pos][0] < end:
+            seg_start, seg_end, owners = self._segments[pos]
+            if seg_end > start:
+                for idx in owners:
+                    seen.setdefault(idx, self.intervals[idx])
+            pos += 1
+        return list(seen.values())
+
+    def covered_bytes(self) -> int:
+        """Bytes claimed by at least one element"""
+        return sum(end - start for start, end, _ in self._segments)
+
+    def covered_runs(self) -> List[Tuple[int, int]]:
+        """Maximal [start, end) runs claimed by at least one element"""
+        runs: List[List[int]] = []
+        for start, end, _ in self._segments:
+            if runs and runs[-1][1] == start:
+                runs[-1][1] = end
+            else:
+                runs.append([start, end])
+        return [(start, end) for start, end in runs]
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def out_of_range(self) -> List[Dict]:
+        """Intervals with a negative start or reaching past bin_size"""
+        return [iv for iv in self.intervals
+                if iv['start'] < 0 or (self.bin_size is not None and iv['end'] > self.bin_size)]
+
+    def _same_bytes(self) -> List[List[Dict]]:
+        """Groups of two or more intervals covering exactly the same bytes"""
+        groups: Dict[Tuple[int, int], List[Dict]] = {}
+        for iv in self.intervals:
+            groups.setdefault((iv['start'], iv['end']), []).append(iv)
+        return [groups[key] for key in sorted(groups) if len(groups[key]) > 1]
+
+    @staticmethod
+    def _mask(iv: Dict) -> int:
+        return iv.get('element', {}).get('mask', 0xFF)
+
+    @classmethod
+    def _mask_groups(cls, flags: List[Dict]) -> List[List[Dict]]:
+        """Flags on one byte joined into groups whose masks (transitively) share bits"""
+        groups: List[Tuple[int, List[Dict]]] = []
+        for flag in flags:
+            mask, members = cls._mask(flag), [flag]
+            for group in [g for g in groups if g[0] & mask]:
+                groups.remove(group)
+                mask |= group[0]
+                members = group[1] + members
+            groups.append((mask, members))
+        return [members for _, members in groups]
+
+    def aliases(self) -> Tuple[List[List[Dict]], List[List[Dict]]]:
+        """
+        Groups of intervals covering exactly the same bytes
+
+        Flags on one byte are only an alias when their masks share a bit
+        (see packed_flags()); flags sharing a constant's bytes are left to
+        flags_in_constants().
+
+        Returns:
+            Tuple: (aliases, shared_axes) - groups made only of table axes
+                   are shared axes, everything else is an alias
+        """
+        aliases, shared_axes = [], []
+        for group in self._same_bytes():
+            flags = [iv for iv in group if iv['kind'] == 'flag']
+            others = [iv for iv in group if iv['kind'] != 'flag']
+            if flags and not any(iv['kind'] == 'constant' for iv in others):
+                if others:
+                    aliases.append(group)
+                    continue
+                aliases.extend(g for g in self._mask_groups(flags) if len(g) > 1)
+            if len(others) < 2:
+                continue
+            if all(iv['kind'] == 'axis' for iv in others):
+                shared_axes.append(others)
+            else:
+                aliases.append(others)
+        return aliases, shared_axes
+
+    def packed_flags(self) -> List[List[Dict]]:
+        """Flags sharing one byte with disjoint mask bits (ordinary bitfields)"""
+        packed = []
+        for group in self._same_bytes():
+            flags = [iv for iv in group if iv['kind'] == 'flag']
+            if len(flags) > 1:
+                separate = [g[0] for g in self._mask_groups(flags) if len(g) == 1]
+                if len(separate) > 1:
+                    packed.append(separate)
+        return packed
+
+    def flags_in_constants(self) -> List[Dict]:
+        """
+        Flags on a byte of a constant (a bit of an option word)
+
+        Returns:
+            List[Dict]: 'flag' and 'constant' intervals
+        """
+        found = []
+        for iv in self.intervals:
+            if iv['kind'] != 'flag':
+                continue
+            for other in self.overlapping(iv['start'], iv['end']):
+                if other['kind'] == 'constant':
+                    found.append({'flag': iv, 'constant': other})
+        return found
+
+    def overlaps(self) -> List[Dict]:
+        """
+        Pairs of intervals that partially overlap (exact aliases excluded)
+
+        Returns:
+            List[Dict]: 'a', 'b' (intervals) and 'bytes' (overlap length)
+        """
+        order = sorted(range(len(self.intervals)), key=lambda i: self.intervals[i]['start'])
+        ending: List[Tuple[int, int]] = []  # heap of (end, idx)
+        active = set()
+        pairs = []
+
+        for idx in order:
+            iv = self.intervals[idx]
+            while ending and ending[0][0] <= iv['start']:
+                active.discard(heapq.heappop(ending)[1])
+            for other_idx in active:
+                other = self.intervals[other_idx]
+                if other['start'] == iv['start'] and other['end'] == iv['end']:
+                    continue  # Exact alias - reported by aliases()
+                if {other['kind'], iv['kind']} == {'flag', 'constant'}:
+                    continue  # Reported by flags_in_constants()
+                pairs.append({
+                    'a': other,
+                    'b': iv,
+                    'bytes': min(other['end'], iv['end']) - iv['start']
+                })
+            active.add(idx)
+            heapq.heappush(ending, (iv['end'], idx))
+
+        return pairs
+
+    def report(self) -> Dict:
+        """All findings in one dict (intervals keep their element refs)"""
+        aliases, shared_axes = self.aliases()
+        return {
+            'intervals': len(self.intervals),
+            'segments': len(self._segments),
+            'covered_bytes': self.covered_bytes(),
+            'bin_size': self.bin_size,
+            'overlaps': self.overlaps(),
+            'aliases': aliases,
+            'shared_axes': shared_axes,
+            'packed_flags': self.packed_flags(),
+            'flags_in_constants': self.flags_in_constants(),
+            'out_of_range': self.out_of_range()
+        }
+
+
+def build_index(exporter: UniversalXDFExporter) -> AddressIndex:
+    """Address index for a parsed exporter (bin_size used if a BIN is loaded)"""
+    bin_size = exporter.bin_size if exporter.bin_data is not None else None
+    return AddressIndex(exporter.element_intervals(), bin_size)
+
+
+def describe(iv: Dict) -> str:
+    """One-line description of an interval"""
+    part = f" [{iv['part']}]" if iv['part'] else ""
+    if iv['kind'] == 'flag':
+        part += f" mask 0x{AddressIndex._mask(iv):02X}"
+    return (f"{iv['kind']:<8} 0x{iv['start']:06X}-0x{iv['end'] - 1:06X} "
+            f"{iv['title']}{part}")
+
+
+def _json_interval(iv: Dict) -> Dict:
+    return {'kind': iv['kind'], 'title': iv['title'], 'part': iv['part'],
+            'start': iv['start'], 'end': iv['end']}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Address map command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py addresses",
+        description="Find overlapping, aliased and out-of-range XDF elements"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bin', nargs='?', default=None,
+                        help="BIN file (enables out-of-range checks)")
+    parser.add_argument('--at', action='append', default=[], metavar='ADDR',
+                        help="Show what is defined at an address (repeatable)")
+    parser.add_argument('--xdf-address', action='store_true',
+                        help="--at values are XDF addresses (apply BASEOFFSET)")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="Max entries listed per finding (default: 20)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    exporter = UniversalXDFExporter(args.xdf, args.bin or "")
+    if not exporter.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if args.bin and not exporter.validate_bin_file():
+        print(f"❌ Binary validation failed: {args.bin}")
+        return 1
+
+    index = build_index(exporter)
+
+    lookups = []
+    for text in args.at:
+        try:
+            address = int(text, 0)
+        except ValueError:
+            parser.error(f"invalid address: {text}")
+        offset = exporter._xdf_addr_to_file_offset(address) if args.xdf_address else address
+        lookups.append((text, offset, index.at(offset)))
+
+    if lookups and not args.json:
+        for text, offset, hits in lookups:
+            print(f"{text} (file offset 0x{offset:06X}):")
+            for iv in hits:
+                print(f"  {describe(iv)}")
+            if not hits:
+                print("  (nothing defined)")
+        return 0
+
+    report = index.report()
+
+    if args.json:
+        output = {
+            'definition': exporter.definition_name,
+            'intervals': report['intervals'],
+            'covered_bytes': report['covered_bytes'],
+            'bin_size': report['bin_size'],
+            'overlaps': [{'a': _json_interval(p['a']), 'b': _json_interval(p['b']),
+                          'bytes': p['bytes']} for p in report['overlaps']],
+            'aliases': [[_json_interval(iv) for iv in g] for g in report['aliases']],
+            'shared_axes': [[_json_interval(iv) for iv in g] for g in report['shared_axes']],
+            'packed_flags': [[dict(_json_interval(iv), mask=AddressIndex._mask(iv)) for iv in g]
+                             for g in report['packed_flags']],
+            'flags_in_constants': [{'flag': _json_interval(p['flag']),
+                                    'constant': _json_interval(p['constant'])}
+                                   for p in report['flags_in_constants']],
+            'out_of_range': [_json_interval(iv) for iv in report['out_of_range']],
+        }
+        if lookups:
+            output['lookups'] = {text: [_json_interval(iv) for iv in hits]
+                                 for text, _, hits in lookups}
+        print(json.dumps(output, indent=2))
+    else:
+        print(f"Definition: {exporter.definition_name}")
+        print(f"Intervals:  {report['intervals']} ({report['covered_bytes']:,} bytes claimed"
+              + (f" of {report['bin_size']:,})" if report['bin_size'] else ")"))
+        print()
+
+        def listing(title: str, items: List, fmt):
+            print(f"{title}: {len(items)}")
+            for item in items[:args.limit]:
+                for line in fmt(item):
+                    print(f"  {line}")
+            if len(items) > args.limit:
+                print(f"  ... {len(items) - args.limit} more")
+
+        listing("Out of range", report['out_of_range'], lambda iv: [describe(iv)])
+        listing("Aliases (same bytes)", report['aliases'],
+                lambda g: [describe(g[0])] + [f"  = {describe(iv)}" for iv in g[1:]])
+        listing("Overlaps", report['overlaps'],
+                lambda p: [describe(p['a']), f"  x {describe(p['b'])} ({p['bytes']} bytes)"])
+        print(f"Shared axes: {len(report['shared_axes'])} "
+              f"(axes used by several tables - normal)")
+        print(f"Packed flag bytes: {len(report['packed_flags'])} "
+              f"(flags on one byte with separate mask bits - normal)")
+        print(f"Flags in constants: {len(report['flags_in_constants'])} "
+              f"(bits of an option word - informational)")
+
+    # Shared axes, packed flags and flags in constants are not problems
+    problems = report['out_of_range'] or report['aliases'] or report['overlaps']
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - BASEOFFSET Detection
+===============================================================================
+
+ Check the XDF's BASEOFFSET against the BIN actually being exported, and
+ find a better one when it doesn't fit (a 128KB-calibration XDF against a
+ 512KB full dump, or the other way round).
+
+ - A BASEOFFSET is a shift between XDF addresses and file offsets
+   (+offset, or -offset with subtract="1"); every shift that keeps the
+   whole definition inside the BIN on a 4KB grid is a candidate, plus the
+   declared one and none at all
+ - Evidence, gathered once per definition in XDF address space:
+     * patch entries whose bytes are the base or patch data
+     * scalars within their declared range (pre-converted to raw bounds)
+     * table blocks that aren't uniform 0x00/0xFF fill
+     * table smoothness (the anomaly score of the raw cells) - computed
+       for the shortlist only, the rest is a byte/struct pass per shift
+ - The best shift is recommended when it beats the declared one by
+   APPLY_MARGIN; 'tunerpro_exporter.py ... --auto-base' applies it
+
+ Usage:
+   python tunerpro_exporter.py baseoffset <xdf> <bin> [--top N] [--json]
+   python tunerpro_exporter.py <xdf> <bin> <output> [format] --auto-base
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter, compute_table_anomaly, raw_bounds, struct_format
+
+
+# Candidate shifts are multiples of this (flash sectors / bank boundaries);
+# doubled until there are at most MAX_CANDIDATES
+ALIGNMENT = 0x1000
+MAX_CANDIDATES = 512
+
+# Evidence size limits - enough to separate candidates, cheap per shift
+MAX_SCALARS = 128
+MAX_BLOCKS = 32
+MAX_PATCH_ENTRIES = 128
+
+# Candidates whose smoothness is measured (the rest are ranked without it)
+SHORTLIST = 8
+
+# Evidence weights for the combined score (renormalised over what exists)
+WEIGHTS = {
+    'patches': 0.35,
+    'scalars': 0.25,
+    'blocks': 0.10,
+    'smoothness': 0.30,
+}
+
+# A shift is recommended over the declared BASEOFFSET when it scores this
+# much higher, and at least MIN_SCORE overall
+APPLY_MARGIN = 0.1
+MIN_SCORE = 0.5
+
+
+def shift_of(offset: int, subtract: int) -> int:
+    """File offset - XDF address for a BASEOFFSET"""
+    return -offset if subtract else offset
+
+
+def base_of(shift: int) -> Tuple[int, int]:
+    """(offset, subtract) BASEOFFSET for a shift"""
+    return (-shift, 1) if shift < 0 else (shift, 0)
+
+
+def collect_evidence(exporter: UniversalXDFExporter) -> Dict[str, Any]:
+    """
+    BIN-checkable evidence for a parsed definition, in XDF addresses
+
+    Returns:
+        Dict: 'span' (lowest, highest + 1 address), 'scalars' [(address,
+              Struct, low, high)], 'blocks' [(address, count, code, rows,
+              cols)], 'patches' [(address, base bytes, patch bytes)]
+    """
+    span = exporter._definition_span() or (0, 0)
+
+    scalars = []
+    for const in exporter.elements['constants']:
+        fmt = struct_format(const['size'], const.get('signed', False), const.get('lsb_first', False))
+        bounds = raw_bounds(exporter, const) if fmt else None
+        if bounds is not None:
+            selectivity = (bounds[1] - bounds[0] + 1) / float(1 << const['size'])
+            scalars.append((selectivity, (const['address'], struct.Struct(fmt)) + bounds))
+    scalars.sort(key=lambda item: item[0])
+
+    blocks = []
+    for table in exporter.elements['tables']:
+        z_axis = table['axes'].get('z', {})
+        rows, cols = exporter._table_dimensions(table)
+        fmt = struct_format(z_axis.get('size_bits', 8), z_axis.get('signed', False),
+                             z_axis.get('lsb_first', False))
+        addresses = exporter._table_cell_addresses(table)
+        if fmt and addresses and rows * cols >= 9:
+            blocks.append((min(addresses), rows * cols, fmt, rows, cols))
+    blocks.sort(key=lambda block: -block[1])
+
+    patches = [(entry['address'], entry['base_bytes'], entry['patch_bytes'])
+               for patch in exporter.elements['patches'] for entry in patch['entries']
+               if entry['base_bytes'] or entry['patch_bytes']]
+
+    return {
+        'span': span,
+        'scalars': [item[1] for item in scalars[:MAX_SCALARS]],
+        'blocks': blocks[:MAX_BLOCKS],
+        'patches': patches[:MAX_PATCH_ENTRIES],
+    }
+
+
+def candidate_shifts(evidence: Dict[str, Any], bin_size: int, declared: int) -> List[int]:
+    """Aligned shifts that keep the definition inside the BIN, plus declared and 0"""
+    low, high = evidence['span']
+    first, last = -low, bin_size - high
+    alignment = ALIGNMENT
+    while last >= first and (last - first) // alignment + 1 > MAX_CANDIDATES:
+        alignment *= 2
+    shifts = {declared, 0}
+    if last >= first:
+        start = -(-first // alignment) * alignment  # Round up to the grid
+        shifts.update(range(start, last + 1, alignment))
+    return sorted(shifts)
+
+
+def _smoothness(evidence: Dict[str, Any], data: bytes, shift: int) -> Tuple[float, int]:
+    """Summed (1 - anomaly score) over the table blocks, and the block count"""
+    total = 0.0
+    for address, count, fmt, rows, cols in evidence['blocks']:
+        offset = address + shift
+        size = struct.calcsize(fmt)
+        if offset < 0 or offset + count * size > len(data):
+            continue
+        values = struct.unpack_from(f'{fmt[0]}{count}{fmt[1]}', data, offset)
+        anomaly = compute_table_anomaly([list(values[r * cols:(r + 1) * cols]) for r in range(rows)])
+        # Flat blocks (fill) score 0 - no sign of calibration data
+        total += 1.0 - anomaly['score'] if anomaly else 0.0
+    return total, len(evidence['blocks'])
+
+
+def score_shift(evidence: Dict[str, Any], data: bytes, shift: int,
+                smoothness: bool = False) -> Dict[str, Any]:
+    """
+    Score one shift
+
+    Args:
+        evidence: collect_evidence() result
+        data: BIN image
+        shift: File offset - XDF address
+        smoothness: Also measure table smoothness (slower)
+
+    Returns:
+        Dict: 'shift', 'base_offset', 'subtract', 'score' (0.0-1.0),
+              'evidence' (kind -> (hits, total)) and 'out_of_range'
+    """
+    size = len(data)
+    hits: Dict[str, Tuple[float, int]] = {}
+
+    if evidence['patches']:
+        matched = 0
+        for address, base, patch in evidence['patches']:
+            offset = address + shift
+            length = len(base or patch)
+            actual = data[offset:offset + length] if offset >= 0 else b''
+            if len(actual) == length and (actual == base or actual == patch):
+                matched += 1
+        hits['patches'] = (matched, len(evidence['patches']))
+
+    if evidence['scalars']:
+        in_range = 0
+        for address, fmt, low, high in evidence['scalars']:
+            offset = address + shift
+            if offset < 0 or offset + fmt.size > size:
+                continue
+            raw = data[offset:offset + fmt.size]
+            if raw.count(0xFF) == fmt.size:
+                continue  # Erased flash - not a calibration value
+            if low <= fmt.unpack(raw)[0] <= high:
+                in_range += 1
+        hits['scalars'] = (in_range, len(evidence['scalars']))
+
+    if evidence['blocks']:
+        plausible = 0
+        for address, count, fmt, _, _ in evidence['blocks']:
+            offset = address + shift
+            length = count * struct.calcsize(fmt)
+            block = data[offset:offset + length] if offset >= 0 else b''
+            if len(block) == length and block.count(block[:1]) != length:
+                plausible += 1
+        hits['blocks'] = (plausible, len(evidence['blocks']))
+        if smoothness:
+            hits['smoothness'] = _smoothness(evidence, data, shift)
+
+    weight = sum(WEIGHTS[k] for k in hits)
+    score = sum(WEIGHTS[k] * hit / total for k, (hit, total) in hits.items() if total) / weight if weight else 0.0
+
+    low, high = evidence['span']
+    offset, subtract = base_of(shift)
+    return {
+        'shift': shift,
+        'base_offset': offset,
+        'subtract': subtract,
+        'score': round(score, 4),
+        'evidence': hits,
+        'out_of_range': low + shift < 0 or high + shift > size
+    }
+
+
+def detect_base_offset(exporter: UniversalXDFExporter, top: int = 5) -> Dict[str, Any]:
+    """
+    Rank candidate BASEOFFSETs for the exporter's parsed XDF and loaded BIN
+
+    Returns:
+        Dict: 'declared' and 'best' (score_shift results), 'candidates'
+              (top N, best first), 'recommend' (best should replace the
+              declared offset), 'span', 'bin_size', 'tested'
+    """
+    evidence = collect_evidence(exporter)
+    data = exporter.bin_data
+    declared_shift = shift_of(exporter.base_offset, exporter.base_subtract)
+    shifts = candidate_shifts(evidence, len(data), declared_shift)
+
+    # Cheap pass over every shift, smoothness only for the shortlist
+    ranked = sorted((score_shift(evidence, data, shift) for shift in shifts),
+                    key=lambda r: (-r['score'], abs(r['shift'] - declared_shift)))
+    shortlist = {r['shift'] for r in ranked[:SHORTLIST]} | {declared_shift}
+    final = [score_shift(evidence, data, shift, smoothness=True) for shift in sorted(shortlist)]
+    final.sort(key=lambda r: (r['out_of_range'], -r['score'], abs(r['shift'] - declared_shift)))
+
+    declared = next(r for r in final if r['shift'] == declared_shift)
+    best = final[0]
+    recommend = (best['shift'] != declared_shift and best['score'] >= MIN_SCORE
+                 and best['score'] - declared['score'] >= APPLY_MARGIN)
+    return {
+        'declared': declared,
+        'best': best,
+        'recommend': recommend,
+        'candidates': final[:top],
+        'span': evidence['span'],
+        'bin_size': len(data),
+        'tested': len(shifts)
+    }
+
+
+def describe(result: Dict[str, Any]) -> str:
+    """One-line description of a scored shift"""
+    parts = []
+    for kind, (hit, total) in result['evidence'].items():
+        parts.append(f"{kind} {hit:.1f}/{total}" if isinstance(hit, float) else f"{kind} {hit}/{total}")
+    note = " [out of range]" if result['out_of_range'] else ""
+    return (f"offset 0x{result['base_offset']:X} subtract={result['subtract']}: "
+            f"score {result['score']:.2f} ({', '.join(parts) or 'no evidence'}){note}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """BASEOFFSET detection command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py baseoffset",
+        description="Check the XDF's BASEOFFSET against a BIN and find a better one"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bin', help="BIN file")
+    parser.add_argument('--top', type=int, default=5, help="Candidates listed (default: 5)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    exporter = UniversalXDFExporter(args.xdf, args.bin)
+    if not exporter.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if not exporter.validate_bin_file():
+        print(f"❌ Binary validation failed: {args.bin}")
+        return 1
+
+    result = detect_base_offset(exporter, args.top)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    low, high = result['span']
+    print(f"Definition: {exporter.definition_name}")
+    print(f"XDF span:   0x{low:X}-0x{high - 1:X} ({high - low:,} bytes), "
+          f"BIN {result['bin_size']:,} bytes, {result['tested']} offsets tested")
+    print(f"Declared:   {describe(result['declared'])}")
+    print()
+    for candidate in result['candidates']:
+        mark = "→" if candidate is result['best'] else " "
+        print(f"  {mark} {describe(candidate)}")
+    print()
+    if result['recommend']:
+        best = result['best']
+        print(f"Recommended: <BASEOFFSET offset=\"{best['base_offset']}\" "
+              f"subtract=\"{best['subtract']}\" />  (or export with --auto-base)")
+    else:
+        print("✓ The declared BASEOFFSET fits this BIN best")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
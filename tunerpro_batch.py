@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Batch Mode
+===============================================================================
+
+ Export one XDF definition against many BIN files in a single run.
+
+ - The XDF is parsed ONCE, not once per BIN
+ - BINs are fanned out to a process pool (throughput scales with cores)
+ - On platforms with fork() the parsed definition is inherited copy-on-write;
+   elsewhere each worker parses the XDF once at startup
+ - Per-BIN outputs plus batch_summary.json with per-file status
+
+ BIN sources:
+ - Directory:  all *.bin files in the folder
+ - Glob:       "tunes/**/*.bin"
+ - Manifest:   text file with one BIN path per line ('#' comments allowed),
+               relative paths are resolved against the manifest's folder
+
+ Usage:
+   python tunerpro_exporter.py batch <xdf> <bins> <output_dir> [options]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tunerpro_exporter import (
+    UniversalXDFExporter, EXPORT_WRITERS, resolve_formats, __version__
+)
+
+
+SUMMARY_FILENAME = "batch_summary.json"
+
+# Parsed definition for the current process. Set in the parent before the
+# pool starts (inherited by fork) or by _init_worker (spawn platforms).
+_TEMPLATE: Optional[UniversalXDFExporter] = None
+
+
+def collect_bin_files(source: str) -> List[Path]:
+    """
+    Resolve a directory, glob pattern or manifest file into BIN paths
+
+    Args:
+        source: Directory, glob pattern, or manifest file path
+
+    Returns:
+        List[Path]: BIN files in a stable (sorted / manifest) order
+    """
+    path = Path(source)
+
+    if path.is_dir():
+        return sorted(p for p in path.iterdir()
+                      if p.is_file() and p.suffix.lower() == '.bin')
+
+    if path.is_file() and path.suffix.lower() != '.bin':
+        # Manifest: one BIN path per line
+        bins = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                bin_path = Path(line)
+                if not bin_path.is_absolute():
+                    bin_path = path.parent / bin_path
+                bins.append(bin_path)
+        return bins
+
+    if path.is_file():
+        return [path]
+
+    return sorted(Path(p) for p in glob.glob(source, recursive=True)
+                  if Path(p).is_file())
+
+
+def load_template(xdf_path: str) -> Optional[UniversalXDFExporter]:
+    """
+    Parse an XDF once without a BIN, for reuse via UniversalXDFExporter.for_bin()
+
+    Returns:
+        UniversalXDFExporter or None if the XDF could not be parsed
+    """
+    template = UniversalXDFExporter(xdf_path, "")
+    if not template.parse_xdf():
+        return None
+    return template
+
+
+def _set_log_level(level: int):
+    """Quieten per-export INFO logging in batch runs"""
+    logging.getLogger('tunerpro_exporter').setLevel(level)
+
+
+def _init_worker(xdf_path: str, log_level: int):
+    """Pool initializer for spawn platforms: parse the XDF once per worker"""
+    global _TEMPLATE
+    _set_log_level(log_level)
+    if _TEMPLATE is None:
+        _TEMPLATE = load_template(xdf_path)
+
+
+def _unique_stems(bin_files: List[Path]) -> List[str]:
+    """Output base names per BIN, de-duplicated for same-named files"""
+    seen: Dict[str, int] = {}
+    stems = []
+    for bin_path in bin_files:
+        stem = bin_path.stem
+        count = seen.get(stem.lower(), 0)
+        seen[stem.lower()] = count + 1
+        stems.append(stem if count == 0 else f"{stem}_{count + 1}")
+    return stems
+
+
+def _export_one(task: Dict) -> Dict:
+    """
+    Export a single BIN using the process-wide parsed definition
+
+    Args:
+        task: dict with 'bin', 'output_base' and 'formats'
+
+    Returns:
+        Dict: Per-file result for the batch summary
+    """
+    start = time.perf_counter()
+    result = {
+        'bin': task['bin'],
+        'status': 'failed',
+        'md5': None,
+        'binary_size': None,
+        'outputs': [],
+        'error': None,
+        'elapsed_s': 0.0
+    }
+
+    try:
+        if _TEMPLATE is None:
+            result['error'] = "XDF definition not available in worker"
+            return result
+
+        exporter = _TEMPLATE.for_bin(task['bin'])
+        if not exporter.validate_bin_file():
+            result['error'] = "Binary validation failed"
+            return result
+
+        result['md5'] = exporter.bin_md5
+        result['binary_size'] = exporter.bin_size
+        if exporter.elements['patches']:
+            result['patches_applied'] = sum(
+                1 for p in exporter.elements['patches'] if exporter.patch_status(p) == 'applied'
+            )
+
+        failed = []
+        for fmt in task['formats']:
+            output_path = f"{task['output_base']}.{fmt}"
+            if getattr(exporter, EXPORT_WRITERS[fmt])(output_path):
+                result['outputs'].append(output_path)
+            else:
+                failed.append(fmt)
+
+        if failed:
+            result['error'] = f"Export failed for: {', '.join(failed)}"
+        else:
+            result['status'] = 'ok'
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    finally:
+        result['elapsed_s'] = round(time.perf_counter() - start, 4)
+
+    return result
+
+
+def run_batch(xdf_path: str, bin_files: List[Path], output_dir: str,
+              formats: List[str], workers: Optional[int] = None,
+              log_level: int = logging.WARNING) -> Dict:
+    """
+    Export every BIN in bin_files against one XDF
+
+    Args:
+        xdf_path: Path to XDF definition file
+        bin_files: BIN files to export
+        output_dir: Folder for per-BIN outputs and batch_summary.json
+        formats: Export formats (keys of EXPORT_WRITERS)
+        workers: Pool size (default: CPU count, 1 = run in-process)
+        log_level: Log level for the exporter during the batch
+
+    Returns:
+        Dict: Batch summary (also written to output_dir/batch_summary.json)
+    """
+    global _TEMPLATE
+
+    started = datetime.now()
+    start = time.perf_counter()
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(bin_files) or 1))
+
+    _TEMPLATE = load_template(xdf_path)
+    if _TEMPLATE is None:
+        raise ValueError(f"XDF parsing failed: {xdf_path}")
+    parse_elapsed = time.perf_counter() - start
+    _set_log_level(log_level)
+
+    tasks = [
+        {
+            'bin': str(bin_path),
+            'output_base': str(out_dir / stem),
+            'formats': formats
+        }
+        for bin_path, stem in zip(bin_files, _unique_stems(bin_files))
+    ]
+
+    if workers == 1:
+        results = [_export_one(task) for task in tasks]
+        start_method = 'inline'
+    else:
+        # fork shares the parsed XDF copy-on-write; macOS fork is unsafe with
+        # system frameworks, so it uses spawn like Windows
+        methods = multiprocessing.get_all_start_methods()
+        use_fork = 'fork' in methods and sys.platform != 'darwin'
+        start_method = 'fork' if use_fork else 'spawn'
+        ctx = multiprocessing.get_context(start_method)
+        initargs = (xdf_path, log_level)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_export_one, tasks, chunksize=chunksize))
+
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in results if r['status'] == 'ok')
+
+    summary = {
+        'metadata': {
+            'xdf': str(xdf_path),
+            'definition': _TEMPLATE.definition_name,
+            'formats': formats,
+            'workers': workers,
+            'start_method': start_method,
+            'started': started.isoformat(),
+            'exporter_version': __version__
+        },
+        'totals': {
+            'bins': len(results),
+            'ok': ok,
+            'failed': len(results) - ok,
+            'xdf_parse_s': round(parse_elapsed, 4),
+            'elapsed_s': round(elapsed, 4),
+            'bins_per_second': round(len(results) / elapsed, 2) if elapsed > 0 else None
+        },
+        'files': results
+    }
+
+    with open(out_dir / SUMMARY_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Batch command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py batch",
+        description="Export many BIN files against one XDF definition"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bins', help="Directory, glob pattern, or manifest file of BINs")
+    parser.add_argument('output_dir', help="Folder for exported files and batch_summary.json")
+    parser.add_argument('-f', '--format', default='txt',
+                        help="txt, json, md, comma list, or all (default: txt)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show per-export log messages")
+    args = parser.parse_args(argv)
+
+    try:
+        formats = resolve_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    bin_files = collect_bin_files(args.bins)
+    if not bin_files:
+        print(f"❌ No BIN files found for: {args.bins}")
+        return 1
+
+    print("=" * 70)
+    print(f"  KingAI TunerPro Exporter v{__version__} - Batch Mode")
+    print("=" * 70)
+    print(f"XDF:     {args.xdf}")
+    print(f"BINs:    {len(bin_files)}")
+    print(f"Formats: {', '.join(formats)}")
+    print()
+
+    try:
+        summary = run_batch(
+            args.xdf, bin_files, args.output_dir, formats, args.workers,
+            log_level=logging.INFO if args.verbose else logging.WARNING
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for result in summary['files']:
+        mark = "✓" if result['status'] == 'ok' else "✗"
+        line = f"  {mark} {Path(result['bin']).name} ({result['elapsed_s']:.2f}s)"
+        if result['error']:
+            line += f" - {result['error']}"
+        print(line)
+
+    totals = summary['totals']
+    print()
+    print("=" * 70)
+    print(f"Definition: {summary['metadata']['definition']}")
+    print(f"Exported {totals['ok']}/{totals['bins']} BINs in {totals['elapsed_s']:.2f}s "
+          f"with {summary['metadata']['workers']} worker(s) "
+          f"[{summary['metadata']['start_method']}]")
+    print(f"Summary: {Path(args.output_dir) / SUMMARY_FILENAME}")
+    return 0 if totals['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Benchmarks
+===============================================================================
+
+ Times each phase of an export on a synthetic XDF/BIN pair (or a real one)
+ and compares against a stored baseline, so a slowdown shows up before a
+ release instead of in someone's batch run.
+
+ - Stages: parse (XDF), load (BIN), decode (raw reads of every element),
+   evaluate (equations over every decoded value), tables (decode + stats
+   + anomaly per table), one stage per writer (tables already analysed),
+   and end_to_end (fresh exporter -> text export)
+ - Each stage runs --repeat times; min and median are kept, the min is
+   compared (least affected by a busy machine)
+ - Results are JSON (-o); --baseline compares and exits 1 when a stage is
+   slower by more than --tolerance (and by more than NOISE_FLOOR seconds)
+
+ Usage:
+   python tunerpro_exporter.py bench [--scale medium] [--repeat 3]
+       [-o results.json] [--baseline baseline.json] [--tolerance 0.25]
+   python tunerpro_exporter.py bench --xdf def.xdf --bin tune.bin
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from tunerpro_exporter import EXPORT_WRITERS, UniversalXDFExporter, __version__, np
+from tunerpro_synth import LEGACY_SPEC, add_spec_arguments, spec_from_args, write_pair
+
+# Results file layout version (bump when stages change meaning)
+BENCH_FORMAT = 1
+
+# Slower than baseline by this fraction (and NOISE_FLOOR seconds) = regression
+TOLERANCE = 0.25
+NOISE_FLOOR = 0.005
+
+
+def _loaded(xdf_path: str, bin_path: str) -> UniversalXDFExporter:
+    exporter = UniversalXDFExporter(xdf_path, bin_path)
+    if not exporter.validate_bin_file() or not exporter.parse_xdf():
+        raise ValueError(f"cannot load {xdf_path} / {bin_path}")
+    return exporter
+
+
+def _decode_all(exporter: UniversalXDFExporter) -> List[Any]:
+    """Raw value of every constant, flag byte and table cell"""
+    decoded = []
+    for const in exporter.elements['constants']:
+        decoded.append((const.get('equation'), exporter.read_value_from_bin(
+            const['address'], const['size'], signed=const.get('signed', False),
+            lsb_first=const.get('lsb_first', False))))
+    for flag in exporter.elements['flags']:
+        exporter.read_value_from_bin(flag['address'], 8)
+    for table in exporter.elements['tables']:
+        z_axis = table['axes'].get('z', {})
+        addresses = exporter._table_cell_addresses(table)
+        if addresses:
+            raw_values = exporter.read_raw_values(
+                addresses, z_axis.get('size_bits', 8), signed=z_axis.get('signed', False),
+                lsb_first=z_axis.get('lsb_first', False))
+            for raw in raw_values or []:
+                decoded.append((z_axis.get('equation'), raw))
+    return decoded
+
+
+def _evaluate_all(exporter: UniversalXDFExporter, decoded: List[Any]):
+    for equation, raw in decoded:
+        if equation and raw is not None:
+            exporter.evaluate_math(equation, raw)
+
+
+def _time(run: Callable[[Any], Any], setup: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Best/median wall time of run(setup()) over repeat runs (setup untimed)"""
+    runs = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        runs.append(time.perf_counter() - start)
+    return {
+        'min': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6),
+        'runs': [round(r, 6) for r in runs]
+    }
+
+
+def run_benchmarks(xdf_path: str, bin_path: str, repeat: int = 3,
+                   formats: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Time every stage for one XDF/BIN pair
+
+    Args:
+        xdf_path: XDF definition
+        bin_path: BIN image
+        repeat: Runs per stage
+        formats: Writers to time (default: all of EXPORT_WRITERS)
+
+    Returns:
+        Dict: 'stages' (name -> 'min', 'median', 'runs' in seconds) and
+              'counts' (elements in the definition)
+
+    Raises:
+        ValueError: The pair can't be loaded
+    """
+    formats = formats or list(EXPORT_WRITERS)
+    reference = _loaded(xdf_path, bin_path)
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    def clone() -> UniversalXDFExporter:
+        # Shares the parsed definition, fresh per-BIN caches
+        exporter = reference.for_bin(bin_path)
+        exporter.load_bin_bytes(reference.bin_data)
+        return exporter
+
+    def fresh() -> UniversalXDFExporter:
+        exporter = UniversalXDFExporter(xdf_path, bin_path)
+        exporter.validate_bin_file()
+        return exporter
+
+    stages['parse'] = _time(lambda e: e.parse_xdf(), fresh, repeat)
+    stages['load'] = _time(lambda e: e.validate_bin_file(),
+                           lambda: UniversalXDFExporter(xdf_path, bin_path), repeat)
+    stages['decode'] = _time(_decode_all, clone, repeat)
+    decoded = _decode_all(reference)
+    stages['evaluate'] = _time(lambda e: _evaluate_all(e, decoded), clone, repeat)
+
+    def analyse(exporter: UniversalXDFExporter):
+        for table in exporter.elements['tables']:
+            exporter.table_analysis(table)
+
+    stages['tables'] = _time(analyse, clone, repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            method = EXPORT_WRITERS[fmt]
+            output = str(Path(tmp) / f"bench.{fmt}")
+
+            def warm() -> UniversalXDFExporter:
+                exporter = clone()
+                analyse(exporter)
+                return exporter
+
+            stages[f'write_{fmt}'] = _time(lambda e: getattr(e, method)(output), warm, repeat)
+
+        output = str(Path(tmp) / "end_to_end.txt")
+        stages['end_to_end'] = _time(
+            lambda e: e.parse_xdf() and e.export_to_text(output), fresh, repeat)
+
+    return {
+        'stages': stages,
+        'counts': {kind: len(items) for kind, items in reference.elements.items()},
+        'bin_size': reference.bin_size
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Compare stage minimums against a baseline results file
+
+    Returns:
+        List[Dict]: per stage 'stage', 'baseline', 'current' (seconds or
+                    None), 'ratio' and 'status' ('ok', 'regressed',
+                    'improved', 'new' or 'missing')
+
+    Raises:
+        ValueError: The baseline was run on a different workload
+    """
+    if baseline.get('format') != results.get('format'):
+        raise ValueError(f"baseline format {baseline.get('format')} != {results.get('format')}")
+    workload = dict(baseline.get('workload') or {})
+    if 'spec' in workload:
+        # Spec keys added after the baseline was written: the values that
+        # generate the pairs it was measured on
+        workload['spec'] = dict(LEGACY_SPEC, **workload['spec'])
+    if workload != results.get('workload'):
+        raise ValueError("baseline was run on a different workload (spec or input files)")
+
+    rows = []
+    current_stages = results['stages']
+    baseline_stages = baseline.get('stages', {})
+    for stage in list(current_stages) + [s for s in baseline_stages if s not in current_stages]:
+        before = baseline_stages.get(stage, {}).get('min')
+        after = current_stages.get(stage, {}).get('min')
+        ratio = after / before if before and after is not None else None
+        if before is None:
+            status = 'new'
+        elif after is None:
+            status = 'missing'
+        elif after - before > NOISE_FLOOR and after > before * (1 + tolerance):
+            status = 'regressed'
+        elif before - after > NOISE_FLOOR and after < before / (1 + tolerance):
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({'stage': stage, 'baseline': before, 'current': after,
+                     'ratio': round(ratio, 3) if ratio is not None else None, 'status': status})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py bench",
+        description="Time parse, decode, evaluate and each writer; compare with a baseline"
+    )
+    add_spec_arguments(parser)
+    parser.add_argument('--xdf', help="Benchmark this XDF instead of a synthetic one (needs --bin)")
+    parser.add_argument('--bin', help="BIN for --xdf")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per stage (default: 3)")
+    parser.add_argument('--formats', default=','.join(EXPORT_WRITERS),
+                        help="Writers to time (default: all)")
+    parser.add_argument('-o', '--output', metavar='FILE', help="Write results JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare with a stored results JSON")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f"Allowed slowdown vs baseline (default: {TOLERANCE})")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if bool(args.xdf) != bool(args.bin):
+        parser.error("--xdf and --bin go together")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.tolerance < 0:
+        parser.error("--tolerance can't be negative")
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in EXPORT_WRITERS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.xdf:
+            xdf_path, bin_path = args.xdf, args.bin
+            workload = {'xdf': Path(args.xdf).name, 'bin': Path(args.bin).name}
+        else:
+            spec = spec_from_args(args)
+            start = time.perf_counter()
+            xdf_path, bin_path = write_pair(spec, tmp)
+            generated = time.perf_counter() - start
+            workload = {'spec': spec}
+        try:
+            measured = run_benchmarks(str(xdf_path), str(bin_path), args.repeat, formats)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+    results = {
+        'format': BENCH_FORMAT,
+        'workload': workload,
+        'exporter_version': __version__,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': getattr(np, '__version__', None),
+        'repeat': args.repeat,
+        **measured
+    }
+
+    comparison = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                comparison = compare(results, json.load(f), args.tolerance)
+        except (OSError, ValueError) as e:
+            print(f"❌ Baseline {args.baseline}: {e}")
+            return 1
+        results['comparison'] = comparison
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    regressed = [row for row in comparison or [] if row['status'] == 'regressed']
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 1 if regressed else 0
+
+    counts = results['counts']
+    print(f"Workload:  {counts['constants']} constants, {counts['flags']} flags, "
+          f"{counts['tables']} tables, {counts['patches']} patches, "
+          f"BIN {results['bin_size']:,} bytes")
+    if not args.xdf:
+        print(f"Generated: {generated * 1000:.0f} ms (not timed below)")
+    print(f"Python {results['python']}, NumPy {results['numpy'] or 'not installed'}, "
+          f"best of {args.repeat}")
+    print()
+    baseline_rows = {row['stage']: row for row in comparison or []}
+    print(f"  {'Stage':<12} {'Min ms':>9} {'Median ms':>10}" + (f" {'Baseline':>9}  Change" if comparison else ""))
+    for stage, timing in results['stages'].items():
+        line = f"  {stage:<12} {timing['min'] * 1000:>9.1f} {timing['median'] * 1000:>10.1f}"
+        row = baseline_rows.get(stage)
+        if row and row['baseline'] is not None:
+            mark = {'regressed': '  ✗ slower', 'improved': '  ✓ faster'}.get(row['status'], '')
+            line += f" {row['baseline'] * 1000:>9.1f}  {row['ratio']:.2f}x{mark}"
+        print(line)
+    for row in comparison or []:
+        if row['status'] == 'missing':
+            print(f"  {row['stage']:<12} (in baseline, not run)")
+    if args.output:
+        print(f"\nResults: {args.output}")
+    if regressed:
+        print(f"\n❌ {len(regressed)} stage(s) slower than the baseline by more than "
+              f"{args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Checksums
+===============================================================================
+
+ Verify and recompute BIN checksums, so an edited BIN can go straight to
+ the ECU without a separate checksum tool.
+
+ - Algorithms live in a registry (CHECKSUM_ALGORITHMS); ECU-specific ones
+   are added with register_algorithm()
+ - A checksum spec is an algorithm + byte regions + where/how the result
+   is stored (size, byte order, complement)
+ - Specs come from XDFCHECKSUM elements in the definition (verified
+   automatically whenever a BIN is loaded), or from a family preset
+   (gm16, ms4x, ms4x-sum) plus --region/--store on the command line
+ - The stored checksum bytes are always excluded from their own region
+ - Sums run over memoryviews of the image (NumPy when installed,
+   block-wise zlib.adler32 otherwise); CRCs use zlib / binascii
+
+ Usage:
+   python tunerpro_exporter.py checksum <bin> --xdf <xdf> [--fix OUT]
+   python tunerpro_exporter.py checksum <bin> --family gm16 \\
+       --region 0x4000:0x1FFFF --store 0x4006 [--fix OUT]
+
+   Region ends are inclusive; all addresses are BIN file offsets
+   (XDF-declared checksums have BASEOFFSET applied for you).
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import binascii
+import json
+import logging
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Optional NumPy acceleration for the additive sums (pure-Python fallback)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Complement applied to the computed value before it is stored
+COMPLEMENTS = ('none', 'ones', 'twos')
+
+# Adler-32's low half is 1 + (byte sum mod 65521); blocks this small can't
+# reach the modulus (255 * 256 < 65520), so it returns exact block sums
+ADLER_BLOCK = 256
+
+
+# ==============================================================================
+# Summation kernels
+# ==============================================================================
+
+def _byte_sum(view: memoryview) -> int:
+    """Sum of all bytes in a (contiguous) view"""
+    if np is not None:
+        return int(np.frombuffer(view, dtype=np.uint8).sum(dtype=np.uint64))
+
+    # Summing block by block in C is ~5x faster than sum() over the view
+    adler32 = zlib.adler32
+    size = len(view)
+    blocks = (size + ADLER_BLOCK - 1) // ADLER_BLOCK
+    return sum(adler32(view[i:i + ADLER_BLOCK]) & 0xFFFF
+               for i in range(0, size, ADLER_BLOCK)) - blocks
+
+
+def _word_sum(view: memoryview, width: int, byteorder: str) -> int:
+    """
+    Sum of width-byte words (a trailing partial word is zero-padded)
+
+    Args:
+        view: Bytes to sum
+        width: Word size in bytes (2 or 4)
+        byteorder: 'big' or 'little'
+
+    Returns:
+        int: Unmasked sum
+    """
+    aligned = len(view) - len(view) % width
+    if np is not None:
+        dtype = np.dtype(f"{'>' if byteorder == 'big' else '<'}u{width}")
+        total = int(np.frombuffer(view[:aligned], dtype=dtype).sum(dtype=np.uint64))
+        tail = bytes(view[aligned:])
+        if tail:
+            total += int.from_bytes(tail.ljust(width, b'\x00'), byteorder)
+        return total
+
+    # Byte lane k of every word is the strided slice data[k::width]; each
+    # lane is byte-summed and shifted into place (strided slicing of bytes
+    # is a C loop, unlike strided memoryviews)
+    data = view.tobytes()
+    total = 0
+    for lane in range(width):
+        shift = 8 * (width - 1 - lane) if byteorder == 'big' else 8 * lane
+        total += _byte_sum(memoryview(data[lane::width])) << shift
+    return total
+
+
+def _additive(width_bits: int, word_bytes: int = 1, byteorder: str = 'big') -> Callable[[int, memoryview], int]:
+    """Update function for an additive checksum truncated to width_bits"""
+    mask = (1 << width_bits) - 1
+    if word_bytes == 1:
+        return lambda state, view: (state + _byte_sum(view)) & mask
+    return lambda state, view: (state + _word_sum(view, word_bytes, byteorder)) & mask
+
+
+# name -> (update(state, view) -> state, initial state, width in bits)
+CHECKSUM_ALGORITHMS: Dict[str, Tuple[Callable[[int, memoryview], int], int, int]] = {
+    'sum8': (_additive(8), 0, 8),
+    'sum16': (_additive(16), 0, 16),
+    'sum32': (_additive(32), 0, 32),
+    'wordsum16be': (_additive(16, 2, 'big'), 0, 16),
+    'wordsum16le': (_additive(16, 2, 'little'), 0, 16),
+    'wordsum32be': (_additive(32, 4, 'big'), 0, 32),
+    'wordsum32le': (_additive(32, 4, 'little'), 0, 32),
+    'crc16': (lambda state, view: binascii.crc_hqx(view, state), 0, 16),  # CRC-16/XMODEM (poly 0x1021)
+    'crc32': (lambda state, view: zlib.crc32(view, state), 0, 32),
+}
+
+
+def register_algorithm(name: str, update: Callable[[int, memoryview], int],
+                       init: int = 0, width: int = 16):
+    """
+    Add a checksum algorithm to the registry
+
+    Args:
+        name: Algorithm name used in specs / XDF / --algorithm
+        update: Function (state, memoryview) -> new state, called once per
+                region part in address order
+        init: Initial state
+        width: Result width in bits
+    """
+    CHECKSUM_ALGORITHMS[name.lower()] = (update, init, width)
+
+
+# Family presets: algorithm + storage format. Region and store addresses
+# differ per operating system / calibration, so they are always supplied
+# by the XDF or the command line.
+CHECKSUM_FAMILIES: Dict[str, Dict[str, Any]] = {
+    'gm16': {
+        'description': "GM/Delco 16-bit additive byte sum, stored big-endian",
+        'algorithm': 'sum16', 'byte_order': 'big', 'complement': 'none'
+    },
+    'ms4x': {
+        'description': "BMW Siemens MS41/42/43 CRC-16 (0x1021) region check, stored little-endian",
+        'algorithm': 'crc16', 'byte_order': 'little', 'complement': 'none'
+    },
+    'ms4x-sum': {
+        'description': "BMW Siemens MS41/42/43 16-bit word sum, stored little-endian",
+        'algorithm': 'wordsum16le', 'byte_order': 'little', 'complement': 'none'
+    },
+}
+
+
+# ==============================================================================
+# Specs
+# ==============================================================================
+
+def make_spec(title: str, algorithm: str, regions: List[Tuple[int, int]], store: int,
+              store_size: Optional[int] = None, byte_order: str = 'big',
+              complement: str = 'none', source: str = 'cli') -> Dict[str, Any]:
+    """
+    Build and validate a checksum spec
+
+    Args:
+        title: Display name
+        algorithm: CHECKSUM_ALGORITHMS key
+        regions: (start, end) file offsets, end exclusive
+        store: File offset of the stored checksum
+        store_size: Stored size in bytes (default: algorithm width)
+        byte_order: 'big' or 'little'
+        complement: 'none', 'ones' or 'twos'
+        source: Where the spec came from ('xdf', 'family', 'cli')
+
+    Returns:
+        Dict: Checksum spec
+
+    Raises:
+        ValueError: Unknown algorithm/complement/byte order or empty region
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"unknown checksum algorithm '{algorithm}' "
+                         f"(known: {', '.join(sorted(CHECKSUM_ALGORITHMS))})")
+    if complement not in COMPLEMENTS:
+        raise ValueError(f"unknown complement '{complement}' (known: {', '.join(COMPLEMENTS)})")
+    if byte_order not in ('big', 'little'):
+        raise ValueError(f"unknown byte order '{byte_order}'")
+    if not regions or any(end <= start for start, end in regions):
+        raise ValueError(f"checksum '{title}' has an empty region")
+
+    width = CHECKSUM_ALGORITHMS[algorithm][2]
+    return {
+        'title': title,
+        'algorithm': algorithm,
+        'regions': sorted(regions),
+        'store': store,
+        'store_size': store_size or (width + 7) // 8,
+        'byte_order': byte_order,
+        'complement': complement,
+        'source': source
+    }
+
+
+def family_spec(family: str, regions: List[Tuple[int, int]], store: int,
+                **overrides) -> Dict[str, Any]:
+    """
+    Checksum spec from a family preset
+
+    Args:
+        family: CHECKSUM_FAMILIES key
+        regions: (start, end) file offsets, end exclusive
+        store: File offset of the stored checksum
+        **overrides: make_spec() arguments replacing the preset's
+
+    Returns:
+        Dict: Checksum spec
+
+    Raises:
+        ValueError: Unknown family (or invalid override)
+    """
+    if family not in CHECKSUM_FAMILIES:
+        raise ValueError(f"unknown checksum family '{family}' "
+                         f"(known: {', '.join(sorted(CHECKSUM_FAMILIES))})")
+    preset = CHECKSUM_FAMILIES[family]
+    options = {
+        'algorithm': preset['algorithm'],
+        'byte_order': preset['byte_order'],
+        'complement': preset['complement']
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return make_spec(family, regions=regions, store=store, source='family', **options)
+
+
+def _int_text(text: Optional[str]) -> Optional[int]:
+    """
+    Parse an XDF number like mmedaddress: hex with a 0x prefix, otherwise
+    decimal (so "0100" is 100, not 0x100). None if missing/invalid.
+    """
+    if text is None or not text.strip():
+        return None
+    text = text.strip()
+    try:
+        return int(text, 16) if text.lower().startswith('0x') else int(text)
+    except ValueError:
+        return None
+
+
+def _child_text(element, tags: Tuple[str, ...]) -> Optional[str]:
+    """Text of the first child (any case) or attribute named in tags"""
+    for tag in tags:
+        for candidate in (tag, tag.lower()):
+            child = element.find(candidate)
+            if child is not None and child.text:
+                return child.text
+            if element.get(candidate) is not None:
+                return element.get(candidate)
+    return None
+
+
+def parse_xdf_checksums(root, to_offset: Callable[[int], int]) -> List[Dict[str, Any]]:
+    """
+    Read XDFCHECKSUM elements into checksum specs
+
+    Accepts both a flat element and one or more REGION children, each with
+    DATASTART / DATAEND (inclusive) and a STORE / STOREADDRESS /
+    STORESTART address. ALGORITHM, STORESIZE (bytes), BYTEORDER and
+    COMPLEMENT are optional; the default is a big-endian 16-bit byte sum.
+    Entries that cannot be understood are skipped with a warning.
+
+    Args:
+        root: Parsed XDF root element
+        to_offset: XDF address -> BIN file offset (BASEOFFSET translation)
+
+    Returns:
+        List[Dict]: Checksum specs in definition order
+    """
+    logger = logging.getLogger(__name__)
+    specs = []
+
+    for index, element in enumerate(root.findall('.//XDFCHECKSUM')):
+        title_elem = element.find('title')
+        title = (title_elem.text.strip() if title_elem is not None and title_elem.text
+                 else f"Checksum {index + 1}")
+        regions = element.findall('REGION') or [element]
+
+        for part, region in enumerate(regions):
+            def value(tags):
+                text = _child_text(region, tags)
+                return text if text is not None else _child_text(element, tags)
+
+            start = _int_text(value(('DATASTART', 'START')))
+            end = _int_text(value(('DATAEND', 'END')))
+            store = _int_text(value(('STORE', 'STOREADDRESS', 'STORESTART')))
+            if start is None or end is None or store is None:
+                logger.warning(f"Checksum '{title}': missing or invalid start/end/store address "
+                               f"(0x-prefixed hex or decimal), skipped")
+                continue
+
+            order_text = (value(('BYTEORDER',)) or 'big').strip().lower()
+            byte_order = 'little' if order_text in ('little', 'lsb', 'lsbfirst', 'intel') else 'big'
+            label = title if len(regions) == 1 else f"{title} #{part + 1}"
+            try:
+                specs.append(make_spec(
+                    label,
+                    algorithm=(value(('ALGORITHM', 'TYPE')) or 'sum16').strip(),
+                    regions=[(to_offset(start), to_offset(end) + 1)],
+                    store=to_offset(store),
+                    store_size=_int_text(value(('STORESIZE',))),
+                    byte_order=byte_order,
+                    complement=(value(('COMPLEMENT',)) or 'none').strip().lower(),
+                    source='xdf'
+                ))
+            except ValueError as e:
+                logger.warning(f"Checksum '{label}': {e}, skipped")
+
+    return specs
+
+
+# ==============================================================================
+# Verify / recompute
+# ==============================================================================
+
+def _region_parts(spec: Dict[str, Any]) -> List[Tuple[int, int]]:
+    """Spec regions with the store bytes cut out"""
+    store_start = spec['store']
+    store_end = store_start + spec['store_size']
+    parts = []
+    for start, end in spec['regions']:
+        if store_end <= start or store_start >= end:
+            parts.append((start, end))
+            continue
+        if start < store_start:
+            parts.append((start, store_start))
+        if store_end < end:
+            parts.append((store_end, end))
+    return parts
+
+
+def compute_checksum(data, spec: Dict[str, Any]) -> int:
+    """
+    Checksum value as it should be stored (complement applied)
+
+    Args:
+        data: BIN image (bytes, bytearray or memoryview)
+        spec: Checksum spec
+
+    Returns:
+        int: Checksum value
+
+    Raises:
+        ValueError: A region reaches past the end of the image
+    """
+    view = memoryview(data)
+    update, state, _ = CHECKSUM_ALGORITHMS[spec['algorithm']]
+    for start, end in _region_parts(spec):
+        if start < 0 or end > len(view):
+            raise ValueError(f"region 0x{start:X}-0x{end - 1:X} is outside the "
+                             f"{len(view)}-byte image")
+        state = update(state, view[start:end])
+
+    mask = (1 << (8 * spec['store_size'])) - 1
+    if spec['complement'] == 'ones':
+        state = ~state
+    elif spec['complement'] == 'twos':
+        state = -state
+    return state & mask
+
+
+def read_stored(data, spec: Dict[str, Any]) -> Optional[int]:
+    """Stored checksum value, None if the store address is outside the image"""
+    start, end = spec['store'], spec['store'] + spec['store_size']
+    if start < 0 or end > len(data):
+        return None
+    return int.from_bytes(bytes(data[start:end]), spec['byte_order'])
+
+
+def verify_checksum(data, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare the stored checksum with a fresh computation
+
+    Args:
+        data: BIN image
+        spec: Checksum spec
+
+    Returns:
+        Dict: title, algorithm, source, store, stored, computed, ok
+              (+ error when the spec doesn't fit the image)
+    """
+    result = {
+        'title': spec['title'],
+        'algorithm': spec['algorithm'],
+        'source': spec['source'],
+        'store': spec['store'],
+        'stored': read_stored(data, spec),
+        'computed': None,
+        'ok': False
+    }
+    if result['stored'] is None:
+        result['error'] = f"store address 0x{spec['store']:X} is outside the image"
+        return result
+    try:
+        result['computed'] = compute_checksum(data, spec)
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+    result['ok'] = result['computed'] == result['stored']
+    return result
+
+
+def verify_checksums(data, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """verify_checksum() for every spec"""
+    return [verify_checksum(data, spec) for spec in specs]
+
+
+def _covers_store(spec: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    """True if spec's regions include any of other's stored bytes"""
+    store_start, store_end = other['store'], other['store'] + other['store_size']
+    return any(start < store_end and store_start < end for start, end in _region_parts(spec))
+
+
+def fix_order(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order specs so each is recomputed after the checksums stored inside it
+
+    A main checksum over the whole image has to see the final value of a
+    calibration checksum stored within its range. Cycles (two checksums
+    covering each other) can't be satisfied; they keep definition order.
+    """
+    pending = list(specs)
+    ordered = []
+    while pending:
+        ready = [spec for spec in pending
+                 if not any(other is not spec and _covers_store(spec, other) for other in pending)]
+        if not ready:
+            ready = pending[:1]
+        for spec in ready:
+            pending.remove(spec)
+        ordered.extend(ready)
+    return ordered
+
+
+def fix_checksums(buffer: bytearray, specs: List[Dict[str, Any]]) -> int:
+    """
+    Recompute checksums in place
+
+    Checksums stored inside another checksum's region are written first
+    (see fix_order()).
+
+    Args:
+        buffer: Mutable BIN image
+        specs: Checksum specs
+
+    Returns:
+        int: Number of stored checksums that changed
+
+    Raises:
+        ValueError: A spec doesn't fit the image
+    """
+    changed = 0
+    for spec in fix_order(specs):
+        if read_stored(buffer, spec) is None:
+            raise ValueError(f"checksum '{spec['title']}': store address "
+                             f"0x{spec['store']:X} is outside the image")
+        value = compute_checksum(buffer, spec)
+        stored = value.to_bytes(spec['store_size'], spec['byte_order'])
+        start = spec['store']
+        if buffer[start:start + spec['store_size']] != stored:
+            buffer[start:start + spec['store_size']] = stored
+            changed += 1
+    return changed
+
+
+def write_bin(path: str, data) -> None:
+    """Write a BIN image atomically (temp file + rename)"""
+    tmp_path = f"{path}.partial"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        # Don't leave a half-written temp file next to the output
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ==============================================================================
+# Command line
+# ==============================================================================
+
+def _parse_region(text: str) -> Tuple[int, int]:
+    """'START:END' (inclusive end) -> (start, end exclusive)"""
+    try:
+        start_text, end_text = text.split(':')
+        return int(start_text, 0), int(end_text, 0) + 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid region '{text}' (expected START:END)")
+
+
+def _format_result(result: Dict[str, Any], digits: int) -> str:
+    if 'error' in result:
+        return f"❌ {result['title']}: {result['error']}"
+    mark = "✓" if result['ok'] else "✗"
+    line = (f"{mark} {result['title']} ({result['algorithm']} @ 0x{result['store']:X}): "
+            f"stored 0x{result['stored']:0{digits}X}")
+    if not result['ok']:
+        line += f", computed 0x{result['computed']:0{digits}X}"
+    return line
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Checksum command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py checksum",
+        description="Verify or recompute BIN checksums"
+    )
+    parser.add_argument('bin', nargs='?', help="BIN file")
+    parser.add_argument('--xdf', help="XDF with XDFCHECKSUM definitions")
+    parser.add_argument('--family', choices=sorted(CHECKSUM_FAMILIES),
+                        help="Checksum family preset (needs --region and --store)")
+    parser.add_argument('--region', action='append', type=_parse_region, default=[],
+                        metavar='START:END', help="Region for --family (inclusive, repeatable)")
+    parser.add_argument('--store', type=lambda text: int(text, 0), metavar='ADDR',
+                        help="Stored checksum offset for --family")
+    parser.add_argument('--algorithm', help="Override the family's algorithm")
+    parser.add_argument('--store-size', type=int, help="Override the stored size (bytes)")
+    parser.add_argument('--byte-order', choices=['big', 'little'], help="Override the byte order")
+    parser.add_argument('--complement', choices=COMPLEMENTS, help="Override the complement")
+    parser.add_argument('--fix', metavar='OUT', help="Write a copy with corrected checksums")
+    parser.add_argument('--list', action='store_true', help="List algorithms and families")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("Algorithms: " + ", ".join(sorted(CHECKSUM_ALGORITHMS)))
+        print("Families:")
+        for name in sorted(CHECKSUM_FAMILIES):
+            print(f"  {name:<10} {CHECKSUM_FAMILIES[name]['description']}")
+        return 0
+    if not args.bin:
+        parser.error("a BIN file is required")
+
+    specs = []
+    if args.xdf:
+        from tunerpro_exporter import UniversalXDFExporter
+        logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+        exporter = UniversalXDFExporter(args.xdf, args.bin)
+        if not exporter.parse_xdf():
+            print(f"❌ XDF parsing failed: {args.xdf}")
+            return 1
+        specs.extend(exporter.checksums)
+
+    if args.family:
+        if not args.region or args.store is None:
+            parser.error("--family needs at least one --region and --store")
+        try:
+            specs.append(family_spec(args.family, args.region, args.store,
+                                     algorithm=args.algorithm, store_size=args.store_size,
+                                     byte_order=args.byte_order, complement=args.complement))
+        except ValueError as e:
+            parser.error(str(e))
+
+    if not specs:
+        print("❌ No checksums to check (XDF declares none; use --family)")
+        return 1
+
+    try:
+        data = bytearray(Path(args.bin).read_bytes())
+    except OSError as e:
+        print(f"❌ Cannot read {args.bin}: {e}")
+        return 1
+
+    results = verify_checksums(data, specs)
+    fixed = None
+    if args.fix and not any('error' in result for result in results):
+        fixed = fix_checksums(data, specs)
+        try:
+            Path(args.fix).parent.mkdir(parents=True, exist_ok=True)
+            write_bin(args.fix, data)
+        except OSError as e:
+            print(f"❌ Cannot write {args.fix}: {e}")
+            return 1
+
+    if args.json:
+        output = {'bin': args.bin, 'checksums': results}
+        if fixed is not None:
+            output['fixed'] = fixed
+            output['output'] = args.fix
+        print(json.dumps(output, indent=2))
+    else:
+        for spec, result in zip(specs, results):
+            print(_format_result(result, spec['store_size'] * 2))
+        if fixed is not None:
+            print(f"Wrote {args.fix} ({fixed} checksum(s) updated)")
+
+    if any('error' in result for result in results):
+        return 1
+    return 0 if fixed is not None or all(result['ok'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
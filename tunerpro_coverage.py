@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Coverage Map
+===============================================================================
+
+ Which bytes of a BIN does the XDF describe, and where is the data it
+ doesn't?
+
+ - Coverage comes from the address index (constants, flags, table data
+   blocks and axes, patch entries - BASEOFFSET applied), as run-length
+   [start, end) runs or a packed bitmap (1 bit per BIN byte, LSB first)
+ - Per-page stats (4KB by default): bytes covered, uncovered, and
+   uncovered bytes that hold data rather than fill
+ - Undefined regions: uncovered stretches that are not 0x00/0xFF fill (or
+   any single repeated byte) - the candidates for missing maps when
+   writing an XDF, and a quick sign the XDF is for another OS when
+   triaging a pairing
+ - Fill runs are found with one compiled regex scan of the image and
+   per-page counts are binary searches over prefix sums, so a 1MB image
+   maps in a few milliseconds
+
+ Usage:
+   python tunerpro_exporter.py coverage <xdf> <bin> [--pages] [--json]
+       [--min-region N] [--page-size N] [--bitmap FILE]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import re
+import sys
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+from tunerpro_addressmap import build_index
+
+
+# Page size for per-page stats (the usual flash sector / bank granularity)
+PAGE_SIZE = 0x1000
+
+# Smallest undefined data region reported by default
+MIN_REGION = 256
+
+# This many 0x00 or 0xFF bytes in a row count as fill and split a region
+FILL_RUN = 16
+_FILL_PATTERN = re.compile(rb'\x00{%d,}|\xff{%d,}' % (FILL_RUN, FILL_RUN))
+
+
+class CoverageMap:
+    """Covered runs of a BIN plus the uncovered data between them"""
+
+    def __init__(self, runs: List[Tuple[int, int]], data: bytes):
+        """
+        Build the map
+
+        Args:
+            runs: Sorted, disjoint [start, end) covered runs (file offsets),
+                  e.g. AddressIndex.covered_runs(); clipped to the image
+            data: BIN image
+        """
+        self.data = data
+        self.size = len(data)
+        self.runs = [(max(0, start), min(end, self.size)) for start, end in runs
+                     if end > 0 and start < self.size]
+
+        self.gaps: List[Tuple[int, int]] = []
+        pos = 0
+        for start, end in self.runs:
+            if start > pos:
+                self.gaps.append((pos, start))
+            pos = end
+        if pos < self.size:
+            self.gaps.append((pos, self.size))
+
+        self.data_pieces = self._find_data_pieces()
+
+    def _find_data_pieces(self) -> List[Tuple[int, int]]:
+        """Uncovered [start, end) pieces that hold data rather than fill"""
+        data = self.data
+
+        # Non-fill stretches of the whole image: one regex scan in C
+        stretches = []
+        pos = 0
+        for match in _FILL_PATTERN.finditer(data):
+            if match.start() > pos:
+                stretches.append((pos, match.start()))
+            pos = match.end()
+        if pos < self.size:
+            stretches.append((pos, self.size))
+
+        # Intersect with the gaps (both sorted and disjoint)
+        pieces = []
+        i = j = 0
+        while i < len(stretches) and j < len(self.gaps):
+            start = max(stretches[i][0], self.gaps[j][0])
+            end = min(stretches[i][1], self.gaps[j][1])
+            # A piece that is one repeated byte (e.g. 0x55 padding) is fill too
+            if start < end and data.count(data[start:start + 1], start, end) != end - start:
+                pieces.append((start, end))
+            if stretches[i][1] < self.gaps[j][1]:
+                i += 1
+            else:
+                j += 1
+        return pieces
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def covered_bytes(self) -> int:
+        """Bytes inside the image claimed by at least one element"""
+        return sum(end - start for start, end in self.runs)
+
+    def bitmap(self) -> bytes:
+        """Packed coverage bitmap: bit (i % 8) of byte i // 8 is BIN byte i"""
+        if not self.size:
+            return b''
+        # int() reads the most significant digit first, so BIN byte i is
+        # written at digit size - 1 - i
+        digits = bytearray(b'0') * self.size
+        for start, end in self.runs:
+            digits[self.size - end:self.size - start] = b'1' * (end - start)
+        return int(digits, 2).to_bytes((self.size + 7) // 8, 'little')
+
+    def page_stats(self, page_size: int = PAGE_SIZE) -> List[Dict[str, int]]:
+        """
+        Per-page coverage
+
+        Returns:
+            List[Dict]: 'start', 'size', 'covered', 'undefined' (uncovered
+                        bytes) and 'undefined_data' (uncovered non-fill bytes)
+        """
+        bounds = list(range(0, self.size, page_size)) + [self.size]
+        covered = self._bytes_below(self.runs, bounds)
+        data = self._bytes_below(self.data_pieces, bounds)
+
+        pages = []
+        for i, start in enumerate(bounds[:-1]):
+            size = bounds[i + 1] - start
+            page_covered = covered[i + 1] - covered[i]
+            pages.append({
+                'start': start,
+                'size': size,
+                'covered': page_covered,
+                'undefined': size - page_covered,
+                'undefined_data': data[i + 1] - data[i]
+            })
+        return pages
+
+    @staticmethod
+    def _bytes_below(intervals: List[Tuple[int, int]], bounds: List[int]) -> List[int]:
+        """Bytes of sorted disjoint intervals below each (ascending) bound"""
+        starts = [start for start, _ in intervals]
+        before = [0] + list(accumulate(end - start for start, end in intervals))
+        counts = []
+        for bound in bounds:
+            # Intervals wholly below the bound, plus the part of the one it cuts
+            i = bisect.bisect_right(starts, bound) - 1
+            if i < 0:
+                counts.append(0)
+            else:
+                start, end = intervals[i]
+                counts.append(before[i] + min(end, bound) - start)
+        return counts
+
+    def undefined_regions(self, min_size: int = MIN_REGION) -> List[Dict[str, int]]:
+        """
+        Uncovered non-fill regions of at least min_size bytes, largest first
+
+        Returns:
+            List[Dict]: 'start', 'end' (exclusive), 'size' and 'distinct'
+                        (number of different byte values)
+        """
+        regions = [{'start': start, 'end': end, 'size': end - start,
+                    'distinct': len(set(self.data[start:end]))}
+                   for start, end in self.data_pieces if end - start >= min_size]
+        regions.sort(key=lambda r: (-r['size'], r['start']))
+        return regions
+
+    def report(self, page_size: int = PAGE_SIZE, min_size: int = MIN_REGION) -> Dict:
+        """Summary, runs, pages and undefined regions in one dict"""
+        covered = self.covered_bytes()
+        return {
+            'bin_size': self.size,
+            'covered_bytes': covered,
+            'coverage_percent': round(100.0 * covered / self.size, 2) if self.size else 0.0,
+            'undefined_data_bytes': sum(end - start for start, end in self.data_pieces),
+            'runs': [[start, end] for start, end in self.runs],
+            'pages': self.page_stats(page_size),
+            'undefined_regions': self.undefined_regions(min_size)
+        }
+
+
+def build_coverage(exporter: UniversalXDFExporter) -> CoverageMap:
+    """Coverage map for an exporter with the XDF parsed and the BIN loaded"""
+    return CoverageMap(build_index(exporter).covered_runs(), exporter.bin_data)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Coverage map command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py coverage",
+        description="Show which BIN bytes the XDF describes and where undefined data is"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bin', help="BIN file")
+    parser.add_argument('--page-size', type=lambda text: int(text, 0), default=PAGE_SIZE,
+                        help=f"Page size for per-page stats (default: 0x{PAGE_SIZE:X})")
+    parser.add_argument('--min-region', type=lambda text: int(text, 0), default=MIN_REGION,
+                        help=f"Smallest undefined region listed (default: {MIN_REGION})")
+    parser.add_argument('--pages', action='store_true', help="Print per-page stats")
+    parser.add_argument('--bitmap', metavar='FILE',
+                        help="Write the packed coverage bitmap (1 bit per BIN byte)")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="Max undefined regions listed (default: 20)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.page_size <= 0:
+        parser.error("--page-size must be positive")
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    exporter = UniversalXDFExporter(args.xdf, args.bin)
+    if not exporter.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if not exporter.validate_bin_file():
+        print(f"❌ Binary validation failed: {args.bin}")
+        return 1
+
+    coverage = build_coverage(exporter)
+    report = coverage.report(args.page_size, args.min_region)
+
+    if args.bitmap:
+        with open(args.bitmap, 'wb') as f:
+            f.write(coverage.bitmap())
+
+    if args.json:
+        report['definition'] = exporter.definition_name
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Definition: {exporter.definition_name}")
+    print(f"Coverage:   {report['covered_bytes']:,} of {report['bin_size']:,} bytes "
+          f"({report['coverage_percent']}%) in {len(report['runs'])} runs")
+    print(f"Undefined data: {report['undefined_data_bytes']:,} bytes outside the XDF "
+          f"that aren't fill")
+
+    if args.pages:
+        print()
+        print(f"{'Page':>8}  {'Covered':>8}  {'Undefined':>9}  {'Data':>8}")
+        for page in report['pages']:
+            print(f"0x{page['start']:06X}  {page['covered']:>8}  {page['undefined']:>9}  "
+                  f"{page['undefined_data']:>8}")
+
+    regions = report['undefined_regions']
+    print()
+    print(f"Undefined regions >= {args.min_region} bytes: {len(regions)}")
+    for region in regions[:args.limit]:
+        print(f"  0x{region['start']:06X}-0x{region['end'] - 1:06X}  "
+              f"{region['size']:>7,} bytes  {region['distinct']:>3} distinct values")
+    if len(regions) > args.limit:
+        print(f"  ... {len(regions) - args.limit} more")
+    if args.bitmap:
+        print(f"\nBitmap written: {args.bitmap}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
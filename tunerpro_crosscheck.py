@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Fast Path Cross-Check
+===============================================================================
+
+ Every shortcut the exporter takes to decode faster (bulk struct reads,
+ per-BIN axis/table caches, NumPy decodes, and whatever vectorised or
+ compiled evaluation comes next) has to give exactly the values of the
+ plain per-cell path: read_value_from_bin() for each cell, then
+ evaluate_math() with the table's axis context, falling back to the raw
+ value when the equation fails or gives inf/NaN. This runs every element
+ of a corpus through that reference and through each registered fast
+ path and reports every difference with its equation.
+
+ - Corpus: synthetic pairs (tunerpro_synth, with edge-case equations
+   mixed in: division by zero, domain errors, inf/NaN, axis variables)
+   plus any local XDF/BIN pairs (--pair, --dir)
+ - Fast paths are registered in FAST_PATHS (name -> level, element kinds,
+   function); 'raw' paths are compared with the reference raw integers,
+   'value' paths with the converted values
+ - Values must match bit for bit (-0.0 != 0.0) unless --rel-tol/--abs-tol
+   are given; NaN only matches NaN, inf only the same inf
+ - Exit code 1 when any path differs, so it can gate a change
+
+ Usage:
+   python tunerpro_exporter.py crosscheck [--synthetic 3] [--scale small]
+       [--pair def.xdf tune.bin] [--dir bins\\] [--path NAME]
+       [--rel-tol 1e-9] [--abs-tol 0] [-o report.json] [--json]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import math
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+from tunerpro_layout import decode, hypotheses
+from tunerpro_synth import add_spec_arguments, spec_from_args, write_pair
+
+# Share of synthetic equations taken from tunerpro_synth.EDGE_EQUATIONS
+EDGE_FRACTION = 0.25
+
+# Mismatches kept per path and pair (the counts are always complete)
+MAX_MISMATCHES = 50
+
+# Returned by a fast path that doesn't handle an element
+SKIP = object()
+
+
+# ---------------------------------------------------------------------------
+# Reference path: one read_value_from_bin() + evaluate_math() per value
+# ---------------------------------------------------------------------------
+
+def _reference_convert(exporter: UniversalXDFExporter, equation: Optional[str], raw: int,
+                       axis_context: Optional[Dict] = None) -> float:
+    """evaluate_math() with the export fallback (raw value on failure, inf or NaN)"""
+    if not equation:
+        return float(raw)
+    value, _ = exporter.evaluate_math(equation, raw, axis_context)
+    return value if value is not None else float(raw)
+
+
+def reference_axis(exporter: UniversalXDFExporter, axis: Dict) -> Dict[str, Any]:
+    """
+    Axis breakpoints read one element at a time
+
+    Returns:
+        Dict: 'raw' (list, or None for static/unreadable axes) and 'values'
+    """
+    address = axis.get('address')
+    count = axis.get('count', 0)
+    if address is None or count < 1 or exporter.bin_data is None:
+        return {'raw': None, 'values': list(axis.get('labels', []))}
+    size_bits = axis.get('size_bits', 8)
+    size_bytes = max(1, size_bits // 8)
+    raw = [exporter.read_value_from_bin(address + i * size_bytes, size_bits,
+                                        signed=axis.get('signed', False),
+                                        lsb_first=axis.get('lsb_first', False))
+           for i in range(count)]
+    if any(r is None for r in raw):
+        return {'raw': None, 'values': list(axis.get('labels', []))}
+    equation = axis.get('equation') or ''
+    return {'raw': raw, 'values': [_reference_convert(exporter, equation, r) for r in raw]}
+
+
+def reference_table(exporter: UniversalXDFExporter, table: Dict) -> Optional[Dict[str, Any]]:
+    """
+    Table cells read one at a time, row-major, with the export semantics:
+    any cell past the end of the BIN makes the table unreadable (None
+    values), an unreadable raw cell is 0.0, a failing equation gives the
+    raw value
+
+    Returns:
+        Dict: 'raw' (flat list, None entries for unreadable cells),
+              'values' (flat list or None), 'cols', 'equation' -
+              or None for 1x1 / address-less tables
+    """
+    z_axis = table['axes'].get('z', {})
+    rows, cols = exporter._table_dimensions(table)
+    base_address = z_axis.get('address')
+    if (rows <= 1 and cols <= 1) or base_address is None:
+        return None
+
+    size_bits = z_axis.get('size_bits', 8)
+    size_bytes = size_bits // 8
+    signed = z_axis.get('signed', False)
+    lsb_first = z_axis.get('lsb_first', False)
+    equation = z_axis.get('equation', '')
+    major_stride = z_axis.get('major_stride', 0) or size_bits
+    minor_stride = z_axis.get('minor_stride', 0) or size_bits
+    y_labels = reference_axis(exporter, table['axes'].get('y', {}))['values']
+    x_labels = reference_axis(exporter, table['axes'].get('x', {}))['values']
+
+    raw_cells: List[Optional[int]] = []
+    values: Optional[List[float]] = []
+    for row in range(rows):
+        for col in range(cols):
+            if major_stride < 0:
+                major_bytes = abs(major_stride // 8)
+                address = (base_address + (rows - 1) * major_bytes * cols
+                           - row * major_bytes * cols + col * (minor_stride // 8))
+            else:
+                address = base_address + (row * cols + col) * size_bytes
+            raw = exporter.read_value_from_bin(address, size_bits, signed=signed, lsb_first=lsb_first)
+            raw_cells.append(raw)
+            if values is None:
+                continue
+            if exporter._xdf_addr_to_file_offset(address) + size_bytes > exporter.bin_size:
+                values = None
+            elif raw is None:
+                values.append(0.0)
+            else:
+                values.append(_reference_convert(exporter, equation, raw, {
+                    'row_index': row,
+                    'col_index': col,
+                    'y_axis_value': y_labels[row] if row < len(y_labels) else 0,
+                    'x_axis_value': x_labels[col] if col < len(x_labels) else 0
+                }))
+    return {'raw': raw_cells, 'values': values, 'cols': cols, 'equation': equation}
+
+
+def reference_constant(exporter: UniversalXDFExporter, const: Dict) -> Dict[str, Any]:
+    """A scalar's raw value and converted value (both None when unreadable)"""
+    raw = exporter.read_value_from_bin(const['address'], const['size'],
+                                       signed=const.get('signed', False),
+                                       lsb_first=const.get('lsb_first', False))
+    value = None if raw is None else _reference_convert(exporter, const.get('equation'), raw)
+    return {'raw': [raw], 'values': None if value is None else [value], 'cols': 1,
+            'equation': const.get('equation') or ''}
+
+
+def reference_flag(exporter: UniversalXDFExporter, flag: Dict) -> Dict[str, Any]:
+    """A flag's byte and its masked bit as 1.0/0.0 (both None when unreadable)"""
+    raw = exporter.read_value_from_bin(flag['address'], 8)
+    return {'raw': [raw], 'values': None if raw is None else [1.0 if raw & flag['mask'] else 0.0],
+            'cols': 1, 'equation': f"X & 0x{flag['mask']:02X}"}
+
+
+def corpus_elements(exporter: UniversalXDFExporter) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Every checkable element: (kind, label, element) for constants, flags,
+    tables and the distinct embedded X/Y axes of tables
+    """
+    for const in exporter.elements['constants']:
+        yield 'constants', const['title'], const
+    for flag in exporter.elements['flags']:
+        yield 'flags', flag['title'], flag
+    seen = set()
+    for table in exporter.elements['tables']:
+        yield 'tables', table['title'], table
+        for axis_id in ('x', 'y'):
+            axis = table['axes'].get(axis_id, {})
+            if axis.get('address') is None:
+                continue
+            key = (axis['address'], axis.get('count', 0), axis.get('size_bits', 8),
+                   axis.get('signed', False), axis.get('lsb_first', False), axis.get('equation') or '')
+            if key not in seen:
+                seen.add(key)
+                yield 'axes', f"{table['title']} [{axis_id.upper()} axis]", axis
+
+
+REFERENCES = {
+    'constants': reference_constant,
+    'flags': reference_flag,
+    'tables': reference_table,
+    'axes': lambda exporter, axis: dict(reference_axis(exporter, axis), cols=1,
+                                        equation=axis.get('equation') or ''),
+}
+
+
+# ---------------------------------------------------------------------------
+# Fast paths: each returns a flat row-major list (or None when it reports
+# the element unreadable, or SKIP when it doesn't apply)
+# ---------------------------------------------------------------------------
+
+def _flat(data) -> Optional[List[Any]]:
+    if data is None:
+        return None
+    return [cell for row in data for cell in row]
+
+
+def _bulk_read(exporter: UniversalXDFExporter, kind: str, element: Dict):
+    """read_raw_values() - one struct call for contiguous blocks"""
+    if kind == 'constants':
+        return exporter.read_raw_values([element['address']], element['size'],
+                                        signed=element.get('signed', False),
+                                        lsb_first=element.get('lsb_first', False))
+    if kind == 'flags':
+        return exporter.read_raw_values([element['address']], 8)
+    if kind == 'axes':
+        size_bits = element.get('size_bits', 8)
+        size_bytes = max(1, size_bits // 8)
+        return exporter.read_raw_values(
+            [element['address'] + i * size_bytes for i in range(element.get('count', 0))],
+            size_bits, signed=element.get('signed', False), lsb_first=element.get('lsb_first', False))
+    addresses = exporter._table_cell_addresses(element)
+    if not addresses:
+        return SKIP
+    z_axis = element['axes'].get('z', {})
+    return exporter.read_raw_values(addresses, z_axis.get('size_bits', 8),
+                                    signed=z_axis.get('signed', False),
+                                    lsb_first=z_axis.get('lsb_first', False))
+
+
+def _table_cells(exporter: UniversalXDFExporter, kind: str, element: Dict):
+    """table_analysis() - what every writer exports (cached, bulk axes)"""
+    data, _ = exporter.table_analysis(element)
+    return _flat(data)
+
+
+def _axis_labels(exporter: UniversalXDFExporter, kind: str, element: Dict):
+    """axis_labels() - bulk read, cached per BIN"""
+    return exporter.axis_labels(element)
+
+
+def _cell_conversion(exporter: UniversalXDFExporter, kind: str, element: Dict):
+    """read_raw_values() + convert_raw_value() with _table_axis_context() (diff, revisions)"""
+    if kind == 'constants':
+        raw = exporter.read_raw_values([element['address']], element['size'],
+                                       signed=element.get('signed', False),
+                                       lsb_first=element.get('lsb_first', False))
+        return None if raw is None else [exporter.convert_raw_value(element.get('equation'), raw[0])]
+    raw = _bulk_read(exporter, kind, element)
+    if raw is SKIP or raw is None:
+        return SKIP
+    rows, cols = exporter._table_dimensions(element)
+    equation = element['axes'].get('z', {}).get('equation', '')
+    return [exporter.convert_raw_value(equation, value,
+                                       exporter._table_axis_context(element, i // cols, i % cols))
+            for i, value in enumerate(raw)]
+
+
+def _layout_decode(exporter: UniversalXDFExporter, kind: str, element: Dict):
+    """tunerpro_layout.decode() of the declared layout (strided NumPy view)"""
+    z_axis = element['axes'].get('z', {})
+    addresses = exporter._table_cell_addresses(element)
+    if not addresses:
+        return SKIP
+    rows, cols = exporter._table_dimensions(element)
+    declared = hypotheses(rows, cols, z_axis.get('size_bits', 8),
+                          z_axis.get('signed', False), z_axis.get('lsb_first', False),
+                          z_axis.get('major_stride', 0), z_axis.get('minor_stride', 0))[0]
+    cells = decode(exporter.bin_data, exporter._xdf_addr_to_file_offset(min(addresses)), declared)
+    if cells is None:
+        return None
+    return [cell for row in cells.tolist() for cell in row] if hasattr(cells, 'tolist') else _flat(cells)
+
+
+# name -> (level compared: 'raw' or 'values', element kinds, function)
+FAST_PATHS: Dict[str, Tuple[str, Tuple[str, ...], Callable]] = {
+    'bulk_read': ('raw', ('constants', 'flags', 'tables', 'axes'), _bulk_read),
+    'table_cells': ('values', ('tables',), _table_cells),
+    'axis_labels': ('values', ('axes',), _axis_labels),
+    'cell_conversion': ('values', ('constants', 'tables'), _cell_conversion),
+    'layout_decode': ('raw', ('tables',), _layout_decode),
+}
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def same_value(expected: Any, actual: Any, rel_tol: float = 0.0, abs_tol: float = 0.0) -> bool:
+    """
+    Compare one value: bit for bit without tolerances (so -0.0 != 0.0 and
+    int 3 == float 3.0 only because both are exactly 3), otherwise
+    math.isclose; NaN matches only NaN and inf only the same inf
+    """
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    try:
+        a, b = float(expected), float(actual)
+    except (TypeError, ValueError, OverflowError):
+        return expected == actual
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    if isinstance(expected, int) and isinstance(actual, int):
+        return expected == actual
+    if not (rel_tol or abs_tol) or math.isinf(a) or math.isinf(b):
+        return struct.pack('<d', a) == struct.pack('<d', b)
+    return math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+
+
+def compare_values(expected: Optional[List[Any]], actual: Optional[List[Any]],
+                   rel_tol: float = 0.0, abs_tol: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    First difference between a reference and a fast-path result
+
+    Returns:
+        Dict: 'index', 'expected', 'actual' ('reason' for shape/None
+              differences) - or None when they match
+    """
+    if expected is None or actual is None:
+        if expected is None and actual is None:
+            return None
+        return {'index': None,
+                'expected': 'unreadable' if expected is None else f"{len(expected)} values",
+                'actual': 'unreadable' if actual is None else f"{len(actual)} values",
+                'reason': 'one side unreadable'}
+    if len(expected) != len(actual):
+        return {'index': None, 'expected': len(expected), 'actual': len(actual),
+                'reason': 'different number of values'}
+    differing = [i for i, (e, a) in enumerate(zip(expected, actual))
+                 if not same_value(e, a, rel_tol, abs_tol)]
+    if not differing:
+        return None
+    i = differing[0]
+    return {'index': i, 'expected': expected[i], 'actual': actual[i],
+            'cells': len(differing)}
+
+
+def _jsonable(value: Any) -> Any:
+    """float('inf')/NaN as strings so the report stays valid JSON"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    if hasattr(value, 'item'):
+        return _jsonable(value.item())
+    return value
+
+
+def check_pair(xdf_path: str, bin_path: str, paths: Optional[List[str]] = None,
+               rel_tol: float = 0.0, abs_tol: float = 0.0) -> Dict[str, Any]:
+    """
+    Run every element of one XDF/BIN pair through the reference and each fast path
+
+    Args:
+        xdf_path: XDF definition
+        bin_path: BIN image
+        paths: FAST_PATHS names (default: all)
+        rel_tol: Relative tolerance (0 = bit for bit)
+        abs_tol: Absolute tolerance
+
+    Returns:
+        Dict: 'xdf', 'bin', 'elements' (per kind), 'paths' (name ->
+              'checked', 'skipped', 'mismatched', 'mismatches')
+
+    Raises:
+        ValueError: The pair can't be loaded
+    """
+    reference = UniversalXDFExporter(xdf_path, bin_path)
+    if not reference.validate_bin_file() or not reference.parse_xdf():
+        raise ValueError(f"cannot load {xdf_path} / {bin_path}")
+
+    elements = list(corpus_elements(reference))
+    expected = [REFERENCES[kind](reference, element) for kind, _, element in elements]
+    counts: Dict[str, int] = {}
+    for kind, _, _ in elements:
+        counts[kind] = counts.get(kind, 0) + 1
+
+    results = {}
+    for name in paths or list(FAST_PATHS):
+        level, kinds, func = FAST_PATHS[name]
+        # Fresh per-BIN caches for each path; the parsed definition is shared
+        exporter = reference.for_bin(bin_path)
+        exporter.load_bin_bytes(reference.bin_data)
+        checked = skipped = 0
+        mismatches = []
+        for (kind, label, element), ref in zip(elements, expected):
+            if kind not in kinds or ref is None:
+                continue
+            actual = func(exporter, kind, element)
+            if actual is SKIP:
+                skipped += 1
+                continue
+            checked += 1
+            wanted = ref[level]
+            if level == 'raw' and wanted is not None and any(r is None for r in wanted):
+                # Bulk reads report the whole element unreadable
+                wanted = None
+            difference = compare_values(wanted, actual, rel_tol, abs_tol)
+            if difference is None:
+                continue
+            index = difference['index']
+            if index is not None:
+                difference['row'], difference['col'] = divmod(index, ref['cols'])
+                raw = ref['raw'][index] if ref['raw'] and index < len(ref['raw']) else None
+                difference['raw'] = raw
+            difference.update(kind=kind, element=label, equation=ref['equation'])
+            mismatches.append({k: _jsonable(v) for k, v in difference.items()})
+        results[name] = {
+            'level': level,
+            'checked': checked,
+            'skipped': skipped,
+            'mismatched': len(mismatches),
+            'mismatches': mismatches[:MAX_MISMATCHES]
+        }
+    return {'xdf': str(xdf_path), 'bin': str(bin_path), 'elements': counts, 'paths': results}
+
+
+def local_pairs(directory: str) -> List[Tuple[Path, Path]]:
+    """XDF/BIN pairs under a directory that share a file stem"""
+    pairs = []
+    for xdf in sorted(Path(directory).rglob('*')):
+        if not xdf.is_file() or xdf.suffix.lower() != '.xdf':
+            continue
+        for candidate in xdf.parent.iterdir():
+            if candidate.stem == xdf.stem and candidate.suffix.lower() == '.bin':
+                pairs.append((xdf, candidate))
+                break
+    return pairs
+
+
+def _format_mismatch(m: Dict[str, Any]) -> str:
+    where = ''
+    if m.get('index') is not None and m['kind'] != 'constants':
+        where = f"[{m['row']},{m['col']}]" if m['kind'] == 'tables' else f"[{m['index']}]"
+    if m.get('reason'):
+        detail = f"{m['reason']} (reference {m['expected']}, fast {m['actual']})"
+    else:
+        detail = (f"raw {m.get('raw')}: reference {m['expected']!r}, fast {m['actual']!r}"
+                  + (f" ({m['cells']} values differ)" if m.get('cells', 1) > 1 else ''))
+    return f"{m['kind'][:-1]} '{m['element']}'{where} eq '{m['equation'] or 'X'}': {detail}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Fast path cross-check command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py crosscheck",
+        description="Check every fast decode/evaluate path against the per-cell reference"
+    )
+    add_spec_arguments(parser)
+    parser.set_defaults(scale='small', edge_fraction=EDGE_FRACTION)
+    parser.add_argument('--synthetic', type=int, default=3, metavar='N',
+                        help="Synthetic pairs, seeds --seed.. (default: 3, 0 = none)")
+    parser.add_argument('--pair', nargs=2, action='append', default=[], metavar=('XDF', 'BIN'),
+                        help="Also check a local XDF/BIN pair (repeatable)")
+    parser.add_argument('--dir', action='append', default=[], metavar='DIR',
+                        help="Also check XDF/BIN pairs sharing a name under DIR (repeatable)")
+    parser.add_argument('--path', action='append', choices=list(FAST_PATHS), metavar='NAME',
+                        help=f"Only these fast paths ({', '.join(FAST_PATHS)})")
+    parser.add_argument('--rel-tol', type=float, default=0.0,
+                        help="Relative tolerance (default: 0 = bit for bit)")
+    parser.add_argument('--abs-tol', type=float, default=0.0, help="Absolute tolerance (default: 0)")
+    parser.add_argument('--show', type=int, default=10, help="Mismatches listed per path (default: 10)")
+    parser.add_argument('-o', '--output', metavar='FILE', help="Write the full report as JSON")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.synthetic < 0:
+        parser.error("--synthetic can't be negative")
+    if args.rel_tol < 0 or args.abs_tol < 0:
+        parser.error("tolerances can't be negative")
+
+    # Failing edge-case equations are expected; their warnings would drown the report
+    logging.getLogger('tunerpro_exporter').setLevel(logging.CRITICAL)
+
+    pairs = [(Path(x), Path(b)) for x, b in args.pair]
+    for directory in args.dir:
+        pairs.extend(local_pairs(directory))
+    if not pairs and not args.synthetic:
+        parser.error("nothing to check (--synthetic 0 and no --pair/--dir)")
+
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.synthetic):
+            spec = spec_from_args(args)
+            spec['seed'] = args.seed + i
+            pairs.insert(i, write_pair(spec, tmp))
+        for xdf_path, bin_path in pairs:
+            try:
+                reports.append(check_pair(str(xdf_path), str(bin_path), args.path,
+                                          args.rel_tol, args.abs_tol))
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+
+    mismatched = sum(p['mismatched'] for r in reports for p in r['paths'].values())
+    report = {'rel_tol': args.rel_tol, 'abs_tol': args.abs_tol, 'pairs': reports,
+              'mismatched': mismatched}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 1 if mismatched else 0
+
+    mode = (f"rel_tol {args.rel_tol:g}, abs_tol {args.abs_tol:g}"
+            if args.rel_tol or args.abs_tol else "bit for bit")
+    print(f"Reference: read_value_from_bin + evaluate_math per value ({mode})")
+    for r in reports:
+        counts = ', '.join(f"{n} {kind}" for kind, n in r['elements'].items())
+        print(f"\n{Path(r['xdf']).name} + {Path(r['bin']).name} ({counts})")
+        for name, p in r['paths'].items():
+            mark = '✓' if not p['mismatched'] else '✗'
+            skipped = f", {p['skipped']} skipped" if p['skipped'] else ''
+            print(f"  {mark} {name:<16} {p['checked']:>6} checked{skipped}"
+                  + (f", {p['mismatched']} differ" if p['mismatched'] else ''))
+            for m in p['mismatches'][:args.show]:
+                print(f"      {_format_mismatch(m)}")
+    if args.output:
+        print(f"\nReport: {args.output}")
+    if mismatched:
+        print(f"\n❌ {mismatched} element(s) differ from the reference")
+        return 1
+    print(f"\n✅ All fast paths match the reference ({len(reports)} pair(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Calibration Diff
+===============================================================================
+
+ Compare two or more BINs through one XDF and report ONLY what changed.
+
+ - Scalars, flags, patches, table cells and BIN-resident X/Y axes
+ - Converted before/after values (XDF math applied) plus raw values
+ - Per-table changed-cell counts and max |delta|
+ - Text, JSON and Markdown reports
+
+ Every BIN after the first is compared against the first (the baseline,
+ usually the stock file). Element byte ranges are compared in bulk first;
+ only elements whose bytes differ are decoded and converted, so reviewing a
+ tune against stock costs a fraction of two full exports.
+
+ Usage:
+   python tunerpro_exporter.py diff <xdf> <stock.bin> <tune.bin> [<tune2.bin> ...]
+                                    [-f txt|json|md] [-o OUTPUT]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tunerpro_exporter import UniversalXDFExporter, __version__
+
+# Optional NumPy acceleration for large tables (pure-Python fallback)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Table size at which the NumPy changed-cell search pays for itself
+NUMPY_MIN_CELLS = 256
+
+
+def _changed_indices(before: List[int], after: List[int]) -> List[int]:
+    """Indices where two equal-length raw arrays differ"""
+    if np is not None and len(before) >= NUMPY_MIN_CELLS:
+        return np.flatnonzero(np.asarray(before) != np.asarray(after)).tolist()
+    return [i for i, (a, b) in enumerate(zip(before, after)) if a != b]
+
+
+def _bytes_differ(a: UniversalXDFExporter, b: UniversalXDFExporter,
+                  address: int, length: int) -> bool:
+    """Compare the raw bytes an element occupies in both BINs"""
+    oa = a._xdf_addr_to_file_offset(address)
+    ob = b._xdf_addr_to_file_offset(address)
+    return a.bin_data[oa:oa + length] != b.bin_data[ob:ob + length]
+
+
+def _diff_scalars(base: UniversalXDFExporter, other: UniversalXDFExporter) -> List[Dict]:
+    changes = []
+    for const in base.elements['constants']:
+        if not _bytes_differ(base, other, const['address'], const['size'] // 8):
+            continue
+        raws = [
+            e.read_value_from_bin(const['address'], const['size'],
+                                  signed=const.get('signed', False),
+                                  lsb_first=const.get('lsb_first', False))
+            for e in (base, other)
+        ]
+        if raws[0] == raws[1]:
+            continue
+        values = [None if r is None else base.convert_raw_value(const['equation'], r)
+                  for r in raws]
+        decimalpl = const.get('decimalpl', 2)
+        changes.append({
+            'title': const['title'],
+            'category': const['category'],
+            'address': f"0x{const['address']:04X}",
+            'unit': const['unit'],
+            'raw_before': raws[0],
+            'raw_after': raws[1],
+            'before': None if values[0] is None else round(values[0], decimalpl),
+            'after': None if values[1] is None else round(values[1], decimalpl),
+            'delta': (round(values[1] - values[0], decimalpl)
+                      if None not in values else None),
+            'decimalpl': decimalpl
+        })
+    return changes
+
+
+def _diff_flags(base: UniversalXDFExporter, other: UniversalXDFExporter) -> List[Dict]:
+    changes = []
+    for flag in base.elements['flags']:
+        if not _bytes_differ(base, other, flag['address'], 1):
+            continue
+        states = []
+        for e in (base, other):
+            byte_value = e.read_value_from_bin(flag['address'], 8)
+            states.append(None if byte_value is None else (byte_value & flag['mask']) != 0)
+        if states[0] != states[1]:
+            changes.append({
+                'title': flag['title'],
+                'category': flag['category'],
+                'address': f"0x{flag['address']:04X}",
+                'mask': f"0x{flag['mask']:02X}",
+                'before': states[0],
+                'after': states[1]
+            })
+    return changes
+
+
+def _diff_patches(base: UniversalXDFExporter, other: UniversalXDFExporter) -> List[Dict]:
+    changes = []
+    for before, after in zip(base.elements['patches'], other.elements['patches']):
+        before_status = base.patch_status(before)
+        after_status = other.patch_status(after)
+        if before_status != after_status:
+            changes.append({
+                'title': before['title'],
+                'category': before['category'],
+                'before': before_status,
+                'after': after_status
+            })
+    return changes
+
+
+def _axis_bytes_differ(base: UniversalXDFExporter, other: UniversalXDFExporter, axis: Dict) -> bool:
+    """True when a BIN-resident axis has different bytes in the two BINs"""
+    if axis.get('address') is None:
+        return False
+    length = max(1, axis.get('count', 1)) * max(1, axis.get('size_bits', 8) // 8)
+    return _bytes_differ(base, other, axis['address'], length)
+
+
+def _diff_axes(base: UniversalXDFExporter, other: UniversalXDFExporter,
+               max_cells: Optional[int]) -> List[Dict]:
+    """Changed breakpoints of X/Y axes stored in the BIN (each shared axis once)"""
+    changes = []
+    seen = set()
+    for table in base.elements['tables']:
+        for axis_id in ('x', 'y'):
+            axis = table['axes'].get(axis_id, {})
+            if axis.get('address') is None:
+                continue
+            key = (axis['address'], axis.get('count', 0), axis.get('size_bits', 8),
+                   axis.get('signed', False), axis.get('lsb_first', False), axis.get('equation') or '')
+            if key in seen:
+                continue
+            seen.add(key)
+            if not _axis_bytes_differ(base, other, axis):
+                continue
+
+            before_values, after_values = base.axis_labels(axis), other.axis_labels(axis)
+            decimalpl = axis.get('decimalpl', 2)
+            cells = []
+            max_delta = 0.0
+            for index, (before, after) in enumerate(zip(before_values, after_values)):
+                if before == after:
+                    continue
+                delta = after - before
+                max_delta = max(max_delta, abs(delta))
+                cells.append({
+                    'row': 0,
+                    'col': index,
+                    'before': round(before, decimalpl),
+                    'after': round(after, decimalpl),
+                    'delta': round(delta, decimalpl)
+                })
+            if not cells:
+                continue
+            changes.append({
+                'title': f"{table['title']} [{axis_id.upper()} axis]",
+                'category': table['category'],
+                'axis': axis_id,
+                'unit': axis.get('unit', ''),
+                'rows': 1,
+                'cols': len(before_values),
+                'changed_cells': len(cells),
+                'total_cells': len(before_values),
+                'max_delta': round(max_delta, decimalpl),
+                'decimalpl': decimalpl,
+                'cells': cells if max_cells is None else cells[:max_cells]
+            })
+    return changes
+
+
+def _diff_tables(base: UniversalXDFExporter, other: UniversalXDFExporter,
+                 max_cells: Optional[int]) -> List[Dict]:
+    changes = []
+    for table in base.elements['tables']:
+        addresses = base._table_cell_addresses(table)
+        if not addresses:
+            continue
+        z_axis = table['axes'].get('z', {})
+        size_bits = z_axis.get('size_bits', 8)
+        size_bytes = size_bits // 8
+        equation = z_axis.get('equation', '')
+        # Equations may use axis values (Y/Z), so a changed BIN-resident
+        # axis can change cells whose raw value is the same
+        axes_differ = bool(equation) and any(
+            _axis_bytes_differ(base, other, table['axes'].get(a, {})) for a in ('x', 'y'))
+
+        # Fast path: contiguous block, bytes identical -> nothing to decode
+        lo, hi = min(addresses), max(addresses) + size_bytes
+        if (not axes_differ and hi - lo == len(addresses) * size_bytes
+                and not _bytes_differ(base, other, lo, hi - lo)):
+            continue
+
+        raws = [
+            e.read_raw_values(addresses, size_bits,
+                              signed=z_axis.get('signed', False),
+                              lsb_first=z_axis.get('lsb_first', False))
+            for e in (base, other)
+        ]
+        if raws[0] is None or raws[1] is None:
+            if raws[0] != raws[1]:
+                changes.append({
+                    'title': table['title'],
+                    'category': table['category'],
+                    'error': "Table out of range in one BIN"
+                })
+            continue
+
+        changed = range(len(raws[0])) if axes_differ else _changed_indices(raws[0], raws[1])
+        if not changed:
+            continue
+
+        rows, cols = base._table_dimensions(table)
+        decimalpl = z_axis.get('decimalpl', 2)
+
+        cells = []
+        max_delta = 0.0
+        for index in changed:
+            row, col = divmod(index, cols)
+            # Each side with its own BIN's axis values
+            before = base.convert_raw_value(equation, raws[0][index],
+                                            base._table_axis_context(table, row, col))
+            after = other.convert_raw_value(equation, raws[1][index],
+                                            other._table_axis_context(table, row, col))
+            if axes_differ and before == after:
+                continue
+            delta = after - before
+            max_delta = max(max_delta, abs(delta))
+            cells.append({
+                'row': row,
+                'col': col,
+                'before': round(before, decimalpl),
+                'after': round(after, decimalpl),
+                'delta': round(delta, decimalpl)
+            })
+
+        changes.append({
+            'title': table['title'],
+            'category': table['category'],
+            'unit': z_axis.get('unit', ''),
+            'rows': rows,
+            'cols': cols,
+            'changed_cells': len(cells),
+            'total_cells': rows * cols,
+            'max_delta': round(max_delta, decimalpl),
+            'decimalpl': decimalpl,
+            'cells': cells if max_cells is None else cells[:max_cells]
+        })
+    return [change for change in changes if change.get('changed_cells', 1)]
+
+
+def compare(base: UniversalXDFExporter, other: UniversalXDFExporter,
+            max_cells: Optional[int] = None) -> Dict:
+    """
+    Compare two exporters that share one parsed definition
+
+    Args:
+        base: Baseline exporter (BIN loaded)
+        other: Exporter for the BIN to compare (BIN loaded)
+        max_cells: Optional cap on listed cells per table (counts stay exact)
+
+    Returns:
+        Dict: Changes for one BIN against the baseline
+    """
+    identical = base.bin_data == other.bin_data
+    if identical:
+        scalars, flags, patches, tables, axes = [], [], [], [], []
+    else:
+        scalars = _diff_scalars(base, other)
+        flags = _diff_flags(base, other)
+        patches = _diff_patches(base, other)
+        tables = _diff_tables(base, other, max_cells)
+        axes = _diff_axes(base, other, max_cells)
+
+    return {
+        'bin': other.bin_path.name,
+        'md5': other.bin_md5,
+        'binary_size': other.bin_size,
+        'identical': identical,
+        'summary': {
+            'scalars_changed': len(scalars),
+            'flags_changed': len(flags),
+            'patches_changed': len(patches),
+            'tables_changed': len(tables),
+            'cells_changed': sum(t.get('changed_cells', 0) for t in tables),
+            'axes_changed': len(axes)
+        },
+        'scalars': scalars,
+        'flags': flags,
+        'patches': patches,
+        # Changed axes are rows of their own (marked with 'axis')
+        'tables': tables + axes
+    }
+
+
+def diff_bins(xdf_path: str, bin_paths: List[str],
+              max_cells: Optional[int] = None) -> Dict:
+    """
+    Diff BINs through one XDF: every BIN after the first against the first
+
+    Args:
+        xdf_path: Path to XDF definition file
+        bin_paths: Baseline BIN followed by one or more BINs to compare
+        max_cells: Optional cap on listed cells per table
+
+    Returns:
+        Dict: Diff report (metadata + one comparison per compared BIN)
+
+    Raises:
+        ValueError: If fewer than two BINs are given or a file can't be loaded
+    """
+    if len(bin_paths) < 2:
+        raise ValueError("Need a baseline BIN and at least one BIN to compare")
+
+    template = UniversalXDFExporter(xdf_path, "")
+    if not template.parse_xdf():
+        raise ValueError(f"XDF parsing failed: {xdf_path}")
+
+    exporters = []
+    for bin_path in bin_paths:
+        exporter = template.for_bin(bin_path)
+        if not exporter.validate_bin_file():
+            raise ValueError(f"Binary validation failed: {bin_path}")
+        exporters.append(exporter)
+
+    base = exporters[0]
+    return {
+        'metadata': {
+            'definition': template.definition_name,
+            'xdf': Path(xdf_path).name,
+            'baseline': base.bin_path.name,
+            'baseline_md5': base.bin_md5,
+            'timestamp': datetime.now().isoformat(),
+            'exporter_version': __version__
+        },
+        'comparisons': [compare(base, other, max_cells) for other in exporters[1:]]
+    }
+
+
+def _fmt(value, decimalpl: int = 2) -> str:
+    if value is None:
+        return "n/a"
+    if isinstance(value, bool):
+        return "Set" if value else "Not Set"
+    if isinstance(value, float):
+        return f"{value:.{max(decimalpl, 0)}f}"
+    return str(value)
+
+
+def _md(text: str) -> str:
+    """Escape pipes for Markdown table cells"""
+    return text.replace('|', '\\|')
+
+
+def format_text(report: Dict) -> str:
+    """Render a diff report as plain text"""
+    meta = report['metadata']
+    lines = [
+        "=" * 60,
+        "Calibration Diff",
+        "=" * 60,
+        f"DEFINITION: {meta['definition']}",
+        f"BASELINE:   {meta['baseline']} (MD5 {meta['baseline_md5']})",
+        f"Exporter: KingAI TunerPro Exporter v{meta['exporter_version']}",
+        "=" * 60,
+    ]
+    for comp in report['comparisons']:
+        s = comp['summary']
+        lines += ["", f"COMPARED: {comp['bin']} (MD5 {comp['md5']})", "-" * 60]
+        if comp['identical']:
+            lines.append("Identical to baseline")
+            continue
+        lines.append(
+            f"Scalars: {s['scalars_changed']}  Flags: {s['flags_changed']}  "
+            f"Patches: {s['patches_changed']}  Tables: {s['tables_changed']} "
+            f"({s['cells_changed']} cells)"
+            + (f"  Axes: {s['axes_changed']}" if s.get('axes_changed') else "")
+        )
+        for c in comp['scalars']:
+            unit = f" {c['unit']}" if c['unit'] else ""
+            lines.append(f"SCALAR: {c['title'][:48]:<48} {_fmt(c['before'], c['decimalpl'])} -> "
+                         f"{_fmt(c['after'], c['decimalpl'])}{unit} (Δ {_fmt(c['delta'], c['decimalpl'])})")
+        for c in comp['flags']:
+            lines.append(f"FLAG: {c['title'][:50]:<50} {_fmt(c['before'])} -> {_fmt(c['after'])}")
+        for c in comp['patches']:
+            lines.append(f"PATCH: {c['title']} {c['before']} -> {c['after']}")
+        for t in comp['tables']:
+            if 'error' in t:
+                lines.append(f"TABLE: {t['title']} ⚠️ {t['error']}")
+                continue
+            unit = f" {t['unit']}" if t['unit'] else ""
+            kind = "AXIS" if t.get('axis') else "TABLE"
+            lines.append(f"{kind}: {t['title']} - {t['changed_cells']}/{t['total_cells']} cells changed, "
+                         f"max |Δ| {_fmt(t['max_delta'], t['decimalpl'])}{unit}")
+            for cell in t['cells']:
+                lines.append(f"    [{cell['row']},{cell['col']}] {_fmt(cell['before'], t['decimalpl'])} -> "
+                             f"{_fmt(cell['after'], t['decimalpl'])} (Δ {_fmt(cell['delta'], t['decimalpl'])})")
+            if len(t['cells']) < t['changed_cells']:
+                lines.append(f"    ... and {t['changed_cells'] - len(t['cells'])} more")
+    return "\n".join(lines) + "\n"
+
+
+def format_markdown(report: Dict) -> str:
+    """Render a diff report as Markdown"""
+    meta = report['metadata']
+    out = [
+        "# Calibration Diff\n",
+        "| Property | Value |",
+        "|----------|-------|",
+        f"| Definition | `{meta['definition']}` |",
+        f"| Baseline | `{meta['baseline']}` |",
+        f"| Baseline MD5 | `{meta['baseline_md5']}` |",
+        f"| Exporter | KingAI TunerPro Exporter v{meta['exporter_version']} |",
+        "",
+    ]
+    for comp in report['comparisons']:
+        s = comp['summary']
+        out.append(f"## {comp['bin']}\n")
+        if comp['identical']:
+            out.append("Identical to baseline.\n")
+            continue
+        out.append(f"- **Scalars changed:** {s['scalars_changed']}")
+        out.append(f"- **Flags changed:** {s['flags_changed']}")
+        out.append(f"- **Patches changed:** {s['patches_changed']}")
+        out.append(f"- **Tables changed:** {s['tables_changed']} ({s['cells_changed']} cells)")
+        out.append(f"- **Axes changed:** {s.get('axes_changed', 0)}\n")
+
+        if comp['scalars']:
+            out += ["### Scalars\n", "| Parameter | Before | After | Δ | Unit |",
+                    "|-----------|--------|-------|---|------|"]
+            for c in comp['scalars']:
+                out.append(f"| {_md(c['title'])} | {_fmt(c['before'], c['decimalpl'])} | "
+                           f"{_fmt(c['after'], c['decimalpl'])} | {_fmt(c['delta'], c['decimalpl'])} | "
+                           f"{c['unit'] or '-'} |")
+            out.append("")
+        if comp['flags']:
+            out += ["### Flags\n", "| Flag | Before | After |", "|------|--------|-------|"]
+            for c in comp['flags']:
+                out.append(f"| {_md(c['title'])} | {_fmt(c['before'])} | {_fmt(c['after'])} |")
+            out.append("")
+        if comp['patches']:
+            out += ["### Patches\n", "| Patch | Before | After |", "|-------|--------|-------|"]
+            for c in comp['patches']:
+                out.append(f"| {_md(c['title'])} | {c['before']} | {c['after']} |")
+            out.append("")
+        if comp['tables']:
+            out += ["### Tables\n", "| Table | Changed Cells | Max \\|Δ\\| | Unit |",
+                    "|-------|---------------|-----------|------|"]
+            for t in comp['tables']:
+                if 'error' in t:
+                    out.append(f"| {_md(t['title'])} | ⚠️ {t['error']} | - | - |")
+                else:
+                    out.append(f"| {_md(t['title'])} | {t['changed_cells']}/{t['total_cells']} | "
+                               f"{_fmt(t['max_delta'], t['decimalpl'])} | {t['unit'] or '-'} |")
+            out.append("")
+    out.append("---\n")
+    out.append(f"*Generated by KingAI TunerPro Exporter v{meta['exporter_version']}*")
+    return "\n".join(out) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Diff command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py diff",
+        description="Compare BINs through one XDF and report only what changed"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bins', nargs='+', help="Baseline BIN followed by BIN(s) to compare")
+    parser.add_argument('-f', '--format', default='txt', choices=['txt', 'json', 'md'],
+                        help="Report format (default: txt)")
+    parser.add_argument('-o', '--output', help="Write report to file instead of stdout")
+    parser.add_argument('--max-cells', type=int, default=None,
+                        help="Limit listed cells per table (counts stay exact)")
+    args = parser.parse_args(argv)
+
+    if len(args.bins) < 2:
+        parser.error("give a baseline BIN and at least one BIN to compare")
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.WARNING)
+
+    try:
+        report = diff_bins(args.xdf, args.bins, args.max_cells)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.format == 'json':
+        text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    elif args.format == 'md':
+        text = format_markdown(report)
+    else:
+        text = format_text(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Diff report written: {args.output}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -78,15 +78,31 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import re
 import sys
-import statistics
 import json
+import csv
+import importlib
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from operator import eq, gt, itemgetter
 from datetime import datetime
-import io
 
-# Fix Windows console encoding for UTF-8 characters
+# Optional NumPy acceleration for table statistics (pure-Python fallback)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fix Windows console encoding for UTF-8 characters. reconfigure() changes
+# the existing streams in place, so importing this module a second time (as
+# 'tunerpro_exporter' from a subcommand module while running as __main__)
+# doesn't wrap - and later close - the same buffer twice.
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(encoding='utf-8', errors='replace')
 
 
 __version__ = "3.2.0"  # Added XDFPATCH Community Patchlist support
@@ -97,6 +113,449 @@ __email__ = "jason.king@kingai.com.au"
 __copyright__ = "Copyright (c) 2025 KingAI Pty Ltd"
 
 
+# Export format -> exporter method name (shared by the CLI and companion tools)
+EXPORT_WRITERS = {
+    'txt': 'export_to_text',
+    'json': 'export_to_json',
+    'md': 'export_to_markdown',
+    'csv': 'export_to_csv',
+}
+
+# Formats written for "all" (CSV is opt-in - one row per table cell is large)
+ALL_FORMATS = ['txt', 'json', 'md']
+
+# Accepted aliases for export format names
+FORMAT_ALIASES = {
+    'text': 'txt',
+    'test': 'txt',
+    'markdown': 'md',
+}
+
+
+def resolve_formats(spec: str) -> List[str]:
+    """
+    Resolve a format spec ("txt", "all", "json,md") into export format names
+    
+    Args:
+        spec: Single format, comma-separated list, or "all"
+        
+    Returns:
+        List[str]: Format names (keys of EXPORT_WRITERS), in order
+        
+    Raises:
+        ValueError: If a format is not supported
+    """
+    formats = []
+    for name in spec.lower().split(','):
+        name = FORMAT_ALIASES.get(name.strip(), name.strip())
+        if name == 'all':
+            candidates = ALL_FORMATS
+        elif name in EXPORT_WRITERS:
+            candidates = [name]
+        else:
+            raise ValueError(f"Unsupported format: {name}")
+        formats.extend(c for c in candidates if c not in formats)
+    return formats
+
+
+# Table statistics: percentiles reported and fixed histogram bin count
+STAT_PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 10
+
+
+def _histogram_edges(lo: float, hi: float) -> List[float]:
+    """
+    HISTOGRAM_BINS + 1 equal-width edges over [lo, hi], built like numpy.histogram
+    
+    A zero-width range is widened to +-0.5 (as numpy does); a range wider
+    than the float range is interpolated instead of stepped so every edge
+    stays finite.
+    """
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    width = (hi - lo) / HISTOGRAM_BINS
+    if math.isfinite(width):
+        return [lo + i * width for i in range(HISTOGRAM_BINS)] + [hi]
+    return [lo * (1 - i / HISTOGRAM_BINS) + hi * (i / HISTOGRAM_BINS)
+            for i in range(HISTOGRAM_BINS)] + [hi]
+
+
+def _moments_in_range(count: int, lo: float, hi: float) -> bool:
+    """True when the plain sum and sum of squared deviations can't overflow"""
+    peak = max(abs(lo), abs(hi))
+    return math.isfinite(count * peak * peak)
+
+
+def compute_table_stats(data: List[List[float]]) -> Optional[Dict[str, Any]]:
+    """
+    Single-pass statistics kernel for decoded table data
+    
+    Uses NumPy when installed; the pure-Python path sorts once and derives
+    everything else from that. Percentiles use linear interpolation and the
+    histogram uses HISTOGRAM_BINS equal-width bins, each holding
+    edge <= value < next edge (the last bin includes its upper edge), as
+    numpy.histogram does. Tables whose values are too large to square or
+    sum (decodes with huge equations) are scaled by their largest magnitude
+    first, so std and avg stay finite.
+    
+    Args:
+        data: Table rows of converted values
+        
+    Returns:
+        Dict with count, min, max, avg, std, percentiles, unique_count,
+        zero_fraction and histogram - or None for an empty table
+    """
+    if np is not None:
+        arr = np.asarray(data, dtype=float).ravel()
+        count = int(arr.size)
+        if count == 0:
+            return None
+        lo, hi = float(arr.min()), float(arr.max())
+        if _moments_in_range(count, lo, hi):
+            counts, edges = np.histogram(arr, bins=_histogram_edges(lo, hi))
+            percentiles = np.percentile(arr, STAT_PERCENTILES)
+            return {
+                'count': count,
+                'min': lo,
+                'max': hi,
+                'avg': float(arr.mean()),
+                'std': float(arr.std()),
+                'percentiles': {f"p{p}": float(v) for p, v in zip(STAT_PERCENTILES, percentiles)},
+                'unique_count': int(np.unique(arr).size),
+                'zero_fraction': float(np.count_nonzero(arr == 0.0)) / count,
+                'histogram': {'edges': [float(e) for e in edges],
+                              'counts': [int(c) for c in counts]}
+            }
+        # Out-of-range values take the scaled pure-Python path below
+        data = [arr.tolist()]
+    
+    values = sorted(cell for row in data for cell in row)
+    count = len(values)
+    if count == 0:
+        return None
+    
+    lo, hi = values[0], values[-1]
+    total = 0.0
+    unique = 0
+    zeros = 0
+    previous = None
+    for value in values:
+        total += value
+        if value != previous:
+            unique += 1
+            previous = value
+        if value == 0.0:
+            zeros += 1
+    if _moments_in_range(count, lo, hi):
+        mean = total / count
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / count)
+    else:
+        scale = max(abs(lo), abs(hi))
+        scaled = [v / scale for v in values]
+        scaled_mean = math.fsum(scaled) / count
+        mean = scaled_mean * scale
+        std = math.sqrt(math.fsum((v - scaled_mean) ** 2 for v in scaled) / count) * scale
+    
+    def percentile(p: float) -> float:
+        position = p / 100 * (count - 1)
+        below = int(position)
+        above = min(below + 1, count - 1)
+        fraction = position - below
+        step = values[above] - values[below]
+        if math.isfinite(step):
+            return values[below] + step * fraction
+        return values[below] * (1 - fraction) + values[above] * fraction
+    
+    edges = _histogram_edges(lo, hi)
+    counts = [0] * HISTOGRAM_BINS
+    for value in values:
+        counts[min(max(bisect_right(edges, value) - 1, 0), HISTOGRAM_BINS - 1)] += 1
+    
+    return {
+        'count': count,
+        'min': lo,
+        'max': hi,
+        'avg': mean,
+        'std': std,
+        'percentiles': {f"p{p}": percentile(p) for p in STAT_PERCENTILES},
+        'unique_count': unique,
+        'zero_fraction': zeros / count,
+        'histogram': {'edges': edges, 'counts': counts}
+    }
+
+
+# Table anomaly score: weights of the individual checks (sum to 1.0)
+ANOMALY_WEIGHTS = {
+    'roughness': 0.35,          # Mean |second difference| / value spread
+    'sign_changes': 0.25,       # Zig-zag density of first differences
+    'decorrelation': 0.25,      # 1 - mean correlation of adjacent rows/cols
+    'axis_non_monotonic': 0.15, # Axis breakpoints that change direction
+}
+
+# Metric values treated as "fully anomalous" when normalising to 0..1
+# (uniform random noise gives roughness ~0.5 and sign changes ~0.67)
+ANOMALY_ROUGHNESS_FULL = 0.5
+ANOMALY_SIGN_CHANGES_FULL = 0.67
+
+# Scores at/above which a table is flagged in warnings and ranked in reports
+ANOMALY_WARN_SCORE = 0.5
+ANOMALY_REPORT_SCORE = 0.3
+
+
+def _axis_direction_changes(labels: List[float]) -> Optional[float]:
+    """Fraction of axis steps that reverse direction (None if < 3 labels)"""
+    steps = [b - a for a, b in zip(labels, labels[1:]) if b != a]
+    if len(steps) < 2:
+        return None if len(labels) < 3 else 0.0
+    reversals = sum(1 for a, b in zip(steps, steps[1:]) if (a > 0) != (b > 0))
+    return reversals / (len(steps) - 1)
+
+
+def compute_table_anomaly(data: List[List[float]], x_labels: Optional[List[float]] = None,
+                          y_labels: Optional[List[float]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Smoothness / monotonicity anomaly score for decoded table data
+    
+    Wrong strides, sizes or endianness turn smooth calibration maps into
+    noise. Four checks, each normalised to 0..1 and combined with
+    ANOMALY_WEIGHTS:
+    - roughness: mean |second difference| along rows and columns
+    - sign_changes: fraction of adjacent first differences with opposite sign
+    - decorrelation: 1 - mean Pearson correlation of adjacent rows/columns
+    - axis_non_monotonic: axis breakpoints that change direction
+    
+    Uses NumPy when installed; the pure-Python path computes the same metrics.
+    
+    Args:
+        data: Table rows of converted values
+        x_labels: Column axis breakpoints (optional)
+        y_labels: Row axis breakpoints (optional)
+        
+    Returns:
+        Dict with 'score' and the individual metrics, or None when the table
+        is too small (no dimension with 3+ cells) or flat
+    """
+    rows = len(data)
+    cols = len(data[0]) if rows else 0
+    if rows < 3 and cols < 3:
+        return None
+    
+    # Lines to analyse: rows (if 3+ columns) and columns (if 3+ rows). Every
+    # metric is scale-invariant, so values are first scaled by a power of two
+    # (exact) to a largest magnitude below 1 - differences and products of
+    # huge-valued tables then can't overflow
+    if np is not None:
+        arr = np.asarray(data, dtype=float)
+        peak = float(np.abs(arr).max())
+        if peak > 0:
+            arr = np.ldexp(arr, -math.frexp(peak)[1])
+        spread = float(arr.max() - arr.min())
+        if spread == 0:
+            return None
+        d2_sum = 0.0
+        d2_count = 0
+        changes = 0
+        pairs = 0
+        corrs = []
+        for grid in ([arr] if cols >= 3 else []) + ([arr.T] if rows >= 3 else []):
+            d2 = np.abs(np.diff(grid, n=2, axis=1))
+            d2_sum += float(d2.sum())
+            d2_count += d2.size
+            sign = np.sign(np.diff(grid, axis=1))
+            both = sign[:, :-1] * sign[:, 1:]
+            changes += int(np.count_nonzero(both < 0))
+            pairs += int(np.count_nonzero(both))
+            if grid.shape[0] >= 2:
+                centred = grid - grid.mean(axis=1, keepdims=True)
+                a, b = centred[:-1], centred[1:]
+                denom = np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1))
+                valid = denom > 0
+                corrs.extend(((a * b).sum(axis=1)[valid] / denom[valid]).tolist())
+    else:
+        peak = max(abs(cell) for row in data for cell in row)
+        if peak > 0:
+            exponent = math.frexp(peak)[1]
+            data = [[math.ldexp(cell, -exponent) for cell in row] for row in data]
+        flat = [cell for row in data for cell in row]
+        spread = max(flat) - min(flat)
+        if spread == 0:
+            return None
+        lines = []
+        if cols >= 3:
+            lines.append([list(row) for row in data])
+        if rows >= 3:
+            lines.append([[data[r][c] for r in range(rows)] for c in range(cols)])
+        d2_sum = 0.0
+        d2_count = 0
+        changes = 0
+        pairs = 0
+        corrs = []
+        for grid in lines:
+            for line in grid:
+                d1 = [b - a for a, b in zip(line, line[1:])]
+                for a, b in zip(d1, d1[1:]):
+                    d2_sum += abs(b - a)
+                    d2_count += 1
+                    if a and b:
+                        pairs += 1
+                        if (a > 0) != (b > 0):
+                            changes += 1
+            for line_a, line_b in zip(grid, grid[1:]):
+                n = len(line_a)
+                mean_a = sum(line_a) / n
+                mean_b = sum(line_b) / n
+                cov = sum((x - mean_a) * (y - mean_b) for x, y in zip(line_a, line_b))
+                var_a = sum((x - mean_a) ** 2 for x in line_a)
+                var_b = sum((y - mean_b) ** 2 for y in line_b)
+                denom = math.sqrt(var_a * var_b)
+                if denom > 0:
+                    corrs.append(cov / denom)
+    
+    roughness = d2_sum / d2_count / spread if d2_count else 0.0
+    sign_changes = changes / pairs if pairs else 0.0
+    correlation = sum(corrs) / len(corrs) if corrs else None
+    axis_checks = [v for v in (_axis_direction_changes(x_labels or []),
+                               _axis_direction_changes(y_labels or [])) if v is not None]
+    axis_non_monotonic = max(axis_checks) if axis_checks else None
+    
+    parts = {
+        'roughness': min(1.0, roughness / ANOMALY_ROUGHNESS_FULL),
+        'sign_changes': min(1.0, sign_changes / ANOMALY_SIGN_CHANGES_FULL),
+    }
+    if correlation is not None:
+        parts['decorrelation'] = min(1.0, max(0.0, 1.0 - correlation))
+    if axis_non_monotonic is not None:
+        parts['axis_non_monotonic'] = 1.0 if axis_non_monotonic > 0 else 0.0
+    weight = sum(ANOMALY_WEIGHTS[k] for k in parts)
+    score = sum(ANOMALY_WEIGHTS[k] * v for k, v in parts.items()) / weight
+    
+    return {
+        'score': round(score, 4),
+        'roughness': round(roughness, 4),
+        'sign_change_density': round(sign_changes, 4),
+        'neighbour_correlation': round(correlation, 4) if correlation is not None else None,
+        'axis_direction_changes': round(axis_non_monotonic, 4) if axis_non_monotonic is not None else None
+    }
+
+
+def struct_format(size_bits: int, signed: bool, lsb_first: bool) -> Optional[str]:
+    """struct format for an XDF element, matching read_value_from_bin (None if not 8/16/32-bit)"""
+    code = {8: 'b', 16: 'h', 32: 'i'}.get(size_bits)
+    if code is None:
+        return None
+    if not signed:
+        code = code.upper()
+    return ('<' if lsb_first else '>') + code
+
+
+def linear_map(exporter: 'UniversalXDFExporter', equation: Optional[str], size_bits: int,
+               signed: bool = False) -> Optional[Tuple[float, float]]:
+    """
+    (offset, slope) of a linear equation ("X*0.5-40"), or None
+    
+    Linearity is checked at several raw values up to the element's
+    largest raw value. Probing doesn't log: equations that fail at some
+    raw values are simply not linear.
+    """
+    equation = equation or 'X'
+    raw_max = (1 << (size_bits - 1)) - 1 if signed else (1 << size_bits) - 1
+    
+    def f(x):
+        value, _ = exporter.evaluate_math(equation, x, quiet=True)
+        return value
+    
+    f0, f1 = f(0), f(1)
+    if f0 is None or f1 is None or f1 == f0:
+        return None
+    slope = f1 - f0
+    for probe in (2, 100, raw_max // 2, raw_max):
+        value = f(probe)
+        if value is None or abs(value - (f0 + slope * probe)) > 1e-6 * max(1.0, abs(value)):
+            return None
+    return f0, slope
+
+
+def raw_bounds(exporter: 'UniversalXDFExporter', const: Dict) -> Optional[Tuple[int, int]]:
+    """
+    Convert a scalar's rangelow/rangehigh into raw integer bounds
+    
+    Only linear equations (the vast majority: "X*0.5-40") are inverted.
+    Returns None when the range is missing, the equation is non-linear,
+    or the range accepts every raw value.
+    """
+    if const.get('min') is None or const.get('max') is None:
+        return None
+    
+    size_bits = const['size']
+    signed = const.get('signed', False)
+    if size_bits not in (8, 16, 32):
+        return None
+    raw_min = -(1 << (size_bits - 1)) if signed else 0
+    raw_max = (1 << (size_bits - 1)) - 1 if signed else (1 << size_bits) - 1
+    
+    linear = linear_map(exporter, const.get('equation'), size_bits, signed)
+    if linear is None:
+        return None
+    f0, slope = linear
+    low = (const['min'] - f0) / slope
+    high = (const['max'] - f0) / slope
+    if low > high:
+        low, high = high, low
+    low = max(raw_min, int(low) - 1)
+    high = min(raw_max, int(high) + 1)
+    
+    if low <= raw_min and high >= raw_max:
+        return None  # No information
+    return low, high
+
+
+class DefinitionCache:
+    """
+    Thread-safe LRU of parsed XDF definitions, keyed by path + mtime
+    
+    Entries are parsed without a BIN; use for_bin() on the returned
+    exporter. A changed XDF file is re-parsed on the next get().
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self._items = OrderedDict()  # path -> (mtime_ns, UniversalXDFExporter)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, xdf_path: str) -> 'UniversalXDFExporter':
+        """
+        Return the parsed definition, parsing on miss or when the file changed
+        
+        Raises:
+            ValueError: If the XDF cannot be parsed
+            OSError: If the XDF file does not exist
+        """
+        mtime = os.stat(xdf_path).st_mtime_ns
+        with self._lock:
+            cached = self._items.get(xdf_path)
+            if cached is not None and cached[0] == mtime:
+                self._items.move_to_end(xdf_path)
+                self.hits += 1
+                return cached[1]
+        
+        template = UniversalXDFExporter(xdf_path, "")
+        if not template.parse_xdf():
+            raise ValueError(f"XDF parsing failed: {Path(xdf_path).name}")
+        
+        with self._lock:
+            self.misses += 1
+            self._items[xdf_path] = (mtime, template)
+            self._items.move_to_end(xdf_path)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+        return template
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+
 class UniversalXDFExporter:
     """Universal XDF parser and exporter with TunerPro-style output"""
     
@@ -121,7 +580,9 @@ class UniversalXDFExporter:
             level=logging.INFO,
             format='%(levelname)s: %(message)s'
         )
-        self.logger = logging.getLogger(__name__)
+        # Fixed name (not __name__, which is __main__ when run as a script) so
+        # companion modules can quiet it with getLogger('tunerpro_exporter')
+        self.logger = logging.getLogger('tunerpro_exporter')
         
         # Storage for parsed data
         self.xdf_root = None
@@ -148,6 +609,34 @@ class UniversalXDFExporter:
         # Validation statistics
         self.validation_warnings = []
         self.suspicious_tables = []
+        
+        # XDFPATCH entries by BIN file offset, and patch status for the loaded BIN
+        self._patch_index: Dict[int, List[Tuple[Dict, Dict]]] = {}
+        self._patch_layout: Optional[Dict[str, Any]] = None
+        self._patch_counts: Optional[Tuple[List[int], List[int]]] = None
+        
+        # XDFCHECKSUM specs (see tunerpro_checksums) and their status for the loaded BIN
+        self.checksums: List[Dict[str, Any]] = []
+        self.checksum_results: List[Dict[str, Any]] = []
+        
+        # Decoded table data + statistics for the loaded BIN, keyed by id(table),
+        # so writing several formats decodes and analyses each table once
+        self._table_cache: Dict[int, Tuple[Optional[List[List[float]]], Optional[Dict]]] = {}
+        
+        # Axis breakpoints decoded from the loaded BIN, keyed by
+        # (address, count, size_bits, signed, lsb_first, equation) - many
+        # tables share the same RPM / load axis
+        self._axis_cache: Dict[Tuple, List[float]] = {}
+        
+        # Table title -> byte delta applied by apply_relocations()
+        self.relocations: Dict[str, int] = {}
+        
+        # (lowest, highest + 1) XDF address claimed by any element, computed
+        # on the first BIN load to check BASEOFFSET against the image size
+        self._xdf_span: Optional[Tuple[int, int]] = None
+        
+        # tracemalloc results from --memprofile (added to JSON metadata)
+        self.memory_profile: Optional[Dict[str, Any]] = None
     
     def _format_value(self, value: float, decimalpl: int = 2) -> str:
         """
@@ -178,12 +667,32 @@ class UniversalXDFExporter:
         # Read binary data
         try:
             with open(self.bin_path, 'rb') as f:
-                self.bin_data = f.read()
-                self.bin_size = len(self.bin_data)
+                data = f.read()
         except Exception as e:
             self.logger.error(f"Failed to read binary: {e}")
             return False
         
+        return self.load_bin_bytes(data)
+    
+    def load_bin_bytes(self, data: bytes) -> bool:
+        """
+        Load and validate BIN contents already in memory
+        
+        Used for BIN images that don't exist as files (revision store,
+        HTTP uploads). bin_path is only used for its name in exports.
+        
+        Args:
+            data: Raw BIN image
+            
+        Returns:
+            bool: True if valid, False otherwise
+        """
+        self.bin_data = bytes(data)
+        self.bin_size = len(self.bin_data)
+        self._table_cache = {}
+        self._axis_cache = {}
+        self._patch_counts = None
+        
         # Calculate MD5
         self.bin_md5 = hashlib.md5(self.bin_data).hexdigest()
         
@@ -205,8 +714,138 @@ class UniversalXDFExporter:
             f"Binary validated: {self.bin_size} bytes, "
             f"MD5: {self.bin_md5}"
         )
+        
+        # Checksums are verified up front (patch status is checked on demand)
+        if self.checksums:
+            self._refresh_checksum_status()
+        if self.xdf_root is not None:
+            self._check_address_span()
         return True
     
+    def for_bin(self, bin_path: str) -> 'UniversalXDFExporter':
+        """
+        Create an exporter for another BIN that reuses this parsed XDF
+        
+        The XDF tree and extracted elements are shared (read-only), so a
+        definition parsed once can be exported against many BIN files.
+        Call validate_bin_file() on the returned exporter before exporting.
+        
+        Args:
+            bin_path: Path to binary ECU firmware file
+            
+        Returns:
+            UniversalXDFExporter: New exporter sharing this definition
+        """
+        clone = UniversalXDFExporter(str(self.xdf_path), bin_path)
+        clone.xdf_root = self.xdf_root
+        clone.definition_name = self.definition_name
+        clone.categories = self.categories
+        clone.base_offset = self.base_offset
+        clone.base_subtract = self.base_subtract
+        clone.checksums = self.checksums
+        clone.elements = {
+            'constants': self.elements['constants'],
+            'flags': self.elements['flags'],
+            'tables': self.elements['tables'],
+            'patches': self.elements['patches']
+        }
+        clone._patch_index = self._patch_index
+        clone._patch_layout = self._patch_layout
+        clone.relocations = self.relocations
+        if self.xdf_root is not None:
+            clone._xdf_span = self._definition_span()
+        return clone
+    
+    def set_base_offset(self, offset: int, subtract: int = 0):
+        """
+        Replace the XDF's BASEOFFSET (e.g. with a tunerpro_baseoffset result)
+        
+        File offsets worked out at parse time (patch entries, checksum
+        regions) are rebuilt and BIN caches dropped. Earlier for_bin()
+        clones keep the old mapping.
+        
+        Args:
+            offset: BASEOFFSET value
+            subtract: 1 if XDF addresses are reduced by the offset, else 0
+        """
+        self.base_offset = offset
+        self.base_subtract = subtract
+        self.logger.info(f"BASEOFFSET set: offset=0x{offset:X}, subtract={subtract}")
+        
+        if self.xdf_root is not None:
+            self.elements = dict(self.elements, patches=[])
+            self._patch_index = {}
+            self._extract_patches()
+            self.checksums = []
+            self.checksum_results = []
+            self._extract_checksums()
+        self._table_cache = {}
+        self._axis_cache = {}
+        self._patch_counts = None
+    
+    def _definition_span(self) -> Optional[Tuple[int, int]]:
+        """(lowest, highest + 1) XDF address claimed by any element (cached)"""
+        if self._xdf_span is None:
+            intervals = self.element_intervals(to_offset=lambda address: address)
+            if intervals:
+                self._xdf_span = (min(iv['start'] for iv in intervals),
+                                  max(iv['end'] for iv in intervals))
+        return self._xdf_span
+    
+    def _check_address_span(self):
+        """Warn when BASEOFFSET maps the definition outside the loaded BIN"""
+        span = self._definition_span()
+        if span is None:
+            return
+        low, high = span
+        shift = -self.base_offset if self.base_subtract else self.base_offset
+        if low + shift < 0 or high + shift > self.bin_size:
+            self.logger.warning(
+                f"Definition spans file offsets 0x{low + shift:X}-0x{high + shift - 1:X} "
+                f"with BASEOFFSET 0x{self.base_offset:X} (subtract={self.base_subtract}), "
+                f"but the BIN is {self.bin_size} bytes - the offset may not fit this image "
+                f"(check with: tunerpro_exporter.py baseoffset)"
+            )
+    
+    def apply_relocations(self, deltas: Dict[str, int]) -> int:
+        """
+        Move tables by a byte delta without editing the XDF
+        
+        For BINs whose tables sit at shifted addresses (offset maps come
+        from tunerpro_relocate). Each listed table is replaced by a copy
+        with its Z data and BIN-resident axes moved by the delta, so the
+        definition shared with earlier for_bin() clones is left untouched;
+        clones made afterwards inherit the moved tables.
+        
+        Args:
+            deltas: Table title -> bytes to add to its addresses
+            
+        Returns:
+            int: Number of tables moved
+        """
+        tables = []
+        moved = {}
+        for table in self.elements['tables']:
+            delta = deltas.get(table['title'])
+            if delta:
+                table = dict(table, axes={
+                    axis_id: (dict(axis, address=axis['address'] + delta)
+                              if axis.get('address') is not None else axis)
+                    for axis_id, axis in table['axes'].items()
+                })
+                moved[table['title']] = delta
+            tables.append(table)
+        
+        for title in sorted(set(deltas) - set(moved)):
+            if deltas[title]:
+                self.logger.warning(f"Relocation for unknown table '{title}' ignored")
+        
+        self.elements = dict(self.elements, tables=tables)
+        self.relocations = dict(self.relocations, **moved)
+        self._table_cache = {}
+        self.logger.info(f"Relocated {len(moved)} tables")
+        return len(moved)
+    
     def parse_xdf(self) -> bool:
         """
         Parse XDF file and extract all elements
@@ -236,6 +875,9 @@ class UniversalXDFExporter:
         self._extract_flags()
         self._extract_tables()
         self._extract_patches()  # XDFPATCH support for Community Patchlist
+        self._extract_checksums()
+        if self.bin_data is not None:
+            self._check_address_span()
         
         self.logger.info(
             f"Parsed XDF: {len(self.elements['constants'])} constants, "
@@ -542,6 +1184,29 @@ class UniversalXDFExporter:
                     pass
         return 'Uncategorized'
     
+    def _get_range(self, element) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Declared value range of an element (display units)
+        
+        Reads rangelow/rangehigh, falling back to the legacy min/max tags.
+        
+        Returns:
+            Tuple: (min, max) - either may be None if not declared
+        """
+        bounds = []
+        for primary, legacy in (('rangelow', 'min'), ('rangehigh', 'max')):
+            value = None
+            for tag in (primary, legacy):
+                elem = element.find(f'.//{tag}')
+                if elem is not None and elem.text:
+                    try:
+                        value = float(elem.text.strip())
+                        break
+                    except ValueError:
+                        pass
+            bounds.append(value)
+        return bounds[0], bounds[1]
+    
     def _extract_constants(self):
         """Extract all constants (SCALAR values) with bug fixes"""
         for const in self.xdf_root.findall('.//XDFCONSTANT'):
@@ -578,37 +1243,7 @@ class UniversalXDFExporter:
                     pass
             
             # BUG FIX #8: Extract range validation metadata
-            min_val = None
-            max_val = None
-            rangelow_elem = const.find('.//rangelow')
-            rangehigh_elem = const.find('.//rangehigh')
-            
-            if rangelow_elem is not None and rangelow_elem.text:
-                try:
-                    min_val = float(rangelow_elem.text.strip())
-                except ValueError:
-                    pass
-            if rangehigh_elem is not None and rangehigh_elem.text:
-                try:
-                    max_val = float(rangehigh_elem.text.strip())
-                except ValueError:
-                    pass
-            
-            # Legacy min/max tags (fallback)
-            if min_val is None:
-                min_elem = const.find('.//min')
-                if min_elem is not None and min_elem.text:
-                    try:
-                        min_val = float(min_elem.text.strip())
-                    except ValueError:
-                        pass
-            if max_val is None:
-                max_elem = const.find('.//max')
-                if max_elem is not None and max_elem.text:
-                    try:
-                        max_val = float(max_elem.text.strip())
-                    except ValueError:
-                        pass
+            min_val, max_val = self._get_range(const)
             
             self.elements['constants'].append({
                 'title': title,
@@ -755,6 +1390,9 @@ class UniversalXDFExporter:
                 # Extract axis labels with processing
                 axis_labels = self._extract_axis_labels(axis)
                 
+                # Declared range (used for plausibility checks)
+                axis_min, axis_max = self._get_range(axis)
+                
                 axes[axis_id] = {
                     'address': embedded['address'],
                     'count': count,
@@ -766,7 +1404,9 @@ class UniversalXDFExporter:
                     'lsb_first': embedded['lsb_first'],
                     'row_count': embedded['row_count'],
                     'col_count': embedded['col_count'],
-                    'decimalpl': axis_decimalpl
+                    'decimalpl': axis_decimalpl,
+                    'min': axis_min,
+                    'max': axis_max
                 }
             
             # Get Z-axis (data) information
@@ -791,7 +1431,9 @@ class UniversalXDFExporter:
         - description: What the patch does
         - XDFPATCHENTRY elements with address, patchdata, and basedata
         
-        This checks the BIN to determine if each patch is applied or not.
+        Patch/base data is decoded to bytes once here and every entry is
+        indexed by file offset; whether a patch is applied is only checked
+        when asked (patch_status()).
         """
         for patch in self.xdf_root.findall('.//XDFPATCH'):
             title = self._get_title(patch)
@@ -824,65 +1466,189 @@ class UniversalXDFExporter:
                     entries.append({
                         'name': entry_name,
                         'address': address,
+                        'offset': self._xdf_addr_to_file_offset(address),
                         'datasize': datasize,
                         'patchdata': patch_data.upper(),
-                        'basedata': base_data.upper()
+                        'basedata': base_data.upper(),
+                        'patch_bytes': self._hex_bytes(patch_data),
+                        'base_bytes': self._hex_bytes(base_data)
                     })
                 except ValueError:
                     continue
             
             if entries:
-                # Check if patch is applied
-                patch_status = self._check_patch_status(entries)
-                
-                self.elements['patches'].append({
+                patch_dict = {
                     'title': title,
                     'description': description,
                     'category': category,
-                    'entries': entries,
-                    'status': patch_status
-                })
+                    'entries': entries
+                }
+                self.elements['patches'].append(patch_dict)
+                for entry in entries:
+                    self._patch_index.setdefault(entry['offset'], []).append((patch_dict, entry))
+        
+        self._build_patch_layout()
     
-    def _check_patch_status(self, entries: List[Dict]) -> str:
+    @staticmethod
+    def _hex_bytes(text: str) -> Optional[bytes]:
+        """Decode XDFPATCHENTRY hex data (None if empty or not valid hex)"""
+        if not text:
+            return None
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            return None
+    
+    def _build_patch_layout(self):
         """
-        Check if a patch is applied, not applied, or partially applied
+        Precompute the bulk patch comparison for this definition
+        
+        One itemgetter of slices cuts every entry out of a BIN in a single C
+        call; the decoded patch/base data are lined up in matching tuples.
+        Data whose length differs from datasize (or entries at negative
+        offsets) can never match, exactly as with the hex comparison.
+        """
+        entries, spans = [], {}
+        for patch in self.elements['patches']:
+            spans[id(patch)] = (len(entries), len(entries) + len(patch['entries']))
+            entries.extend(patch['entries'])
+        if not entries:
+            self._patch_layout = None
+            return
+        
+        def expected(data: Optional[bytes], entry: Dict) -> Optional[bytes]:
+            return data if data is not None and len(data) == entry['datasize'] else None
+        
+        slices = [slice(e['offset'], e['offset'] + e['datasize']) if e['offset'] >= 0 else slice(0, 0)
+                  for e in entries]
+        self._patch_layout = {
+            'getter': itemgetter(*slices) if len(slices) > 1 else (lambda data: (data[slices[0]],)),
+            'patch': tuple(expected(e['patch_bytes'], e) for e in entries),
+            'base': tuple(expected(e['base_bytes'], e) for e in entries),
+            'spans': spans
+        }
+    
+    def _patch_match_counts(self) -> Tuple[List[int], List[int]]:
+        """Prefix sums of entries matching patch / base data in the loaded BIN"""
+        if self._patch_counts is None:
+            layout = self._patch_layout
+            actual = layout['getter'](self.bin_data)
+            patched = list(map(eq, actual, layout['patch']))
+            # An entry counts as base only when it doesn't already match the patch
+            base = list(map(gt, map(eq, actual, layout['base']), patched))
+            self._patch_counts = (list(accumulate(patched, initial=0)),
+                                  list(accumulate(base, initial=0)))
+        return self._patch_counts
+    
+    def patch_entries_at(self, offset: int) -> List[Tuple[Dict, Dict]]:
+        """(patch, entry) pairs whose entry starts at a BIN file offset"""
+        return self._patch_index.get(offset, [])
+    
+    def patch_status(self, patch: Dict) -> str:
+        """
+        Whether a patch is applied to the loaded BIN
+        
+        Checked lazily: the first call compares every patch entry in one
+        bulk pass, later calls are two prefix-sum lookups.
         
         Args:
-            entries: List of XDFPATCHENTRY dictionaries
+            patch: Patch dict from elements['patches']
             
         Returns:
             str: 'applied', 'not_applied', 'partial', or 'unknown'
         """
-        if not entries or self.bin_data is None:
+        if self.bin_data is None or self._patch_layout is None or not patch['entries']:
             return 'unknown'
+        first, last = self._patch_layout['spans'][id(patch)]
+        patched, base = self._patch_match_counts()
+        return self._check_patch_status(
+            patched[last] - patched[first], base[last] - base[first], last - first
+        )
+    
+    def patch_entry_results(self, patch: Dict) -> List[Dict[str, Any]]:
+        """
+        Per-entry comparison of a patch with the loaded BIN (for reports)
         
-        applied_count = 0
-        base_count = 0
-        total = len(entries)
-        
-        for entry in entries:
-            address = entry['address']
-            datasize = entry['datasize']
-            patch_data = entry['patchdata']
-            base_data = entry['basedata']
-            
-            # Convert address to file offset
-            file_offset = self._xdf_addr_to_file_offset(address)
-            
-            # Validate offset
-            if file_offset < 0 or file_offset + datasize > self.bin_size:
-                continue
-            
-            # Read actual bytes from BIN
-            actual_bytes = self.bin_data[file_offset:file_offset + datasize]
-            actual_hex = actual_bytes.hex().upper()
+        Args:
+            patch: Patch dict from elements['patches']
             
-            # Check if matches patch or base data
-            if patch_data and actual_hex == patch_data:
-                applied_count += 1
-            elif base_data and actual_hex == base_data:
-                base_count += 1
+        Returns:
+            List[Dict]: 'name', 'address', 'offset', 'datasize', 'state'
+                        ('patched', 'base', 'neither', 'out_of_range' or
+                        'unknown' without a BIN) and, for in-range entries,
+                        'patch_diff' / 'base_diff' - file offsets where the
+                        BIN differs from the patch / base data (None when
+                        that data isn't declared)
+        """
+        results = []
+        for entry in patch['entries']:
+            offset = entry['offset']
+            datasize = entry['datasize']
+            result = {
+                'name': entry['name'],
+                'address': entry['address'],
+                'offset': offset,
+                'datasize': datasize
+            }
+            if self.bin_data is None:
+                result['state'] = 'unknown'
+            elif offset < 0 or offset + datasize > self.bin_size:
+                result['state'] = 'out_of_range'
+            else:
+                actual = self.bin_data[offset:offset + datasize]
+                if entry['patch_bytes'] is not None and actual == entry['patch_bytes']:
+                    result['state'] = 'patched'
+                elif entry['base_bytes'] is not None and actual == entry['base_bytes']:
+                    result['state'] = 'base'
+                else:
+                    result['state'] = 'neither'
+                for key, data in (('patch_diff', entry['patch_bytes']),
+                                  ('base_diff', entry['base_bytes'])):
+                    if data is None:
+                        result[key] = None
+                    else:
+                        result[key] = [offset + i for i in range(datasize)
+                                       if i >= len(data) or actual[i] != data[i]]
+            results.append(result)
+        return results
+    
+    def _extract_checksums(self):
+        """Extract XDFCHECKSUM definitions (verified whenever a BIN is loaded)"""
+        if self.xdf_root.find('.//XDFCHECKSUM') is None:
+            return
+        from tunerpro_checksums import parse_xdf_checksums
+        self.checksums = parse_xdf_checksums(self.xdf_root, self._xdf_addr_to_file_offset)
+        if self.checksums and self.bin_data is not None:
+            self._refresh_checksum_status()
+    
+    def _refresh_checksum_status(self):
+        """Verify every XDF-declared checksum against the loaded BIN"""
+        from tunerpro_checksums import verify_checksums
+        self.checksum_results = verify_checksums(self.bin_data, self.checksums)
+        for result in self.checksum_results:
+            if 'error' in result:
+                self.logger.warning(f"Checksum '{result['title']}': {result['error']}")
+            elif not result['ok']:
+                self.logger.warning(
+                    f"Checksum '{result['title']}' mismatch: stored 0x{result['stored']:X}, "
+                    f"computed 0x{result['computed']:X}"
+                )
+            else:
+                self.logger.info(f"Checksum '{result['title']}' OK")
+    
+    @staticmethod
+    def _check_patch_status(applied_count: int, base_count: int, total: int) -> str:
+        """
+        Check if a patch is applied, not applied, or partially applied
         
+        Args:
+            applied_count: Entries whose BIN bytes match the patch data
+            base_count: Entries whose BIN bytes match the base data
+            total: Number of entries in the patch
+            
+        Returns:
+            str: 'applied', 'not_applied', 'partial', or 'unknown'
+        """
         # Determine status
         if applied_count == total:
             return 'applied'
@@ -958,6 +1724,192 @@ class UniversalXDFExporter:
             )
             return None
     
+    def read_raw_values(self, addresses: List[int], size_bits: int,
+                        signed: bool = False,
+                        lsb_first: bool = False) -> Optional[List[int]]:
+        """
+        Bulk-read raw values for many XDF addresses of the same element type
+        
+        Contiguous runs (the common case for table data) are decoded with a
+        single struct call; other layouts fall back to one unpack per address.
+        Values are identical to calling read_value_from_bin() per address.
+        
+        Args:
+            addresses: XDF memory addresses (converted to file offsets)
+            size_bits: Size in bits (8, 16, 32)
+            signed: Whether values are signed
+            lsb_first: True for little-endian, False for big-endian
+            
+        Returns:
+            List[int]: Raw values, or None if any read is out of range
+        """
+        code = {8: 'b', 16: 'h', 32: 'i'}.get(size_bits)
+        if code is None or self.bin_data is None:
+            return None
+        if not signed:
+            code = code.upper()
+        endian = '<' if lsb_first else '>'
+        size_bytes = size_bits // 8
+        
+        offsets = [self._xdf_addr_to_file_offset(a) for a in addresses]
+        if not offsets:
+            return []
+        if min(offsets) < 0 or max(offsets) + size_bytes > self.bin_size:
+            return None
+        
+        first = offsets[0]
+        count = len(offsets)
+        if all(o == first + i * size_bytes for i, o in enumerate(offsets)):
+            return list(struct.unpack_from(f'{endian}{count}{code}', self.bin_data, first))
+        
+        fmt = struct.Struct(f'{endian}{code}')
+        return [fmt.unpack_from(self.bin_data, o)[0] for o in offsets]
+    
+    def axis_labels(self, axis: Dict) -> List[float]:
+        """
+        Breakpoint values for a table X/Y axis
+        
+        Axes with their own EMBEDDEDDATA address are stored in the calibration
+        and are decoded from the loaded BIN (bulk read + axis equation, like
+        table data). Axes without an address - or whose address falls outside
+        the BIN - use the static LABEL values from the XDF. Decoded axes are
+        cached per BIN, so a shared RPM axis is decoded once.
+        
+        Args:
+            axis: Axis dict from a table's 'axes'
+            
+        Returns:
+            List[float]: Axis values
+        """
+        address = axis.get('address')
+        count = axis.get('count', 0)
+        if address is None or count < 1 or self.bin_data is None:
+            return axis.get('labels', [])
+        
+        size_bits = axis.get('size_bits', 8)
+        equation = axis.get('equation') or ''
+        key = (address, count, size_bits, axis.get('signed', False),
+               axis.get('lsb_first', False), equation)
+        labels = self._axis_cache.get(key)
+        if labels is None:
+            size_bytes = max(1, size_bits // 8)
+            raw_values = self.read_raw_values(
+                [address + i * size_bytes for i in range(count)], size_bits,
+                signed=axis.get('signed', False), lsb_first=axis.get('lsb_first', False)
+            )
+            if raw_values is None:
+                self.logger.warning(
+                    f"Axis at XDF addr 0x{address:04X} ({count} x {size_bits}-bit) "
+                    f"is outside the BIN - using XDF labels"
+                )
+                labels = axis.get('labels', [])
+            else:
+                labels = [self.convert_raw_value(equation, raw) for raw in raw_values]
+            self._axis_cache[key] = labels
+        return labels
+    
+    def _table_dimensions(self, table: Dict) -> Tuple[int, int]:
+        """Table rows/cols as used by _read_table_data (EMBEDDEDDATA, then axis counts)"""
+        z_axis = table['axes'].get('z', {})
+        rows = z_axis.get('row_count', 1)
+        cols = z_axis.get('col_count', 1)
+        if rows <= 1 and cols <= 1:
+            rows = max(table['axes'].get('y', {}).get('count', 1), 1)
+            cols = max(table['axes'].get('x', {}).get('count', 1), 1)
+        return rows, cols
+    
+    def _table_cell_addresses(self, table: Dict) -> Optional[List[int]]:
+        """
+        XDF addresses of every table cell in row-major order
+        
+        Mirrors the addressing in _read_table_data, including NEGATIVE
+        major strides (BMW backwards addressing).
+        
+        Returns:
+            List[int]: Cell addresses, or None for 1x1 / address-less tables
+        """
+        z_axis = table['axes'].get('z', {})
+        rows, cols = self._table_dimensions(table)
+        base_address = z_axis.get('address')
+        if (rows <= 1 and cols <= 1) or base_address is None:
+            return None
+        
+        size_bits = z_axis.get('size_bits', 8)
+        size_bytes = size_bits // 8
+        major_stride = z_axis.get('major_stride', 0) or size_bits
+        minor_stride = z_axis.get('minor_stride', 0) or size_bits
+        
+        if major_stride < 0:
+            major_bytes = abs(major_stride // 8)
+            minor_bytes = minor_stride // 8
+            start_address = base_address + (rows - 1) * major_bytes * cols
+            return [
+                start_address - row * major_bytes * cols + col * minor_bytes
+                for row in range(rows) for col in range(cols)
+            ]
+        
+        return [base_address + i * size_bytes for i in range(rows * cols)]
+    
+    def element_intervals(self, to_offset=None) -> List[Dict[str, Any]]:
+        """
+        Byte ranges claimed by every element, as BIN file offsets
+        
+        One interval per constant and flag, per table data block and table
+        axis with its own address, and per patch entry. BASEOFFSET is
+        applied, so intervals are directly comparable with bin_size.
+        
+        Args:
+            to_offset: Address mapping (default: _xdf_addr_to_file_offset;
+                       pass an identity function for raw XDF addresses)
+        
+        Returns:
+            List[Dict]: 'start', 'end' (exclusive), 'kind' ('constant',
+                        'flag', 'table', 'axis', 'patch'), 'title', 'part'
+                        and 'element' (the element dict)
+        """
+        intervals = []
+        to_offset = to_offset or self._xdf_addr_to_file_offset
+        
+        def add(kind: str, element: Dict, address: int, length: int, part: str = ''):
+            start = to_offset(address)
+            intervals.append({
+                'start': start,
+                'end': start + max(1, length),
+                'kind': kind,
+                'title': element.get('title', ''),
+                'part': part,
+                'element': element
+            })
+        
+        for const in self.elements['constants']:
+            add('constant', const, const['address'], (const['size'] + 7) // 8)
+        
+        for flag in self.elements['flags']:
+            add('flag', flag, flag['address'], 1)
+        
+        for table in self.elements['tables']:
+            z_axis = table['axes'].get('z', {})
+            size_bytes = max(1, z_axis.get('size_bits', 8) // 8)
+            addresses = self._table_cell_addresses(table)
+            if addresses:
+                low = min(addresses)
+                add('table', table, low, max(addresses) + size_bytes - low, 'z')
+            elif z_axis.get('address') is not None:
+                add('table', table, z_axis['address'], size_bytes, 'z')
+            
+            for axis_id in ('x', 'y'):
+                axis = table['axes'].get(axis_id, {})
+                if axis.get('address') is not None:
+                    add('axis', table, axis['address'],
+                        max(1, axis.get('count', 1)) * max(1, axis.get('size_bits', 8) // 8),
+                        axis_id)
+        
+        for patch in self.elements['patches']:
+            for entry in patch['entries']:
+                add('patch', patch, entry['address'], entry['datasize'], entry['name'])
+        
+        return intervals
+    
     def _read_table_data(self, table: Dict) -> Optional[List[List[float]]]:
         """Read full 2D/3D table data from binary with NEGATIVE STRIDE support (BUG FIX #6)"""
         z_axis = table['axes'].get('z', {})
@@ -1012,6 +1964,10 @@ class UniversalXDFExporter:
         else:
             start_address = base_address
         
+        # Axis breakpoints for equations that reference Y/Z (A/B)
+        y_labels = self.axis_labels(y_axis)
+        x_labels = self.axis_labels(x_axis)
+        
         # Read table data
         data = []
         
@@ -1052,8 +2008,8 @@ class UniversalXDFExporter:
                     axis_context = {
                         'row_index': row,
                         'col_index': col,
-                        'y_axis_value': y_axis.get('labels', [])[row] if row < len(y_axis.get('labels', [])) else 0,
-                        'x_axis_value': x_axis.get('labels', [])[col] if col < len(x_axis.get('labels', [])) else 0
+                        'y_axis_value': y_labels[row] if row < len(y_labels) else 0,
+                        'x_axis_value': x_labels[col] if col < len(x_labels) else 0
                     }
                     final_value, _ = self.evaluate_math(math_eq, raw_value, axis_context)
                     if final_value is not None:
@@ -1067,46 +2023,85 @@ class UniversalXDFExporter:
         
         return data
     
+    def table_analysis(self, table: Dict) -> Tuple[Optional[List[List[float]]], Optional[Dict[str, Any]]]:
+        """
+        Decoded data and validation/statistics for a table, computed once per BIN
+        
+        Every export format reads tables through here, so exporting several
+        formats from one exporter decodes and analyses each table only once.
+        
+        Returns:
+            Tuple: (table data or None, _validate_table_data() result or None)
+        """
+        key = id(table)
+        cached = self._table_cache.get(key)
+        if cached is None:
+            data = self._read_table_data(table)
+            validation = self._validate_table_data(table, data) if data is not None else None
+            cached = (data, validation)
+            self._table_cache[key] = cached
+        return cached
+    
     def _validate_table_data(self, table: Dict, data: List[List[float]]) -> Dict[str, Any]:
         """Validate table data for suspicious patterns"""
-        if not data or not data[0]:
+        stats = compute_table_stats(data) if data and data[0] else None
+        if stats is None:
             return {'valid': True, 'warnings': []}
         
-        # Flatten data for analysis
-        flat_data = [cell for row in data for cell in row]
-        
-        # Check for all zeros
-        all_zeros = all(cell == 0.0 for cell in flat_data)
-        
-        # Check for all same value
-        unique_values = set(flat_data)
-        all_same = len(unique_values) == 1
+        # All zeros / all same value, straight from the statistics kernel
+        all_zeros = stats['zero_fraction'] == 1.0
+        all_same = stats['unique_count'] == 1
         
         # Check for suspicious patterns
         warnings = []
         
         if all_zeros:
             warnings.append("All cells are zero - possible XDF/BIN mismatch")
-        elif all_same and len(flat_data) > 4:  # Allow small tables with same value
-            warnings.append(f"All cells have same value ({flat_data[0]}) - verify data integrity")
-        
-        # Calculate statistics
-        stats = {
-            'min': min(flat_data),
-            'max': max(flat_data),
-            'avg': statistics.mean(flat_data),
-            'unique_count': len(unique_values)
-        }
+        elif all_same and stats['count'] > 4:  # Allow small tables with same value
+            warnings.append(f"All cells have same value ({stats['min']}) - verify data integrity")
+        
+        # Jagged data / non-monotonic axes (wrong stride, size or endianness)
+        anomaly = compute_table_anomaly(
+            data,
+            self.axis_labels(table['axes'].get('x', {})),
+            self.axis_labels(table['axes'].get('y', {}))
+        )
+        if anomaly and anomaly['score'] >= ANOMALY_WARN_SCORE:
+            warnings.append(
+                f"Table data looks jagged (anomaly score {anomaly['score']:.2f}) - "
+                f"check element size, stride and byte order"
+            )
         
         return {
             'valid': not all_zeros,
             'warnings': warnings,
             'all_zeros': all_zeros,
             'all_same': all_same,
-            'stats': stats
+            'stats': stats,
+            'anomaly': anomaly
         }
     
-    def evaluate_math(self, equation: str, raw_value: int, axis_context: Optional[Dict] = None) -> Tuple[Optional[float], str]:
+    def table_anomalies(self, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Tables ranked by anomaly score, worst first
+        
+        Args:
+            min_score: Only include tables scoring at least this much
+            
+        Returns:
+            List[Dict]: 'title', 'category' and the compute_table_anomaly() metrics
+        """
+        ranked = []
+        for table in self.elements['tables']:
+            _, validation = self.table_analysis(table)
+            anomaly = validation.get('anomaly') if validation else None
+            if anomaly and anomaly['score'] >= min_score:
+                ranked.append(dict(anomaly, title=table['title'], category=table['category']))
+        ranked.sort(key=lambda a: a['score'], reverse=True)
+        return ranked
+    
+    def evaluate_math(self, equation: str, raw_value: int, axis_context: Optional[Dict] = None,
+                      quiet: bool = False) -> Tuple[Optional[float], str]:
         """
         Evaluate math equation with comprehensive variable and function support
         
@@ -1121,6 +2116,7 @@ class UniversalXDFExporter:
             equation: Math equation string (e.g., "0.75 * X - 40")
             raw_value: Raw binary value
             axis_context: Optional dict with 'row_index', 'col_index', 'x_axis_value', 'y_axis_value'
+            quiet: Don't log failures (probing an equation, not exporting)
             
         Returns:
             Tuple[Optional[float], str]: (result, error_message)
@@ -1141,7 +2137,7 @@ class UniversalXDFExporter:
             return float(raw_value), ""
         
         # BUG FIX #1: Pre-check for potential division by zero
-        if raw_value == 0 and re.search(r'/\s*[xX]\b', equation):
+        if raw_value == 0 and not quiet and re.search(r'/\s*[xX]\b', equation):
             self.logger.warning(f"Potential division by zero in equation: {equation} (X=0)")
             # Continue anyway, let exception handler catch actual errors
         
@@ -1197,21 +2193,50 @@ class UniversalXDFExporter:
             
             # BUG FIX #1: Check for invalid results (inf/nan from division by zero)
             if math.isinf(result):
-                self.logger.warning(f"Equation resulted in infinity: {equation} (X={raw_value})")
+                if not quiet:
+                    self.logger.warning(f"Equation resulted in infinity: {equation} (X={raw_value})")
                 return None, f"Division by zero (result=inf)"
             if math.isnan(result):
-                self.logger.warning(f"Equation resulted in NaN: {equation} (X={raw_value})")
+                if not quiet:
+                    self.logger.warning(f"Equation resulted in NaN: {equation} (X={raw_value})")
                 return None, f"Invalid math operation (result=NaN)"
             
             return float(result), ""
             
         except ZeroDivisionError:
-            self.logger.warning(f"Division by zero in equation: {equation} (X={raw_value})")
+            if not quiet:
+                self.logger.warning(f"Division by zero in equation: {equation} (X={raw_value})")
             return None, f"Division by zero"
         except Exception as e:
-            self.logger.error(f"Math evaluation failed for '{equation}' with X={raw_value}: {str(e)}")
+            if not quiet:
+                self.logger.error(f"Math evaluation failed for '{equation}' with X={raw_value}: {str(e)}")
             return None, f"Math evaluation failed: {str(e)}"
     
+    def convert_raw_value(self, equation: Optional[str], raw_value: int,
+                          axis_context: Optional[Dict] = None, quiet: bool = False) -> float:
+        """
+        Apply an XDF equation with the exporters' fallback semantics
+        
+        Returns the raw value (as float) when there is no equation or the
+        equation fails, exactly like the table/scalar export paths. quiet
+        skips evaluate_math's failure logging.
+        """
+        if not equation:
+            return float(raw_value)
+        value, _ = self.evaluate_math(equation, raw_value, axis_context, quiet)
+        return value if value is not None else float(raw_value)
+    
+    def _table_axis_context(self, table: Dict, row: int, col: int) -> Dict:
+        """Axis context for a table cell (variables A/B/Y/Z in evaluate_math)"""
+        y_labels = self.axis_labels(table['axes'].get('y', {}))
+        x_labels = self.axis_labels(table['axes'].get('x', {}))
+        return {
+            'row_index': row,
+            'col_index': col,
+            'y_axis_value': y_labels[row] if row < len(y_labels) else 0,
+            'x_axis_value': x_labels[col] if col < len(x_labels) else 0
+        }
+    
     def export_to_text(self, output_path: str) -> bool:
         """
         Export data in TunerPro format with enhancements
@@ -1232,6 +2257,11 @@ class UniversalXDFExporter:
                 f.write(f"SOURCE DEFINITION: {self.definition_name}\n")
                 f.write(f"Binary Size: {self.bin_size} bytes\n")
                 f.write(f"MD5 Checksum: {self.bin_md5}\n")
+                for result in self.checksum_results:
+                    status = "OK" if result['ok'] else result.get('error', "MISMATCH")
+                    f.write(f"ECU Checksum ({result['title']}): {status}\n")
+                if self.relocations:
+                    f.write(f"Relocated Tables: {len(self.relocations)} (offset override)\n")
                 f.write(f"Exporter: KingAI TunerPro Exporter v{self.VERSION}\n")
                 f.write(f"Author: {self.AUTHOR_ALIAS} ({self.AUTHOR})\n")
                 f.write("=" * 60 + "\n\n")
@@ -1327,10 +2357,11 @@ class UniversalXDFExporter:
                             f.write("\n")
                             
                             # Show ALL axis values
-                            if x_axis.get('labels'):
+                            x_values = self.axis_labels(x_axis)
+                            if x_values:
                                 x_decpl = x_axis.get('decimalpl', 2)
                                 labels_str = ", ".join(
-                                    self._format_value(v, x_decpl) for v in x_axis['labels']
+                                    self._format_value(v, x_decpl) for v in x_values
                                 )
                                 f.write(f"    Values: [{labels_str}]\n")
                         
@@ -1342,10 +2373,11 @@ class UniversalXDFExporter:
                             f.write("\n")
                             
                             # Show ALL axis values
-                            if y_axis.get('labels'):
+                            y_values = self.axis_labels(y_axis)
+                            if y_values:
                                 y_decpl = y_axis.get('decimalpl', 2)
                                 labels_str = ", ".join(
-                                    self._format_value(v, y_decpl) for v in y_axis['labels']
+                                    self._format_value(v, y_decpl) for v in y_values
                                 )
                                 f.write(f"    Values: [{labels_str}]\n")
                         
@@ -1358,12 +2390,9 @@ class UniversalXDFExporter:
                         z_decimalpl = z_axis.get('decimalpl', 2)
                         
                         # Extract and validate table data
-                        table_data = self._read_table_data(table)
+                        table_data, validation = self.table_analysis(table)
                         
                         if table_data is not None:
-                            validation = self._validate_table_data(
-                                table, table_data
-                            )
                             
                             # Show statistics
                             if 'stats' in validation:
@@ -1393,10 +2422,25 @@ class UniversalXDFExporter:
                                     f.write(f" {z_axis['unit']}")
                                 f.write("\n")
                                 
+                                f.write(
+                                    f"    Std Dev: "
+                                    f"{self._format_value(stats['std'], z_decimalpl)}\n"
+                                )
+                                
+                                pct = stats['percentiles']
+                                f.write(
+                                    "    Percentiles (P5/P25/P50/P75/P95): " +
+                                    " / ".join(self._format_value(pct[f"p{p}"], z_decimalpl)
+                                               for p in STAT_PERCENTILES) + "\n"
+                                )
+                                
                                 f.write(
                                     f"    Unique Values: "
                                     f"{stats['unique_count']}\n"
                                 )
+                                
+                                if stats['zero_fraction']:
+                                    f.write(f"    Zero Cells: {stats['zero_fraction']:.1%}\n")
                             
                             # Show warnings
                             if validation.get('warnings'):
@@ -1425,9 +2469,8 @@ class UniversalXDFExporter:
                                     # Get Y-axis label for row if available
                                     y_label = ""
                                     if 'y' in axes:
-                                        y_ax = axes['y']
-                                        if y_ax.get('labels'):
-                                            y_labels = y_ax['labels']
+                                        y_labels = self.axis_labels(axes['y'])
+                                        if y_labels:
                                             if i < len(y_labels):
                                                 y_val = y_labels[i]
                                                 y_label = f" ({self._format_value(y_val, y_decimalpl)})"
@@ -1471,6 +2514,29 @@ class UniversalXDFExporter:
                             "Verify you're using the correct XDF "
                             "for this binary.\n"
                         )
+                    
+                    # Ranking of jagged tables / non-monotonic axes
+                    anomalies = self.table_anomalies(ANOMALY_REPORT_SCORE)
+                    if anomalies:
+                        f.write("\n" + "=" * 60 + "\n")
+                        f.write("⚠️ TABLE ANOMALY RANKING (worst first)\n")
+                        f.write("=" * 60 + "\n\n")
+                        for anomaly in anomalies[:10]:
+                            corr = anomaly['neighbour_correlation']
+                            f.write(
+                                f"  {anomaly['score']:.2f}  {anomaly['title']} "
+                                f"(roughness {anomaly['roughness']:.2f}, "
+                                f"sign changes {anomaly['sign_change_density']:.0%}"
+                                + (f", neighbour corr {corr:.2f}" if corr is not None else "")
+                                + (", non-monotonic axis" if anomaly['axis_direction_changes'] else "")
+                                + ")\n"
+                            )
+                        if len(anomalies) > 10:
+                            f.write(f"  ... and {len(anomalies) - 10} more\n")
+                        f.write(
+                            "\nJagged maps usually mean a wrong element size, "
+                            "stride or byte order in the XDF.\n"
+                        )
                 
                 # Export PATCHES (Community Patchlist support)
                 if self.elements['patches']:
@@ -1480,13 +2546,13 @@ class UniversalXDFExporter:
                     
                     # Group by status
                     applied = [p for p in self.elements['patches'] 
-                               if p['status'] == 'applied']
+                               if self.patch_status(p) == 'applied']
                     not_applied = [p for p in self.elements['patches'] 
-                                   if p['status'] == 'not_applied']
+                                   if self.patch_status(p) == 'not_applied']
                     partial = [p for p in self.elements['patches'] 
-                               if p['status'] == 'partial']
+                               if self.patch_status(p) == 'partial']
                     unknown = [p for p in self.elements['patches'] 
-                               if p['status'] == 'unknown']
+                               if self.patch_status(p) == 'unknown']
                     
                     # Summary
                     f.write(f"Total Patches: {len(self.elements['patches'])}\n")
@@ -1532,6 +2598,17 @@ class UniversalXDFExporter:
                         for patch in partial:
                             f.write(f"  {patch['title']}\n")
                             f.write("    → WARNING: Patch may be corrupted or incompletely applied\n")
+                            for entry in self.patch_entry_results(patch):
+                                if entry['state'] == 'patched':
+                                    continue
+                                line = f"      {entry['name']} @ 0x{entry['offset']:X}: {entry['state']}"
+                                if entry['state'] == 'neither':
+                                    differ = [f"{len(entry[key])} from {name}"
+                                              for key, name in (('base_diff', 'base'), ('patch_diff', 'patch'))
+                                              if entry.get(key) is not None]
+                                    if differ:
+                                        line += f" (bytes differing: {', '.join(differ)})"
+                                f.write(line + "\n")
                         f.write("\n")
                 
                 self.logger.info(f"Export complete: {output_path}")
@@ -1575,6 +2652,12 @@ class UniversalXDFExporter:
                 'tables': [],
                 'patches': []
             }
+            if self.checksum_results:
+                export_data['metadata']['checksums'] = self.checksum_results
+            if self.relocations:
+                export_data['metadata']['relocations'] = self.relocations
+            if self.memory_profile:
+                export_data['metadata']['memory'] = self.memory_profile
             
             # Export scalars
             for const in self.elements['constants']:
@@ -1640,7 +2723,8 @@ class UniversalXDFExporter:
                         'count': axis['count'],
                         'unit': axis['unit'],
                         'address': addr_str,
-                        'labels': axis.get('labels', []),
+                        'labels': (self.axis_labels(axis) if axis_id in ('x', 'y')
+                                   else axis.get('labels', [])),
                         'equation': axis.get('equation', ''),
                         'decimalpl': axis.get('decimalpl', 2)
                     }
@@ -1652,7 +2736,7 @@ class UniversalXDFExporter:
                 z_lsb_first = z_axis.get('lsb_first', False)
                 
                 # Extract full table data
-                table_data = self._read_table_data(table)
+                table_data, validation = self.table_analysis(table)
                 if table_data is not None:
                     # Round values for JSON using proper precision
                     table_entry['data'] = [
@@ -1668,25 +2752,43 @@ class UniversalXDFExporter:
                         'decimalpl': z_decimalpl
                     }
                     
-                    # Add statistics
-                    flat = [v for row in table_data for v in row]
-                    if flat:
+                    # Add statistics (shared with the other formats)
+                    stats = validation.get('stats')
+                    if stats:
                         table_entry['statistics'] = {
-                            'min': round(min(flat), z_decimalpl),
-                            'max': round(max(flat), z_decimalpl),
-                            'avg': round(statistics.mean(flat), z_decimalpl),
-                            'unique_count': len(set(round(v, z_decimalpl) for v in flat))
+                            'min': round(stats['min'], z_decimalpl),
+                            'max': round(stats['max'], z_decimalpl),
+                            'avg': round(stats['avg'], z_decimalpl),
+                            'std': round(stats['std'], z_decimalpl),
+                            'percentiles': {
+                                name: round(value, z_decimalpl)
+                                for name, value in stats['percentiles'].items()
+                            },
+                            'unique_count': stats['unique_count'],
+                            'zero_fraction': round(stats['zero_fraction'], 4),
+                            'histogram': {
+                                'edges': [round(e, z_decimalpl) for e in stats['histogram']['edges']],
+                                'counts': stats['histogram']['counts']
+                            }
                         }
+                    if validation.get('anomaly'):
+                        table_entry['anomaly'] = validation['anomaly']
                 
                 export_data['tables'].append(table_entry)
             
+            # Worst tables first (jagged data / non-monotonic axes)
+            export_data['table_anomalies'] = [
+                {'title': a['title'], 'score': a['score']}
+                for a in self.table_anomalies(ANOMALY_REPORT_SCORE)
+            ]
+            
             # Export patches
             for patch in self.elements['patches']:
                 patch_entry = {
                     'title': patch['title'],
                     'category': patch['category'],
                     'description': patch['description'],
-                    'status': patch['status'],
+                    'status': self.patch_status(patch),
                     'entries_count': len(patch['entries'])
                 }
                 export_data['patches'].append(patch_entry)
@@ -1723,6 +2825,11 @@ class UniversalXDFExporter:
                 f.write(f"| Definition | `{self.definition_name}` |\n")
                 f.write(f"| Binary Size | {self.bin_size:,} bytes |\n")
                 f.write(f"| MD5 Checksum | `{self.bin_md5}` |\n")
+                for result in self.checksum_results:
+                    status = "✓ OK" if result['ok'] else "✗ " + result.get('error', "MISMATCH")
+                    f.write(f"| ECU Checksum ({result['title']}) | {status} |\n")
+                if self.relocations:
+                    f.write(f"| Relocated Tables | {len(self.relocations)} (offset override) |\n")
                 f.write(f"| Export Date | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} |\n")
                 f.write(f"| Exporter | KingAI TunerPro Exporter v{self.VERSION} |\n")
                 f.write(f"| Author | {self.AUTHOR_ALIAS} ({self.AUTHOR}) |\n")
@@ -1805,16 +2912,18 @@ class UniversalXDFExporter:
                         f.write("\n")
                     
                     # Extract table data
-                    table_data = self._read_table_data(table)
+                    table_data, validation = self.table_analysis(table)
                     if table_data is not None:
                         # Statistics
-                        flat = [v for row in table_data for v in row]
-                        if flat:
+                        stats = validation.get('stats')
+                        if stats:
                             z_unit = axes.get('z', {}).get('unit', '')
                             f.write(f"**Statistics:**\n")
-                            f.write(f"- Min: {min(flat):.4f} {z_unit}\n")
-                            f.write(f"- Max: {max(flat):.4f} {z_unit}\n")
-                            f.write(f"- Avg: {statistics.mean(flat):.4f} {z_unit}\n")
+                            f.write(f"- Min: {stats['min']:.4f} {z_unit}\n")
+                            f.write(f"- Max: {stats['max']:.4f} {z_unit}\n")
+                            f.write(f"- Avg: {stats['avg']:.4f} {z_unit}\n")
+                            f.write(f"- Std Dev: {stats['std']:.4f} {z_unit}\n")
+                            f.write(f"- Median: {stats['percentiles']['p50']:.4f} {z_unit}\n")
                             f.write(f"- Dimensions: {len(table_data)} × {len(table_data[0])}\n\n")
                         
                         # Full Data Table (all rows and columns)
@@ -1826,11 +2935,11 @@ class UniversalXDFExporter:
                             f.write(f"**Full Data Table** ({len(table_data)} rows × {cols} cols):\n\n")
                             
                             # Get X-axis labels for header if available
-                            x_labels = axes.get('x', {}).get('labels', [])
+                            x_labels = self.axis_labels(axes.get('x', {}))
                             x_decimalpl = axes.get('x', {}).get('decimalpl', 2)
                             
                             # Get Y-axis labels for row labels
-                            y_labels = axes.get('y', {}).get('labels', [])
+                            y_labels = self.axis_labels(axes.get('y', {}))
                             
                             # Header row with X-axis values
                             if x_labels:
@@ -1865,14 +2974,33 @@ class UniversalXDFExporter:
                     
                     f.write("\n")
                 
+                # Ranking of jagged tables / non-monotonic axes
+                anomalies = self.table_anomalies(ANOMALY_REPORT_SCORE)
+                if anomalies:
+                    f.write("\n---\n\n## Table Anomalies\n\n")
+                    f.write("Worst first. Jagged maps usually mean a wrong element size, "
+                            "stride or byte order in the XDF.\n\n")
+                    f.write("| Score | Table | Roughness | Sign Changes | Neighbour Corr | Axis |\n")
+                    f.write("|-------|-------|-----------|--------------|----------------|------|\n")
+                    for anomaly in anomalies[:20]:
+                        corr = anomaly['neighbour_correlation']
+                        axis = anomaly['axis_direction_changes']
+                        f.write(
+                            f"| {anomaly['score']:.2f} | {anomaly['title']} | "
+                            f"{anomaly['roughness']:.2f} | {anomaly['sign_change_density']:.0%} | "
+                            f"{'-' if corr is None else f'{corr:.2f}'} | "
+                            f"{'-' if axis is None else ('non-monotonic' if axis else 'ok')} |\n"
+                        )
+                    f.write("\n")
+                
                 # Export patches
                 if self.elements['patches']:
                     f.write("\n---\n\n## Patches (Community Patchlist)\n\n")
                     
                     applied = [p for p in self.elements['patches'] 
-                               if p['status'] == 'applied']
+                               if self.patch_status(p) == 'applied']
                     not_applied = [p for p in self.elements['patches'] 
-                                   if p['status'] == 'not_applied']
+                                   if self.patch_status(p) == 'not_applied']
                     
                     f.write(f"**Total Patches:** {len(self.elements['patches'])}\n")
                     f.write(f"- ✅ Applied: {len(applied)}\n")
@@ -1914,6 +3042,80 @@ class UniversalXDFExporter:
             self.logger.error(f"Markdown export failed: {e}")
             return False
 
+    def export_to_csv(self, output_path: str) -> bool:
+        """
+        Export data to CSV format for spreadsheet analysis
+        
+        One row per scalar and flag, and one row per table CELL, so every
+        value can be filtered/pivoted in Excel or Sheets.
+        
+        Args:
+            output_path: Output CSV file path
+            
+        Returns:
+            bool: True if successful
+        """
+        try:
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Type', 'Category', 'Title', 'Address', 'Row', 'Col', 'Value', 'Units'])
+                
+                for const in self.elements['constants']:
+                    raw_value = self.read_value_from_bin(
+                        const['address'], const['size'],
+                        signed=const.get('signed', False),
+                        lsb_first=const.get('lsb_first', False)
+                    )
+                    if raw_value is None:
+                        continue
+                    value = self.convert_raw_value(const['equation'], raw_value)
+                    writer.writerow([
+                        'Scalar', const['category'], const['title'],
+                        f"0x{const['address']:04X}", '', '',
+                        self._format_value(value, const.get('decimalpl', 2)),
+                        const['unit']
+                    ])
+                
+                for flag in self.elements['flags']:
+                    byte_value = self.read_value_from_bin(flag['address'], 8)
+                    if byte_value is None:
+                        continue
+                    is_set = (byte_value & flag['mask']) != 0
+                    writer.writerow([
+                        'Flag', flag['category'], flag['title'],
+                        f"0x{flag['address']:04X}", '', '',
+                        'Set' if is_set else 'Not Set', ''
+                    ])
+                
+                for table in self.elements['tables']:
+                    table_data, _ = self.table_analysis(table)
+                    if table_data is None:
+                        continue
+                    z_axis = table['axes'].get('z', {})
+                    z_decimalpl = z_axis.get('decimalpl', 2)
+                    address = f"0x{z_axis['address']:04X}"
+                    for r, row in enumerate(table_data):
+                        for c, value in enumerate(row):
+                            writer.writerow([
+                                'Table', table['category'], table['title'],
+                                address, r, c,
+                                self._format_value(value, z_decimalpl),
+                                z_axis.get('unit', '')
+                            ])
+                
+                for patch in self.elements['patches']:
+                    writer.writerow([
+                        'Patch', patch['category'], patch['title'],
+                        '', '', '', self.patch_status(patch), ''
+                    ])
+            
+            self.logger.info(f"CSV export complete: {output_path}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"CSV export failed: {e}")
+            return False
+
     def export(self, output_path: str) -> bool:
         """
         Main export function - validates, parses, and exports
@@ -1936,8 +3138,78 @@ class UniversalXDFExporter:
         return self.export_to_text(output_path)
 
 
+# Subcommands provided by companion modules: python tunerpro_exporter.py <command> ...
+# Each module exposes main(argv) -> int exit code
+SUBCOMMANDS = {
+    'batch': ('tunerpro_batch', 'Export many BINs against one XDF (process pool)'),
+    'watch': ('tunerpro_watch', 'Re-export XDF/BIN pairs whenever they are saved'),
+    'identify': ('tunerpro_identify', 'Rank XDFs from a fingerprint index for an unknown BIN'),
+    'diff': ('tunerpro_diff', 'Compare BINs through one XDF (changed values only)'),
+    'revisions': ('tunerpro_revisions', 'Delta-compressed BIN revision store and history'),
+    'serve': ('tunerpro_server', 'Local HTTP export service with warm XDF cache'),
+    'jobs': ('tunerpro_jobs', 'Resumable manifest-driven batch exports (journaled)'),
+    'shards': ('tunerpro_shards', 'Lease-based sharded jobs over a shared work directory'),
+    'triage': ('tunerpro_triage', 'Fast XDF/BIN pairing plausibility score'),
+    'addresses': ('tunerpro_addressmap', 'Overlap, alias and out-of-range address report'),
+    'checksum': ('tunerpro_checksums', 'Verify or recompute ECU checksums (XDF or family preset)'),
+    'patch': ('tunerpro_patcher', 'Apply or revert XDFPATCH items into a new BIN'),
+    'coverage': ('tunerpro_coverage', 'Coverage bitmap, per-page stats and undefined data regions'),
+    'relocate': ('tunerpro_relocate', 'Find tables at shifted addresses (offset map for --relocations)'),
+    'baseoffset': ('tunerpro_baseoffset', 'Test candidate BASEOFFSETs against a BIN and recommend one'),
+    'layout': ('tunerpro_layout', 'Try alternative decodes of jagged tables (transposed, columns, byte order)'),
+    'synth': ('tunerpro_synth', 'Write a synthetic XDF + BIN pair of any size'),
+    'bench': ('tunerpro_bench', 'Time parse/decode/evaluate/writers; compare with a baseline'),
+    'crosscheck': ('tunerpro_crosscheck', 'Check fast decode/evaluate paths against the per-cell reference'),
+}
+
+
 def main():
     """Command-line interface with multi-format support"""
+    # Dispatch subcommands (batch, ...) to their companion modules
+    if len(sys.argv) > 1 and sys.argv[1].lower() in SUBCOMMANDS:
+        module_name = SUBCOMMANDS[sys.argv[1].lower()][0]
+        module = importlib.import_module(module_name)
+        sys.exit(module.main(sys.argv[2:]))
+    
+    # Offset map from 'relocate' for BINs whose tables sit at shifted addresses
+    relocation_file = None
+    if '--relocations' in sys.argv:
+        index = sys.argv.index('--relocations')
+        relocation_file = sys.argv[index + 1] if index + 1 < len(sys.argv) else ''
+        del sys.argv[index:index + 2]
+    
+    # Test candidate BASEOFFSETs against the BIN and use the best one
+    auto_base = '--auto-base' in sys.argv
+    if auto_base:
+        sys.argv.remove('--auto-base')
+    
+    # Per-phase timings (and a Chrome trace file) for this export
+    profile = '--profile' in sys.argv
+    if profile:
+        sys.argv.remove('--profile')
+    profile_files = {}
+    for option in ('--profile-trace', '--profile-json', '--profile-top'):
+        if option in sys.argv:
+            index = sys.argv.index(option)
+            profile_files[option] = sys.argv[index + 1] if index + 1 < len(sys.argv) else ''
+            del sys.argv[index:index + 2]
+            profile = True
+    trace_file = profile_files.get('--profile-trace')
+    # Per-element cost attribution (slower, so opt-in)
+    profile_elements = '--profile-elements' in sys.argv
+    if profile_elements:
+        sys.argv.remove('--profile-elements')
+        profile = True
+    try:
+        profile_top = int(profile_files.get('--profile-top') or 20)
+    except ValueError:
+        print(f"❌ --profile-top needs a number, got '{profile_files['--profile-top']}'")
+        sys.exit(1)
+    # tracemalloc snapshots per phase (peak, retained bytes, allocation sites)
+    memprofile = '--memprofile' in sys.argv
+    if memprofile:
+        sys.argv.remove('--memprofile')
+    
     if len(sys.argv) < 4 or len(sys.argv) > 5:
         print("=" * 70)
         print("  KingAI TunerPro XDF + BIN Universal Exporter")
@@ -1955,12 +3227,26 @@ def main():
         print("  text - Same as txt")
         print("  json - JSON format for programmatic use")
         print("  md   - Markdown format for documentation")
+        print("  csv  - CSV, one row per value/table cell (spreadsheets)")
         print("  all  - Export all formats (txt, json, md)")
         print()
+        print("Commands:")
+        for command, (_, summary) in SUBCOMMANDS.items():
+            print(f"  {command:<8} - {summary}")
+        print(f"  Run 'python {sys.argv[0]} <command> --help' for command usage")
+        print()
         print("Options:")
         print("  --flip-rpm     Flip RPM axis (high-to-low instead of low-to-high)")
         print("  --flip-load    Flip load axis for presentation")
         print("  --no-stats     Omit statistical analysis from output")
+        print("  --relocations FILE  Move tables by an offset map from 'relocate'")
+        print("  --auto-base    Detect BASEOFFSET from the BIN when the XDF's doesn't fit")
+        print("  --profile      Print time and call counts per export phase")
+        print("  --profile-trace FILE  Also write a Chrome trace (chrome://tracing)")
+        print("  --profile-elements    Rank the most expensive elements and equations")
+        print("  --profile-top N       Elements/equations listed (default: 20)")
+        print("  --profile-json FILE   Write the profile (and element ranking) as JSON")
+        print("  --memprofile   Report peak/retained memory per phase (tracemalloc)")
         print()
         print("Examples:")
         print(f"  python {sys.argv[0]} def.xdf fw.bin out.txt")
@@ -1989,6 +3275,17 @@ def main():
     
     # Create exporter
     exporter = UniversalXDFExporter(xdf_file, bin_file)
+    profiler = None
+    if profile:
+        from tunerpro_profile import PhaseProfiler
+        profiler = PhaseProfiler(track_elements=profile_elements)
+        profiler.instrument(exporter)
+    memprofiler = None
+    if memprofile:
+        from tunerpro_profile import MemoryProfiler
+        memprofiler = MemoryProfiler()
+        memprofiler.start()
+        memprofiler.instrument(exporter)
     
     # Validate and parse
     if not exporter.validate_bin_file():
@@ -1999,6 +3296,28 @@ def main():
         print("❌ XDF parsing failed")
         sys.exit(1)
     
+    if auto_base:
+        from tunerpro_baseoffset import describe, detect_base_offset
+        detection = detect_base_offset(exporter)
+        if detection['recommend']:
+            best = detection['best']
+            print(f"🔧 BASEOFFSET auto-detected: {describe(best)}")
+            print(f"   (XDF declares {describe(detection['declared'])})")
+            exporter.set_base_offset(best['base_offset'], best['subtract'])
+        else:
+            print(f"✓ BASEOFFSET kept: {describe(detection['declared'])}")
+    
+    if relocation_file is not None:
+        from tunerpro_relocate import read_relocations
+        try:
+            exporter.apply_relocations(read_relocations(relocation_file))
+        except (OSError, ValueError) as e:
+            print(f"❌ Offset map not loaded: {e}")
+            sys.exit(1)
+    
+    if memprofiler is not None:
+        memprofiler.evaluate(exporter)
+    
     success = True
     outputs = []
     
@@ -2028,6 +3347,33 @@ def main():
         else:
             success = False
     
+    if export_format == 'csv':
+        if exporter.export_to_csv(output_base):
+            outputs.append(('CSV', output_base))
+        else:
+            success = False
+    
+    if profiler is not None:
+        print()
+        for line in profiler.format_summary():
+            print(line)
+        if profile_elements:
+            print()
+            for line in profiler.format_element_report(profile_top):
+                print(line)
+        if profile_files.get('--profile-json'):
+            profiler.write_json(profile_files['--profile-json'], profile_top)
+            print(f"Profile written: {profile_files['--profile-json']}")
+        if trace_file:
+            profiler.write_trace(trace_file)
+            print(f"Trace written: {trace_file} (open in chrome://tracing or ui.perfetto.dev)")
+    
+    if memprofiler is not None:
+        memprofiler.stop()
+        print()
+        for line in memprofiler.format_report():
+            print(line)
+    
     # Summary
     print()
     print("=" * 70)
@@ -2043,7 +3389,7 @@ def main():
         print(f"  • {len(exporter.elements['tables'])} tables")
         if exporter.elements['patches']:
             applied = len([p for p in exporter.elements['patches'] 
-                          if p['status'] == 'applied'])
+                          if exporter.patch_status(p) == 'applied'])
             total = len(exporter.elements['patches'])
             print(f"  • {total} patches ({applied} applied)")
         print()
@@ -2061,4 +3407,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Companion modules import 'tunerpro_exporter'; let them share this module
+    # instead of executing it a second time
+    sys.modules.setdefault('tunerpro_exporter', sys.modules[__name__])
     main()
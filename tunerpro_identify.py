@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - XDF Identification
+===============================================================================
+
+ Find the right XDF for an unknown BIN without trial-exporting every one.
+
+ An index is built once from an XDF library. Each definition gets a
+ fingerprint made of cheap, BIN-checkable evidence:
+
+ - Patch basedata/patchdata   (XDFPATCHENTRY bytes must match one or the other)
+ - Key scalar ranges          (rangelow/rangehigh pre-converted to RAW bounds
+                               for linear equations, so no math at identify time)
+ - Table data blocks          (real calibration is not uniform 0x00/0xFF fill)
+ - Reference anchor bytes     (optional: bytes sampled from a known-good BIN)
+ - BASEOFFSET and the minimum / expected BIN size
+
+ Identifying a BIN is then a few hundred byte comparisons per definition.
+
+ Usage:
+   python tunerpro_exporter.py identify --build <xdf_library> [--index FILE]
+                                        [--reference XDF BIN ...]
+   python tunerpro_exporter.py identify <bin> [--index FILE] [--top N]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tunerpro_exporter import UniversalXDFExporter, raw_bounds, struct_format, __version__
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX = "xdf_index.json"
+
+# Common flash image sizes (same list validate_bin_file warns against)
+COMMON_BIN_SIZES = [128 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024]
+
+# Fingerprint size limits - enough evidence to rank, small enough to stay fast
+MAX_SCALARS = 128
+MAX_BLOCKS = 64
+MAX_ANCHORS = 64
+ANCHOR_BYTES = 8
+
+# Evidence weights for the combined score
+WEIGHTS = {
+    'patches': 0.45,
+    'scalars': 0.35,
+    'blocks': 0.20,
+}
+
+# Anchor bytes come from one tune, so other tunes of the same OS only match
+# some of them - anchors can raise confidence but never lower it
+ANCHOR_BONUS = 0.5
+
+
+def fingerprint_definition(xdf_path: str, reference_bin: Optional[str] = None) -> Optional[Dict]:
+    """
+    Build the identification fingerprint for one XDF
+
+    Args:
+        xdf_path: Path to XDF definition file
+        reference_bin: Optional known-good BIN to sample anchor bytes from
+
+    Returns:
+        Dict fingerprint, or None if the XDF could not be parsed
+    """
+    exporter = UniversalXDFExporter(xdf_path, reference_bin or "")
+    if reference_bin and not exporter.validate_bin_file():
+        reference_bin = None
+    if not exporter.parse_xdf():
+        return None
+
+    to_file = exporter._xdf_addr_to_file_offset
+    extent = 0
+
+    # Scalars - keep the most selective ranges
+    scalars = []
+    for const in exporter.elements['constants']:
+        offset = to_file(const['address'])
+        extent = max(extent, offset + const['size'] // 8)
+        fmt = struct_format(const['size'], const.get('signed', False),
+                             const.get('lsb_first', False))
+        bounds = raw_bounds(exporter, const) if fmt else None
+        if bounds is None:
+            continue
+        span = (bounds[1] - bounds[0] + 1) / float(1 << const['size'])
+        scalars.append((span, [offset, fmt, bounds[0], bounds[1]]))
+    scalars.sort(key=lambda s: s[0])
+
+    for flag in exporter.elements['flags']:
+        extent = max(extent, to_file(flag['address']) + 1)
+
+    # Table Z data blocks
+    blocks = []
+    for table in exporter.elements['tables']:
+        z_axis = table['axes'].get('z', {})
+        rows = max(z_axis.get('row_count', 1), 1)
+        cols = max(z_axis.get('col_count', 1), 1)
+        if rows * cols <= 1:
+            rows = max(table['axes'].get('y', {}).get('count', 1), 1)
+            cols = max(table['axes'].get('x', {}).get('count', 1), 1)
+        length = rows * cols * max(z_axis.get('size_bits', 8) // 8, 1)
+        offset = to_file(z_axis['address'])
+        extent = max(extent, offset + length)
+        if length >= 4:
+            blocks.append([offset, length])
+
+    # Patch entries (decoded once, compared as bytes at identify time)
+    patches = []
+    for patch in exporter.elements['patches']:
+        for entry in patch['entries']:
+            offset = to_file(entry['address'])
+            extent = max(extent, offset + entry['datasize'])
+            patches.append([offset, entry['basedata'], entry['patchdata']])
+
+    # Anchor bytes from a known-good BIN
+    anchors = []
+    if reference_bin:
+        candidates = [b[0] for b in blocks] + [s[1][0] for s in scalars]
+        for offset in candidates[:MAX_ANCHORS]:
+            chunk = exporter.bin_data[offset:offset + ANCHOR_BYTES]
+            if len(chunk) == ANCHOR_BYTES and chunk.count(chunk[0]) != ANCHOR_BYTES:
+                anchors.append([offset, chunk.hex().upper()])
+
+    path = Path(xdf_path)
+    stat = path.stat()
+    return {
+        'xdf': str(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'file_size': stat.st_size,
+        'definition': exporter.definition_name,
+        'base_offset': exporter.base_offset,
+        'base_subtract': exporter.base_subtract,
+        'min_bin_size': extent,
+        'expected_size': next((s for s in COMMON_BIN_SIZES if s >= extent), None),
+        'element_counts': {k: len(v) for k, v in exporter.elements.items()},
+        'reference_bin': str(reference_bin) if reference_bin else None,
+        'patches': patches,
+        'scalars': [s[1] for s in scalars[:MAX_SCALARS]],
+        'blocks': blocks[:MAX_BLOCKS],
+        'anchors': anchors,
+    }
+
+
+def build_index(library: str, index_path: str = DEFAULT_INDEX,
+                references: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Build (or incrementally refresh) the fingerprint index for an XDF library
+
+    Unchanged XDFs (same mtime and size) reuse their existing fingerprint.
+
+    Args:
+        library: Folder searched recursively for *.xdf (or a single XDF)
+        index_path: Index JSON file to write
+        references: Optional {xdf path: known-good BIN path}
+
+    Returns:
+        Dict: The index
+    """
+    references = {str(Path(k).resolve()): v for k, v in (references or {}).items()}
+    root = Path(library)
+    xdf_files = [root] if root.is_file() else sorted(
+        p for p in root.rglob('*') if p.is_file() and p.suffix.lower() == '.xdf'
+    )
+
+    previous = {}
+    if Path(index_path).exists():
+        try:
+            old = load_index(index_path)
+            previous = {d['xdf']: d for d in old.get('definitions', [])}
+        except (ValueError, OSError):
+            previous = {}
+
+    definitions = []
+    for xdf in xdf_files:
+        reference = references.get(str(xdf.resolve()))
+        cached = previous.get(str(xdf))
+        stat = xdf.stat()
+        if (cached and cached['mtime_ns'] == stat.st_mtime_ns
+                and cached['file_size'] == stat.st_size
+                and cached.get('reference_bin') == (str(reference) if reference else None)):
+            definitions.append(cached)
+            continue
+        fingerprint = fingerprint_definition(str(xdf), reference)
+        if fingerprint is not None:
+            definitions.append(fingerprint)
+
+    index = {
+        'index_version': INDEX_VERSION,
+        'exporter_version': __version__,
+        'built': datetime.now().isoformat(),
+        'library': str(library),
+        'definitions': definitions,
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def load_index(index_path: str = DEFAULT_INDEX) -> Dict:
+    """Load a fingerprint index written by build_index()"""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('index_version') != INDEX_VERSION:
+        raise ValueError(f"Unsupported index version in {index_path} - rebuild it")
+    return index
+
+
+def score_definition(fingerprint: Dict, bin_data: bytes) -> Dict:
+    """
+    Score how well a BIN matches one definition fingerprint
+
+    Returns:
+        Dict with 'score' (0.0-1.0) and per-evidence details
+    """
+    bin_size = len(bin_data)
+    evidence = {}
+
+    if fingerprint['patches']:
+        matched = 0
+        for offset, base_hex, patch_hex in fingerprint['patches']:
+            actual = bin_data[offset:offset + len(base_hex or patch_hex) // 2].hex().upper()
+            if actual and (actual == base_hex or actual == patch_hex):
+                matched += 1
+        evidence['patches'] = (matched, len(fingerprint['patches']))
+
+    if fingerprint['scalars']:
+        in_range = 0
+        for offset, fmt, low, high in fingerprint['scalars']:
+            size = struct.calcsize(fmt)
+            raw = bin_data[offset:offset + size]
+            if len(raw) != size or raw == b'\xFF' * size:
+                continue  # Out of range or erased flash - not a calibration value
+            value = struct.unpack(fmt, raw)[0]
+            if low <= value <= high:
+                in_range += 1
+        evidence['scalars'] = (in_range, len(fingerprint['scalars']))
+
+    if fingerprint['blocks']:
+        plausible = 0
+        for offset, length in fingerprint['blocks']:
+            block = bin_data[offset:offset + length]
+            if len(block) == length and block.count(block[0]) != length:
+                plausible += 1
+        evidence['blocks'] = (plausible, len(fingerprint['blocks']))
+
+    if fingerprint['anchors']:
+        matched = 0
+        for offset, hex_bytes in fingerprint['anchors']:
+            if bin_data[offset:offset + len(hex_bytes) // 2].hex().upper() == hex_bytes:
+                matched += 1
+        evidence['anchors'] = (matched, len(fingerprint['anchors']))
+
+    weighted = {k: v for k, v in evidence.items() if k in WEIGHTS}
+    total_weight = sum(WEIGHTS[k] for k in weighted)
+    score = 0.0
+    if total_weight:
+        score = sum(WEIGHTS[k] * hit / count for k, (hit, count) in weighted.items()) / total_weight
+    if 'anchors' in evidence:
+        hit, count = evidence['anchors']
+        score += (1.0 - score) * ANCHOR_BONUS * hit / count
+
+    # Size gate: addresses beyond the BIN mean this definition cannot fit
+    size_note = "ok"
+    if bin_size < fingerprint['min_bin_size']:
+        score *= 0.1
+        size_note = f"BIN too small (needs >= {fingerprint['min_bin_size']} bytes)"
+    elif fingerprint['expected_size'] and bin_size != fingerprint['expected_size']:
+        score *= 0.9
+        size_note = f"expected {fingerprint['expected_size'] // 1024}KB"
+
+    return {
+        'xdf': fingerprint['xdf'],
+        'definition': fingerprint['definition'],
+        'score': round(score, 4),
+        'evidence': {k: f"{hit}/{count}" for k, (hit, count) in evidence.items()},
+        'size': size_note,
+        'base_offset': fingerprint['base_offset'],
+    }
+
+
+def identify(bin_path: str, index: Dict, top: int = 5) -> List[Dict]:
+    """
+    Rank indexed XDF definitions for a BIN
+
+    Args:
+        bin_path: BIN file to identify
+        index: Index from load_index()/build_index()
+        top: Number of candidates to return
+
+    Returns:
+        List[Dict]: Candidates, best first
+    """
+    with open(bin_path, 'rb') as f:
+        bin_data = f.read()
+    scores = [score_definition(fp, bin_data) for fp in index['definitions']]
+    scores.sort(key=lambda s: s['score'], reverse=True)
+    return scores[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Identify command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py identify",
+        description="Rank XDF definitions from a fingerprint index for an unknown BIN"
+    )
+    parser.add_argument('bin', nargs='?', help="BIN file to identify")
+    parser.add_argument('--build', metavar='XDF_LIBRARY',
+                        help="Build/refresh the index from a folder of XDF files")
+    parser.add_argument('--index', default=DEFAULT_INDEX,
+                        help=f"Index file (default: {DEFAULT_INDEX})")
+    parser.add_argument('--reference', nargs=2, action='append', default=[],
+                        metavar=('XDF', 'BIN'),
+                        help="Known-good BIN for an XDF (adds anchor bytes), repeatable")
+    parser.add_argument('--top', type=int, default=5, help="Candidates to show (default: 5)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.build and not args.bin:
+        parser.error("give a BIN to identify or --build XDF_LIBRARY")
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    if args.build:
+        start = time.perf_counter()
+        index = build_index(args.build, args.index, dict(args.reference))
+        print(f"Indexed {len(index['definitions'])} XDF definitions in "
+              f"{time.perf_counter() - start:.2f}s -> {args.index}")
+        if not args.bin:
+            return 0
+    else:
+        try:
+            index = load_index(args.index)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load index: {e}")
+            return 1
+
+    start = time.perf_counter()
+    try:
+        candidates = identify(args.bin, index, args.top)
+    except OSError as e:
+        print(f"❌ Could not read BIN: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps({'bin': args.bin, 'elapsed_ms': round(elapsed_ms, 2),
+                          'candidates': candidates}, indent=2))
+        return 0
+
+    print(f"Candidates for {Path(args.bin).name} "
+          f"({len(index['definitions'])} definitions, {elapsed_ms:.1f} ms):")
+    print()
+    for rank, c in enumerate(candidates, 1):
+        evidence = ", ".join(f"{k} {v}" for k, v in c['evidence'].items()) or "no evidence"
+        print(f"  {rank}. [{c['score'] * 100:5.1f}%] {c['definition']}")
+        print(f"       {c['xdf']}")
+        print(f"       {evidence}; size {c['size']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
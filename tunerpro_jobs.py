@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Resumable Jobs
+===============================================================================
+
+ Manifest-driven batch exports that survive crashes and restarts.
+
+ - Manifest: CSV of XDF/BIN pairs (many definitions in one job)
+ - Per-pair state is checkpointed in an append-only journal
+   (<output_dir>/job_journal.jsonl) as soon as each pair finishes
+ - Rerunning the same command skips completed pairs, retries failures
+   with exponential backoff and picks up anything never attempted
+ - Outputs are written to <file>.<run id>.partial and atomically renamed,
+   so an interrupted run never leaves half-written exports behind (and
+   two runs of one pair never write or delete each other's partials)
+ - SHA-256 of every output is journaled; --verify re-checks them
+
+ Manifest format (one pair per line, '#' comments, optional header row):
+   xdf,bin[,output_base]
+   defs/VY_V6.xdf,bins/92118883.bin
+   defs/VY_V6.xdf,bins/stock.bin,holden/stock
+   Relative paths resolve against the manifest's folder; output_base is
+   relative to <output_dir> (default: <xdf stem>/<bin stem>)
+
+ Usage:
+   python tunerpro_exporter.py jobs run <manifest> <output_dir> [options]
+   python tunerpro_exporter.py jobs status <manifest> <output_dir>
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tunerpro_exporter import (
+    DefinitionCache, EXPORT_WRITERS, resolve_formats, __version__
+)
+
+
+JOURNAL_FILENAME = "job_journal.jsonl"
+PARTIAL_SUFFIX = ".partial"
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+# Parsed XDFs for the current process. Tasks are sorted by XDF, so a worker
+# usually parses each definition once for a whole run of pairs.
+_CACHE = DefinitionCache()
+
+
+def pair_id(xdf: str, bin_path: str, output_base: str) -> str:
+    """Stable identifier for a manifest pair (journal key)"""
+    key = "\0".join((xdf, bin_path, output_base))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def load_manifest(manifest_path: str, output_dir: str) -> List[Dict]:
+    """
+    Read a job manifest into pair tasks
+
+    Args:
+        manifest_path: CSV manifest of xdf,bin[,output_base] rows
+        output_dir: Folder that output bases are relative to
+
+    Returns:
+        List[Dict]: Pairs with 'id', 'xdf', 'bin' and 'output_base'
+
+    Raises:
+        ValueError: If a row is malformed or two rows share an output base
+    """
+    manifest = Path(manifest_path)
+    out_dir = Path(output_dir)
+    pairs = []
+    used: Dict[str, int] = {}
+
+    with open(manifest, 'r', encoding='utf-8', newline='') as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            row = [cell.strip() for cell in row]
+            if not row or not row[0] or row[0].startswith('#'):
+                continue
+            if line_no == 1 and row[0].lower() == 'xdf':
+                continue  # Header row
+            if len(row) < 2 or not row[1]:
+                raise ValueError(f"{manifest.name}:{line_no}: expected xdf,bin[,output_base]")
+
+            xdf, bin_path = (Path(p) if Path(p).is_absolute() else manifest.parent / p
+                             for p in row[:2])
+
+            if len(row) > 2 and row[2]:
+                base = row[2]
+                if base.lower() in used:
+                    raise ValueError(f"{manifest.name}:{line_no}: duplicate output base '{base}'")
+            else:
+                # De-duplicate same-named BINs within one definition folder
+                base = f"{xdf.stem}/{bin_path.stem}"
+                count = used.get(base.lower(), 0)
+                if count:
+                    base = f"{base}_{count + 1}"
+            used[base.lower()] = used.get(base.lower(), 0) + 1
+
+            output_base = str(out_dir / base)
+            pairs.append({
+                'id': pair_id(str(xdf), str(bin_path), output_base),
+                'xdf': str(xdf),
+                'bin': str(bin_path),
+                'output_base': output_base
+            })
+
+    return pairs
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """SHA-256 of a file, or None if it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class JobJournal:
+    """
+    Append-only JSONL checkpoint of per-pair job state
+
+    Each line is a full record for one pair; the latest line for an id wins.
+    A torn final line (crash mid-write) is ignored on load. Pairs without
+    a record are pending.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.records: Dict[str, Dict] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> Dict[str, Dict]:
+        """Replay the journal into self.records"""
+        self.records = {}
+        if not self.path.exists():
+            return self.records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Ignoring unreadable journal line {line_no}")
+                    continue
+                self.records[record['id']] = record
+        return self.records
+
+    def compact(self):
+        """Rewrite the journal with one line per pair (atomic replace)"""
+        tmp_path = self.path.with_name(self.path.name + PARTIAL_SUFFIX)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def append(self, record: Dict):
+        """Durably record the new state of one pair"""
+        self.records[record['id']] = record
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def get(self, pid: str) -> Optional[Dict]:
+        return self.records.get(pid)
+
+
+def _remove_partials(output_base: str, formats: List[str]):
+    """Delete leftovers from interrupted exports of this pair (any run id)"""
+    for fmt in formats:
+        pattern = glob.escape(f"{output_base}.{fmt}") + f"*{PARTIAL_SUFFIX}"
+        for partial in glob.glob(pattern):
+            try:
+                os.unlink(partial)
+            except FileNotFoundError:
+                pass
+
+
+def _init_worker(log_level: int):
+    """Pool initializer: quieten per-export logging in workers"""
+    logging.getLogger('tunerpro_exporter').setLevel(log_level)
+
+
+def run_pair(task: Dict, remove_stale: bool = True) -> Dict:
+    """
+    Export one manifest pair with atomic output files
+
+    Each call writes its own <file>.<run id>.partial files and removes
+    only those on failure.
+
+    Args:
+        task: Pair dict from load_manifest() plus 'formats'
+        remove_stale: Also delete partials left by earlier interrupted runs
+                      (only safe when no other process can be exporting
+                      this pair - not for shard workers)
+
+    Returns:
+        Dict: 'id', 'status' ('done'/'failed'), 'outputs' {path: sha256},
+              'bin_md5', 'error', 'elapsed_s'
+    """
+    start = time.perf_counter()
+    result = {'id': task['id'], 'status': 'failed', 'outputs': {},
+              'bin_md5': None, 'error': None}
+    run_id = uuid.uuid4().hex[:8]
+    partials = []
+
+    try:
+        Path(task['output_base']).parent.mkdir(parents=True, exist_ok=True)
+        if remove_stale:
+            _remove_partials(task['output_base'], task['formats'])
+
+        exporter = _CACHE.get(task['xdf']).for_bin(task['bin'])
+        if not exporter.validate_bin_file():
+            result['error'] = "Binary validation failed"
+            return result
+        result['bin_md5'] = exporter.bin_md5
+
+        for fmt in task['formats']:
+            output_path = f"{task['output_base']}.{fmt}"
+            partial = f"{output_path}.{run_id}{PARTIAL_SUFFIX}"
+            partials.append(partial)
+            if not getattr(exporter, EXPORT_WRITERS[fmt])(partial):
+                result['error'] = f"Export failed for: {fmt}"
+                return result
+            sha = file_sha256(partial)
+            os.replace(partial, output_path)
+            result['outputs'][output_path] = sha
+
+        result['status'] = 'done'
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    finally:
+        for partial in partials:
+            if os.path.exists(partial):
+                os.unlink(partial)
+        result['elapsed_s'] = round(time.perf_counter() - start, 4)
+
+    return result
+
+
+def make_record(pair: Dict, result: Dict, attempts: int) -> Dict:
+    """Journal record for a run_pair() result"""
+    return {
+        'id': pair['id'],
+        'xdf': pair['xdf'],
+        'bin': pair['bin'],
+        'output_base': pair['output_base'],
+        'state': result['status'],
+        'attempts': attempts,
+        'outputs': result['outputs'],
+        'bin_md5': result['bin_md5'],
+        'error': result['error'],
+        'elapsed_s': result['elapsed_s'],
+        'finished': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def _outputs_intact(record: Dict, formats: List[str], output_base: str,
+                    verify: bool) -> bool:
+    """Check a 'done' record still matches the requested formats and files"""
+    expected = {f"{output_base}.{fmt}" for fmt in formats}
+    if not expected.issubset(record.get('outputs', {})):
+        return False
+    for path in expected:
+        if verify:
+            if file_sha256(path) != record['outputs'][path]:
+                return False
+        elif not os.path.exists(path):
+            return False
+    return True
+
+
+def plan_pairs(pairs: List[Dict], journal: JobJournal, formats: List[str],
+               retries: int, retry_failed: bool = False,
+               verify: bool = False) -> Dict[str, List[Dict]]:
+    """
+    Split manifest pairs into work to do and work to skip
+
+    Returns:
+        Dict: 'todo', 'done' and 'exhausted' (failed, out of retries) lists
+    """
+    plan = {'todo': [], 'done': [], 'exhausted': []}
+    for pair in pairs:
+        record = journal.get(pair['id'])
+        if record is None:
+            plan['todo'].append(pair)
+        elif record['state'] == 'done':
+            if _outputs_intact(record, formats, pair['output_base'], verify):
+                plan['done'].append(pair)
+            else:
+                plan['todo'].append(pair)
+        elif retry_failed or record.get('attempts', 0) < retries:
+            plan['todo'].append(pair)
+        else:
+            plan['exhausted'].append(pair)
+    return plan
+
+
+def run_jobs(manifest_path: str, output_dir: str, formats: List[str],
+             workers: Optional[int] = None, retries: int = DEFAULT_RETRIES,
+             backoff: float = DEFAULT_BACKOFF, retry_failed: bool = False,
+             verify: bool = False, log_level: int = logging.WARNING,
+             on_result=None) -> Dict:
+    """
+    Run (or resume) a manifest job
+
+    Args:
+        manifest_path: CSV manifest of XDF/BIN pairs
+        output_dir: Folder for exports and the job journal
+        formats: Export formats (keys of EXPORT_WRITERS)
+        workers: Pool size (default: CPU count, 1 = run in-process)
+        retries: Attempts per pair before it is left as failed
+        backoff: Base delay in seconds; retry n waits backoff * 2**(n-1)
+        retry_failed: Reset attempt counts of previously exhausted pairs
+        verify: Re-hash outputs of completed pairs instead of checking existence
+        log_level: Log level for the exporter during the job
+        on_result: Optional callback(pair, record) after each checkpoint
+
+    Returns:
+        Dict: Totals for this run
+    """
+    start = time.perf_counter()
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    pairs = load_manifest(manifest_path, output_dir)
+    journal = JobJournal(out_dir / JOURNAL_FILENAME)
+    journal.load()
+    journal.compact()
+
+    plan = plan_pairs(pairs, journal, formats, retries, retry_failed, verify)
+    totals = {
+        'pairs': len(pairs),
+        'skipped': len(plan['done']),
+        'exhausted': len(plan['exhausted']),
+        'done': 0,
+        'failed': 0,
+        'attempts': 0
+    }
+
+    # Failed pairs carry their attempt count across runs
+    attempts = {}
+    for pair in plan['todo']:
+        record = journal.get(pair['id'])
+        carried = record is not None and record['state'] == 'failed' and not retry_failed
+        attempts[pair['id']] = record['attempts'] if carried else 0
+
+    # Group by definition so each worker's cache stays warm
+    todo = sorted(plan['todo'], key=lambda p: (p['xdf'], p['bin']))
+    by_id = {p['id']: p for p in todo}
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(todo) or 1))
+
+    def checkpoint(result: Dict) -> bool:
+        """Journal one result; return True if the pair should be retried"""
+        pair = by_id[result['id']]
+        attempts[pair['id']] += 1
+        totals['attempts'] += 1
+        record = make_record(pair, result, attempts[pair['id']])
+        journal.append(record)
+        if on_result:
+            on_result(pair, record)
+        return result['status'] == 'failed' and attempts[pair['id']] < retries
+
+    _init_worker(log_level)
+    pool = None
+    if workers > 1:
+        # Same start-method policy as batch mode
+        methods = multiprocessing.get_all_start_methods()
+        use_fork = 'fork' in methods and sys.platform != 'darwin'
+        ctx = multiprocessing.get_context('fork' if use_fork else 'spawn')
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                   initializer=_init_worker, initargs=(log_level,))
+
+    try:
+        round_no = 0
+        while todo:
+            if round_no:
+                delay = backoff * (2 ** (round_no - 1))
+                if delay > 0:
+                    time.sleep(delay)
+            tasks = [dict(pair, formats=formats) for pair in todo]
+            retry = []
+            if pool is None:
+                for task in tasks:
+                    if checkpoint(run_pair(task)):
+                        retry.append(by_id[task['id']])
+            else:
+                futures = [pool.submit(run_pair, task) for task in tasks]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if checkpoint(result):
+                        retry.append(by_id[result['id']])
+            todo = sorted(retry, key=lambda p: (p['xdf'], p['bin']))
+            round_no += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    for pair in by_id.values():
+        if journal.get(pair['id'])['state'] == 'done':
+            totals['done'] += 1
+        else:
+            totals['failed'] += 1
+
+    totals['elapsed_s'] = round(time.perf_counter() - start, 4)
+    return totals
+
+
+def job_status(manifest_path: str, output_dir: str) -> Dict:
+    """
+    Summarise journal state for a manifest without running anything
+
+    Returns:
+        Dict: Counts per state plus the failed records
+    """
+    pairs = load_manifest(manifest_path, output_dir)
+    journal = JobJournal(Path(output_dir) / JOURNAL_FILENAME)
+    journal.load()
+
+    status = {'pairs': len(pairs), 'done': 0, 'failed': 0, 'pending': 0, 'failures': []}
+    for pair in pairs:
+        record = journal.get(pair['id'])
+        if record is None:
+            status['pending'] += 1
+        elif record['state'] == 'done':
+            status['done'] += 1
+        else:
+            status['failed'] += 1
+            status['failures'].append(record)
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Jobs command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py jobs",
+        description="Resumable manifest-driven batch exports"
+    )
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    run_p = sub.add_parser('run', help="Run or resume a manifest job")
+    run_p.add_argument('manifest', help="CSV manifest: xdf,bin[,output_base]")
+    run_p.add_argument('output_dir', help="Folder for exports and job_journal.jsonl")
+    run_p.add_argument('-f', '--format', default='txt',
+                       help="txt, json, md, csv, comma list, or all (default: txt)")
+    run_p.add_argument('-j', '--workers', type=int, default=None,
+                       help="Worker processes (default: CPU count, 1 = no pool)")
+    run_p.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f"Attempts per pair (default: {DEFAULT_RETRIES})")
+    run_p.add_argument('--backoff', type=float, default=DEFAULT_BACKOFF,
+                       help=f"Base retry delay in seconds, doubled each round "
+                            f"(default: {DEFAULT_BACKOFF})")
+    run_p.add_argument('--retry-failed', action='store_true',
+                       help="Give pairs that ran out of retries a fresh set of attempts")
+    run_p.add_argument('--verify', action='store_true',
+                       help="Re-hash outputs of completed pairs and redo any that differ")
+    run_p.add_argument('-v', '--verbose', action='store_true',
+                       help="Show per-export log messages")
+
+    status_p = sub.add_parser('status', help="Show progress of a manifest job")
+    status_p.add_argument('manifest', help="CSV manifest: xdf,bin[,output_base]")
+    status_p.add_argument('output_dir', help="Folder containing job_journal.jsonl")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == 'status':
+            status = job_status(args.manifest, args.output_dir)
+            print(f"Pairs:   {status['pairs']}")
+            print(f"Done:    {status['done']}")
+            print(f"Failed:  {status['failed']}")
+            print(f"Pending: {status['pending']}")
+            for record in status['failures']:
+                print(f"  ✗ {Path(record['bin']).name} ({Path(record['xdf']).name}, "
+                      f"{record['attempts']} attempt(s)) - {record['error']}")
+            return 0 if status['failed'] == 0 and status['pending'] == 0 else 1
+
+        formats = resolve_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("=" * 70)
+    print(f"  KingAI TunerPro Exporter v{__version__} - Resumable Jobs")
+    print("=" * 70)
+    print(f"Manifest: {args.manifest}")
+    print(f"Journal:  {Path(args.output_dir) / JOURNAL_FILENAME}")
+    print(f"Formats:  {', '.join(formats)}")
+    print()
+
+    def report(pair: Dict, record: Dict):
+        mark = "✓" if record['state'] == 'done' else "✗"
+        line = f"  {mark} {Path(pair['bin']).name} ({record['elapsed_s']:.2f}s)"
+        if record['error']:
+            line += f" - {record['error']} [attempt {record['attempts']}]"
+        print(line)
+
+    try:
+        totals = run_jobs(
+            args.manifest, args.output_dir, formats, args.workers,
+            retries=max(1, args.retries), backoff=args.backoff,
+            retry_failed=args.retry_failed, verify=args.verify,
+            log_level=logging.INFO if args.verbose else logging.WARNING,
+            on_result=report
+        )
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print()
+    print("=" * 70)
+    print(f"Pairs: {totals['pairs']}  already done: {totals['skipped']}  "
+          f"out of retries: {totals['exhausted']}")
+    print(f"This run: {totals['done']} done, {totals['failed']} failed "
+          f"({totals['attempts']} attempt(s)) in {totals['elapsed_s']:.2f}s")
+    return 0 if totals['failed'] == 0 and totals['exhausted'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Table Layout Check
+===============================================================================
+
+ When a map looks wrong the address is usually right and the decode isn't:
+ rows and columns swapped, one column too many or too few, the wrong byte
+ order, signedness or element size. This re-reads each suspect table's
+ data block under every alternative and says which decode looks like a
+ calibration map.
+
+ - Hypotheses per table (one change from the declared layout each):
+     * transposed  - stored column-major / rows and columns swapped
+     * cols-1/+1   - wrong column count (row stride one cell off)
+     * row stride  - rows padded by one cell, or interleaved (twice the
+                     row length apart)
+     * byte-swap   - the other endianness (16/32-bit cells)
+     * signed/unsigned
+     * 8/16-bit    - the other element size, same cell count
+ - The declared hypothesis decodes exactly like the export, including
+   negative major strides (rows stored last to first); the reverse row
+   order isn't tried, it scores the same as the declared one
+ - Each decode is scored on smoothness (1 - the export's anomaly score)
+   and range fit (cells inside the Z axis rangelow/rangehigh, for linear
+   equations); the best beats the declared one by MARGIN to be reported
+ - Every hypothesis is one strided NumPy view of the block (or one struct
+   call), so a whole definition checks in a second or two
+
+ Usage:
+   python tunerpro_exporter.py layout <xdf> <bin> [--all] [--table TITLE]
+       [--min-anomaly N] [--json]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from tunerpro_exporter import (
+    ANOMALY_REPORT_SCORE, UniversalXDFExporter, compute_table_anomaly, linear_map, struct_format
+)
+
+# Optional NumPy acceleration (one frombuffer per hypothesis)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Score weights (renormalised when a table has no usable range)
+WEIGHTS = {
+    'smoothness': 0.7,
+    'range_fit': 0.3,
+}
+
+# A hypothesis is reported when it beats the declared layout by this much
+MARGIN = 0.1
+
+
+def hypotheses(rows: int, cols: int, size_bits: int, signed: bool, lsb_first: bool,
+               major_stride: int = 0, minor_stride: int = 0) -> List[Dict[str, Any]]:
+    """
+    The declared layout plus one-change alternatives
+
+    Cell [r][c] of a hypothesis is read at block start + R * row_pitch +
+    c * col_step bytes, where R is r, or rows - 1 - r when rows_reversed.
+    The declared layout follows _table_cell_addresses(): contiguous rows,
+    or for a negative major stride, rows stored last to first.
+
+    Args:
+        major_stride, minor_stride: Z axis strides in bits (0 = cell size)
+
+    Returns:
+        List[Dict]: 'name', 'rows', 'cols', 'size_bits', 'signed',
+                    'lsb_first', 'row_pitch', 'col_step' (bytes),
+                    'rows_reversed', 'column_major' - declared first
+    """
+    size_bytes = size_bits // 8
+    declared = {'name': 'declared', 'rows': rows, 'cols': cols, 'size_bits': size_bits,
+                'signed': signed, 'lsb_first': lsb_first, 'row_pitch': cols * size_bytes,
+                'col_step': size_bytes, 'rows_reversed': False, 'column_major': False}
+    if major_stride < 0:
+        declared.update(row_pitch=abs(major_stride // 8) * cols,
+                        col_step=(minor_stride or size_bits) // 8, rows_reversed=True)
+    found = [declared]
+
+    def add(name: str, **changes):
+        found.append(dict(declared, name=name, **changes))
+
+    def rows_of(width: int, cell_bytes: int = size_bytes) -> Dict[str, int]:
+        """Contiguous rows of a given width and cell size"""
+        return {'row_pitch': width * cell_bytes, 'col_step': cell_bytes}
+
+    if rows > 1 and cols > 1:
+        add('transposed', row_pitch=size_bytes, col_step=rows * size_bytes,
+            rows_reversed=False, column_major=True)
+    if cols > 2:
+        add(f'cols {cols - 1}', cols=cols - 1, **rows_of(cols - 1))
+    add(f'cols {cols + 1}', cols=cols + 1, **rows_of(cols + 1))
+    if rows > 1:
+        add('row stride +1 cell', **rows_of(cols + 1))
+        add('row stride x2', **rows_of(2 * cols))
+    if size_bits > 8:
+        add('byte-swapped', lsb_first=not lsb_first)
+    add('unsigned' if signed else 'signed', signed=not signed)
+    if size_bits == 8:
+        add('16-bit', size_bits=16, **rows_of(cols, 2))
+    elif size_bits == 16:
+        add('8-bit', size_bits=8, **rows_of(cols, 1))
+    return found
+
+
+def decode(data: bytes, offset: int, hypothesis: Dict[str, Any]):
+    """
+    Raw cells of a block under one hypothesis, rows x cols
+
+    Args:
+        offset: File offset of the block's lowest cell
+
+    Returns:
+        NumPy array or list of row lists, or None when the block doesn't fit
+    """
+    rows, cols = hypothesis['rows'], hypothesis['cols']
+    row_pitch, col_step = hypothesis['row_pitch'], hypothesis['col_step']
+    fmt = struct_format(hypothesis['size_bits'], hypothesis['signed'], hypothesis['lsb_first'])
+    if fmt is None or offset < 0 or row_pitch < 0 or col_step < 0:
+        return None
+    size_bytes = struct.calcsize(fmt)
+    if offset + (rows - 1) * row_pitch + (cols - 1) * col_step + size_bytes > len(data):
+        return None
+
+    if np is not None:
+        cells = np.ndarray((rows, cols), dtype=np.dtype(fmt), buffer=data, offset=offset,
+                           strides=(row_pitch, col_step)).astype(float)
+        return cells[::-1] if hypothesis['rows_reversed'] else cells
+
+    if col_step > 0 and row_pitch % size_bytes == 0 and col_step % size_bytes == 0:
+        # Whole block in one call, then pick the cells out of it
+        span = ((rows - 1) * row_pitch + (cols - 1) * col_step) // size_bytes + 1
+        flat = struct.unpack_from(f'{fmt[0]}{span}{fmt[1]}', data, offset)
+        row_cells, col_cells = row_pitch // size_bytes, col_step // size_bytes
+        grid = [list(flat[r * row_cells:r * row_cells + (cols - 1) * col_cells + 1:col_cells])
+                for r in range(rows)]
+    else:
+        grid = [[struct.unpack_from(fmt, data, offset + r * row_pitch + c * col_step)[0]
+                 for c in range(cols)] for r in range(rows)]
+    return grid[::-1] if hypothesis['rows_reversed'] else grid
+
+
+def _range_fit(cells, linear: Tuple[float, float], low: float, high: float) -> float:
+    """Fraction of cells whose converted value is inside [low, high]"""
+    f0, slope = linear
+    if np is not None:
+        values = f0 + slope * cells
+        return float(np.count_nonzero((values >= low) & (values <= high))) / values.size
+    flat = [f0 + slope * raw for row in cells for raw in row]
+    return sum(1 for value in flat if low <= value <= high) / len(flat)
+
+
+def score_hypothesis(cells, linear: Optional[Tuple[float, float]],
+                     value_range: Tuple[Optional[float], Optional[float]]) -> Dict[str, Any]:
+    """
+    Smoothness and range fit of decoded cells
+
+    Args:
+        cells: decode() result
+        linear: Z equation as (offset, slope), or None if non-linear
+        value_range: Z axis (min, max) in display units
+
+    Returns:
+        Dict: 'score' (0.0-1.0), 'smoothness', 'range_fit' (None if unknown)
+    """
+    anomaly = compute_table_anomaly(cells)
+    # Flat blocks (fill) are no evidence of a map at all
+    parts = {'smoothness': 1.0 - anomaly['score'] if anomaly else 0.0}
+    low, high = value_range
+    if linear is not None and low is not None and high is not None and low < high:
+        parts['range_fit'] = _range_fit(cells, linear, low, high)
+    weight = sum(WEIGHTS[k] for k in parts)
+    score = sum(WEIGHTS[k] * v for k, v in parts.items()) / weight
+    return {
+        'score': round(score, 4),
+        'smoothness': round(parts['smoothness'], 4),
+        'range_fit': round(parts['range_fit'], 4) if 'range_fit' in parts else None
+    }
+
+
+def check_table(exporter: UniversalXDFExporter, table: Dict) -> Optional[Dict[str, Any]]:
+    """
+    Score every decode hypothesis for one table
+
+    Returns:
+        Dict: 'title', 'offset', 'declared' and 'best' (hypothesis dicts with
+              their scores), 'hypotheses' (all, best first), 'suggest' (best
+              beats declared by MARGIN) - or None if the table has no block
+    """
+    addresses = exporter._table_cell_addresses(table)
+    if not addresses:
+        return None
+    z_axis = table['axes'].get('z', {})
+    rows, cols = exporter._table_dimensions(table)
+    offset = exporter._xdf_addr_to_file_offset(min(addresses))
+    value_range = (z_axis.get('min'), z_axis.get('max'))
+    linear_maps: Dict[int, Optional[Tuple[float, float]]] = {}
+
+    scored = []
+    for hypothesis in hypotheses(rows, cols, z_axis.get('size_bits', 8),
+                                 z_axis.get('signed', False), z_axis.get('lsb_first', False),
+                                 z_axis.get('major_stride', 0), z_axis.get('minor_stride', 0)):
+        cells = decode(exporter.bin_data, offset, hypothesis)
+        if cells is None:
+            continue
+        size_bits = hypothesis['size_bits']
+        if size_bits not in linear_maps:
+            linear_maps[size_bits] = linear_map(exporter, z_axis.get('equation'), size_bits)
+        scored.append(dict(hypothesis, **score_hypothesis(cells, linear_maps[size_bits], value_range)))
+
+    if not scored or scored[0]['name'] != 'declared':
+        return None
+    declared = scored[0]
+    scored.sort(key=lambda h: -h['score'])
+    best = scored[0]
+    return {
+        'title': table['title'],
+        'category': table['category'],
+        'offset': offset,
+        'declared': declared,
+        'best': best,
+        'hypotheses': scored,
+        'suggest': best is not declared and best['score'] - declared['score'] >= MARGIN
+    }
+
+
+def check_tables(exporter: UniversalXDFExporter, tables: Optional[List[Dict]] = None,
+                 min_anomaly: float = ANOMALY_REPORT_SCORE) -> List[Dict[str, Any]]:
+    """
+    check_table() for every suspect table, suggestions first
+
+    Args:
+        exporter: Exporter with the XDF parsed and the BIN loaded
+        tables: Tables to check (default: all in the definition)
+        min_anomaly: Only check tables whose declared decode has at least
+                     this anomaly score (0 checks every table)
+    """
+    results = []
+    for table in exporter.elements['tables'] if tables is None else tables:
+        result = check_table(exporter, table)
+        if result is None:
+            continue
+        if min_anomaly > 0 and 1.0 - result['declared']['smoothness'] < min_anomaly:
+            continue
+        results.append(result)
+    results.sort(key=lambda r: (not r['suggest'], -(r['best']['score'] - r['declared']['score'])))
+    return results
+
+
+def describe(hypothesis: Dict[str, Any]) -> str:
+    """One-line description of a scored hypothesis"""
+    contiguous = hypothesis['cols'] * hypothesis['size_bits'] // 8
+    stride = (f", row stride {hypothesis['row_pitch']} bytes"
+              if not hypothesis['column_major'] and hypothesis['row_pitch'] != contiguous else "")
+    layout = (f"{hypothesis['rows']}x{hypothesis['cols']} {hypothesis['size_bits']}-bit "
+              f"{'signed' if hypothesis['signed'] else 'unsigned'} "
+              f"{'LSB' if hypothesis['lsb_first'] else 'MSB'} first"
+              f"{', column-major' if hypothesis['column_major'] else ''}"
+              f"{', rows reversed' if hypothesis['rows_reversed'] else ''}"
+              f"{stride}")
+    fit = (f", range fit {hypothesis['range_fit']:.0%}"
+           if hypothesis['range_fit'] is not None else "")
+    return (f"{hypothesis['name']} ({layout}): score {hypothesis['score']:.2f} "
+            f"(smoothness {hypothesis['smoothness']:.2f}{fit})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Table layout check command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py layout",
+        description="Try alternative decodes of suspect tables (transposed, column count, "
+                    "row stride, row order, byte order, signedness, size)"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bin', help="BIN file")
+    parser.add_argument('--table', action='append', default=[], metavar='TITLE',
+                        help="Only check these tables (wildcards allowed, repeatable)")
+    parser.add_argument('--all', action='store_true',
+                        help="Check every table, not just the jagged ones")
+    parser.add_argument('--min-anomaly', type=float, default=ANOMALY_REPORT_SCORE,
+                        help=f"Anomaly score that makes a table suspect (default: {ANOMALY_REPORT_SCORE})")
+    parser.add_argument('--limit', type=int, default=50, help="Max tables listed (default: 50)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    exporter = UniversalXDFExporter(args.xdf, args.bin)
+    if not exporter.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if not exporter.validate_bin_file():
+        print(f"❌ Binary validation failed: {args.bin}")
+        return 1
+
+    tables = None
+    if args.table:
+        patterns = [p.lower() for p in args.table]
+        tables = [t for t in exporter.elements['tables']
+                  if any(t['title'].lower() == p or fnmatch.fnmatch(t['title'].lower(), p)
+                         for p in patterns)]
+        if not tables:
+            print("❌ No table matches --table")
+            return 1
+
+    # Named tables are always checked
+    min_anomaly = 0.0 if args.all or args.table else args.min_anomaly
+    results = check_tables(exporter, tables, min_anomaly)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    suggested = [r for r in results if r['suggest']]
+    scope = "checked" if min_anomaly == 0 else f"suspect (anomaly >= {min_anomaly})"
+    print(f"Definition: {exporter.definition_name}")
+    print(f"Tables:     {len(results)} {scope}, {len(suggested)} with a better decode")
+    print()
+    for result in results[:args.limit]:
+        mark = "→" if result['suggest'] else "✓"
+        print(f"  {mark} {result['title']} @ 0x{result['offset']:06X}")
+        print(f"      {describe(result['declared'])}")
+        if result['best'] is not result['declared']:
+            print(f"      {describe(result['best'])}")
+    if len(results) > args.limit:
+        print(f"  ... {len(results) - args.limit} more")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
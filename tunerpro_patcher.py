@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Patch Apply / Revert
+===============================================================================
+
+ Apply or remove Community Patchlist (XDFPATCH) items without opening
+ TunerPro. The original BIN is never modified; a patched copy is written.
+
+ - Patches are picked by title (shell-style wildcards, case-insensitive)
+ - Every entry is checked against its expected bytes (basedata to apply,
+   patchdata to revert) BEFORE anything is written - one mismatch and
+   nothing changes, unless --force
+ - Entries already in the requested state are skipped
+ - Two selected patches writing the same bytes are rejected
+ - Addresses go through BASEOFFSET like every other element
+ - --fix-checksums recomputes XDF-declared checksums (or a --checksum-family
+   preset) on the patched image before it is written
+ - The write plan is built once per XDF: many BINs cost one bulk check and
+   one copy each
+
+ Usage:
+   python tunerpro_exporter.py patch <xdf> <bin> --list
+   python tunerpro_exporter.py patch <xdf> <bin> --apply "*Alpha/N*" \\
+       --revert "[PATCH] Immobilizer*" [-o OUT] [--fix-checksums]
+   python tunerpro_exporter.py patch <xdf> a.bin b.bin c.bin --apply "*" \\
+       --output-dir patched/
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import sys
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+from tunerpro_checksums import (
+    CHECKSUM_FAMILIES, family_spec, fix_checksums, verify_checksums, write_bin
+)
+
+
+# Default output name: <stem><OUTPUT_SUFFIX><ext> next to the input
+OUTPUT_SUFFIX = "_patched"
+
+
+def select_patches(exporter: UniversalXDFExporter, patterns: List[str]) -> List[Dict]:
+    """
+    Patches whose title matches any pattern (case-insensitive)
+
+    A pattern equal to a title selects it as-is, so titles like
+    "[PATCH] ..." work without escaping; otherwise fnmatch wildcards apply.
+
+    Raises:
+        ValueError: A pattern matches no patch
+    """
+    selected = []
+    for pattern in patterns:
+        key = pattern.lower()
+        matches = ([p for p in exporter.elements['patches'] if p['title'].lower() == key]
+                   or [p for p in exporter.elements['patches']
+                       if fnmatch.fnmatch(p['title'].lower(), key)])
+        if not matches:
+            raise ValueError(f"no patch title matches '{pattern}'")
+        selected.extend(p for p in matches if not any(p is s for s in selected))
+    return selected
+
+
+class PatchPlan:
+    """Byte writes for a set of patches to apply / revert, checked per BIN"""
+
+    def __init__(self, apply: List[Dict], revert: List[Dict]):
+        """
+        Build the write list
+
+        Args:
+            apply: Patch dicts to apply (basedata -> patchdata)
+            revert: Patch dicts to remove (patchdata -> basedata)
+
+        Raises:
+            ValueError: A patch is both applied and reverted, an entry lacks
+                        the data needed, or two writes overlap
+        """
+        both = [p['title'] for p in apply if any(p is r for r in revert)]
+        if both:
+            raise ValueError(f"patch selected for both apply and revert: {', '.join(both)}")
+
+        self.writes: List[Dict[str, Any]] = []
+        for action, patches in (('apply', apply), ('revert', revert)):
+            for patch in patches:
+                for entry in patch['entries']:
+                    self.writes.append(self._make_write(action, patch, entry))
+
+        self._check_overlaps()
+        self.writes.sort(key=lambda w: w['offset'])
+        self._getter = (itemgetter(*[slice(w['offset'], w['end']) for w in self.writes])
+                        if self.writes else None)
+
+    @staticmethod
+    def _make_write(action: str, patch: Dict, entry: Dict) -> Dict[str, Any]:
+        patch_bytes, base_bytes = entry['patch_bytes'], entry['base_bytes']
+        expected, target = ((base_bytes, patch_bytes) if action == 'apply'
+                            else (patch_bytes, base_bytes))
+        label = f"{patch['title']} / {entry['name']}"
+        if target is None:
+            missing = 'patchdata' if action == 'apply' else 'basedata'
+            raise ValueError(f"{label}: no {missing}, cannot {action}")
+        if len(target) != entry['datasize'] or (expected is not None and len(expected) != entry['datasize']):
+            raise ValueError(f"{label}: data length doesn't match datasize {entry['datasize']}")
+        if entry['offset'] < 0:
+            raise ValueError(f"{label}: negative file offset (check BASEOFFSET)")
+        return {
+            'action': action,
+            'patch': patch['title'],
+            'entry': entry['name'],
+            'offset': entry['offset'],
+            'end': entry['offset'] + entry['datasize'],
+            'expected': expected,
+            'data': target
+        }
+
+    def _check_overlaps(self):
+        ordered = sorted(self.writes, key=lambda w: (w['offset'], w['end']))
+        for before, after in zip(ordered, ordered[1:]):
+            if after['offset'] < before['end']:
+                raise ValueError(
+                    f"'{before['patch']}' and '{after['patch']}' both write "
+                    f"0x{after['offset']:X}-0x{min(before['end'], after['end']) - 1:X}"
+                )
+
+    def check(self, data: bytes) -> Dict[str, List[Dict]]:
+        """
+        Compare a BIN with the plan in one bulk pass
+
+        Returns:
+            Dict: 'pending' (writes to make), 'done' (already in the target
+                  state) and 'conflicts' (bytes match neither side, or the
+                  entry is past the end of the BIN)
+        """
+        result = {'pending': [], 'done': [], 'conflicts': []}
+        if not self.writes:
+            return result
+        actual = self._getter(data)
+        if len(self.writes) == 1:
+            actual = (actual,)
+        for write, current in zip(self.writes, actual):
+            if write['end'] > len(data):
+                result['conflicts'].append(dict(write, reason="past the end of the BIN"))
+            elif current == write['data']:
+                result['done'].append(write)
+            elif write['expected'] is None or current == write['expected']:
+                result['pending'].append(write)
+            else:
+                result['conflicts'].append(dict(write, reason="bytes match neither base nor patch data",
+                                                found=current))
+        return result
+
+    def apply(self, data: bytes, force: bool = False) -> Tuple[bytes, Dict[str, List[Dict]]]:
+        """
+        Patched copy of a BIN image (all entries are checked before any write)
+
+        Args:
+            data: Original BIN image
+            force: Overwrite conflicting entries instead of refusing
+
+        Returns:
+            Tuple: (image - a new bytearray, or data itself when every
+                    entry is already in place - and the check() result)
+
+        Raises:
+            ValueError: Conflicts without force (nothing is written)
+        """
+        state = self.check(data)
+        in_range = [w for w in state['conflicts'] if w['end'] <= len(data)]
+        if (state['conflicts'] and not force) or len(in_range) != len(state['conflicts']):
+            lines = [f"  {w['patch']} / {w['entry']} @ 0x{w['offset']:X}: {w['reason']}"
+                     for w in state['conflicts']]
+            raise ValueError("BIN doesn't match the expected bytes, nothing written:\n"
+                             + "\n".join(lines))
+
+        writes = state['pending'] + in_range
+        if not writes:
+            return data, state
+        image = bytearray(data)
+        for write in writes:
+            image[write['offset']:write['end']] = write['data']
+        return image, state
+
+
+def patch_bin(exporter: UniversalXDFExporter, plan: PatchPlan, output_path: str,
+              force: bool = False, fix: bool = False,
+              extra_checksums: Optional[List[Dict]] = None) -> Dict[str, Any]:
+    """
+    Apply a plan to the exporter's loaded BIN and write the result
+
+    Args:
+        exporter: Exporter with the XDF parsed and the BIN loaded
+        plan: PatchPlan for the exporter's definition
+        output_path: Where to write the patched BIN (atomically)
+        force: Overwrite conflicting entries
+        fix: Recompute XDF-declared (and extra) checksums before writing
+        extra_checksums: Additional checksum specs (e.g. a family preset)
+
+    Returns:
+        Dict: bin, output, written / already / forced counts, checksums
+              (verify results on the written image) and patch statuses after
+
+    Raises:
+        ValueError: Conflicts without force, or a checksum spec that
+                    doesn't fit the image
+    """
+    image, state = plan.apply(exporter.bin_data, force)
+    specs = list(exporter.checksums) + list(extra_checksums or [])
+
+    fixed = 0
+    if fix and specs:
+        image = bytearray(image)
+        fixed = fix_checksums(image, specs)
+    write_bin(output_path, image)
+
+    after = exporter.for_bin(output_path)
+    after.load_bin_bytes(image)
+    titles = sorted({w['patch'] for w in plan.writes})
+    return {
+        'bin': str(exporter.bin_path),
+        'output': output_path,
+        'written': len(state['pending']),
+        'already': len(state['done']),
+        'forced': len(state['conflicts']),
+        'checksums_fixed': fixed,
+        'checksums': after.checksum_results + verify_checksums(image, extra_checksums or []),
+        'status_after': {p['title']: after.patch_status(p)
+                         for p in after.elements['patches'] if p['title'] in titles}
+    }
+
+
+def _output_path(bin_path: str, args) -> str:
+    if args.output:
+        return args.output
+    source = Path(bin_path)
+    directory = Path(args.output_dir) if args.output_dir else source.parent
+    return str(directory / f"{source.stem}{OUTPUT_SUFFIX}{source.suffix}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Patch command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py patch",
+        description="Apply or revert XDFPATCH items, writing a new BIN"
+    )
+    parser.add_argument('xdf', help="XDF definition file with XDFPATCH elements")
+    parser.add_argument('bins', nargs='+', help="BIN file(s) to patch")
+    parser.add_argument('--list', action='store_true', help="List patches and their status")
+    parser.add_argument('--apply', action='append', default=[], metavar='TITLE',
+                        help="Patch title to apply (wildcards allowed, repeatable)")
+    parser.add_argument('--revert', action='append', default=[], metavar='TITLE',
+                        help="Patch title to remove (wildcards allowed, repeatable)")
+    parser.add_argument('-o', '--output', help="Output BIN (single input only)")
+    parser.add_argument('--output-dir', help=f"Directory for <name>{OUTPUT_SUFFIX}.bin outputs")
+    parser.add_argument('--force', action='store_true',
+                        help="Overwrite entries whose bytes match neither base nor patch data")
+    parser.add_argument('--fix-checksums', action='store_true',
+                        help="Recompute checksums on the patched image")
+    parser.add_argument('--checksum-family', choices=sorted(CHECKSUM_FAMILIES),
+                        help="Checksum preset to fix (with --checksum-region/--checksum-store)")
+    parser.add_argument('--checksum-region', action='append', default=[], metavar='START:END',
+                        help="Region for --checksum-family (inclusive file offsets)")
+    parser.add_argument('--checksum-store', type=lambda text: int(text, 0), metavar='ADDR',
+                        help="Stored checksum offset for --checksum-family")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.bins) > 1:
+        parser.error("--output takes a single BIN; use --output-dir for several")
+    if not args.list and not (args.apply or args.revert):
+        parser.error("nothing to do: give --apply/--revert or --list")
+
+    extra = []
+    if args.checksum_family:
+        if not args.checksum_region or args.checksum_store is None:
+            parser.error("--checksum-family needs --checksum-region and --checksum-store")
+        try:
+            regions = []
+            for text in args.checksum_region:
+                start, end = text.split(':')
+                regions.append((int(start, 0), int(end, 0) + 1))
+            extra.append(family_spec(args.checksum_family, regions, args.checksum_store))
+        except ValueError as e:
+            parser.error(f"invalid checksum option: {e}")
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    template = UniversalXDFExporter(args.xdf, "")
+    if not template.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if not template.elements['patches']:
+        print(f"❌ {args.xdf} has no XDFPATCH elements")
+        return 1
+
+    if args.output_dir and (args.apply or args.revert):
+        try:
+            Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"❌ Output directory {args.output_dir}: {e}")
+            return 1
+
+    plan = None
+    if args.apply or args.revert:
+        try:
+            plan = PatchPlan(select_patches(template, args.apply),
+                             select_patches(template, args.revert))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+    results = []
+    for bin_path in args.bins:
+        exporter = template.for_bin(bin_path)
+        if not exporter.validate_bin_file():
+            results.append({'bin': bin_path, 'error': "binary validation failed"})
+            continue
+
+        if plan is None:
+            results.append({
+                'bin': bin_path,
+                'patches': [{'title': p['title'], 'status': exporter.patch_status(p)}
+                            for p in exporter.elements['patches']]
+            })
+            continue
+
+        output_path = _output_path(bin_path, args)
+        # Also for an explicit -o: the input BIN is never modified
+        if Path(output_path).resolve() == Path(bin_path).resolve():
+            results.append({'bin': bin_path, 'error': "output would overwrite the input"})
+            continue
+        try:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            results.append(patch_bin(exporter, plan, output_path, args.force,
+                                     args.fix_checksums, extra))
+        except ValueError as e:
+            results.append({'bin': bin_path, 'error': str(e)})
+        except OSError as e:
+            # Keep going with the other BINs
+            results.append({'bin': bin_path, 'error': f"cannot write {output_path}: {e}"})
+
+    if args.json:
+        print(json.dumps(results if len(results) > 1 else results[0], indent=2))
+    else:
+        marks = {'applied': "✓", 'not_applied': "✗", 'partial': "⚠", 'unknown': "?"}
+        for result in results:
+            name = Path(result['bin']).name
+            if 'error' in result:
+                print(f"❌ {name}: {result['error']}")
+            elif 'patches' in result:
+                print(f"{name}:")
+                for patch in result['patches']:
+                    print(f"  {marks[patch['status']]} {patch['title']}")
+            else:
+                print(f"✓ {name} -> {result['output']}: {result['written']} entries written, "
+                      f"{result['already']} already in place"
+                      + (f", {result['forced']} forced" if result['forced'] else ""))
+                for title, status in result['status_after'].items():
+                    print(f"    {marks[status]} {title}")
+                for check in result['checksums']:
+                    print(f"    checksum {check['title']}: {'OK' if check['ok'] else 'MISMATCH'}")
+
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Phase Profiler
+===============================================================================
+
+ Where does a slow export spend its time? Timings and call counts per
+ export phase, without attaching an external profiler.
+
+ - instrument(exporter) wraps the phase methods of ONE exporter instance
+   (BIN read/hash, XDF parse and each _extract_*, decode, math, table
+   validation, each writer); other exporters and unprofiled runs keep the
+   plain methods, so profiling costs nothing when it's off
+ - Nested phases get self time (e.g. decode.table minus the math.evaluate
+   calls inside it) as well as total time
+ - Coarse phases are also recorded as Chrome trace events (open the JSON
+   in chrome://tracing or https://ui.perfetto.dev); per-value phases
+   (decode.value, math.evaluate, ...) are counted but not traced, which
+   would be millions of events
+ - Opt-in element attribution (track_elements / --profile-elements):
+   decode, equation and validation time, cells and errors per table,
+   constant and flag, plus time per distinct equation - the handful of
+   XDF entries that dominate a slow definition, ranked by total cost
+
+ - MemoryProfiler (--memprofile): tracemalloc snapshots around BIN load,
+   parse, evaluation and each writer - peak and retained bytes per phase,
+   the allocation sites behind them, and the bytes each element type
+   keeps alive; JSON exports carry the numbers in metadata['memory']
+
+ Usage:
+   python tunerpro_exporter.py <xdf> <bin> <output> [format] --profile
+       [--profile-trace FILE] [--profile-elements] [--profile-top N]
+       [--profile-json FILE]
+   python tunerpro_exporter.py <xdf> <bin> <output> [format] --memprofile
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+from tunerpro_exporter import EXPORT_WRITERS
+
+
+# Exporter method -> phase name
+PHASES = {
+    'validate_bin_file': 'bin.read',
+    'load_bin_bytes': 'bin.hash_validate',
+    '_refresh_checksum_status': 'bin.checksums',
+    'parse_xdf': 'xdf.parse',
+    '_extract_header': 'xdf.extract_header',
+    '_extract_categories': 'xdf.extract_categories',
+    '_extract_constants': 'xdf.extract_constants',
+    '_extract_flags': 'xdf.extract_flags',
+    '_extract_tables': 'xdf.extract_tables',
+    '_extract_patches': 'xdf.extract_patches',
+    '_extract_checksums': 'xdf.extract_checksums',
+    'table_analysis': 'tables.analysis',
+    '_read_table_data': 'decode.table',
+    'axis_labels': 'decode.axis',
+    'read_value_from_bin': 'decode.value',
+    'read_raw_values': 'decode.bulk',
+    'evaluate_math': 'math.evaluate',
+    '_validate_table_data': 'validate.table',
+    'patch_status': 'patches.status',
+}
+PHASES.update({method: f'write.{fmt}' for fmt, method in EXPORT_WRITERS.items()})
+
+# Called per value or per axis - counted and timed, but not traced
+UNTRACED = {'decode.value', 'decode.bulk', 'decode.axis', 'math.evaluate', 'patches.status'}
+
+# Trace events kept per run (the summary still covers every call)
+MAX_TRACE_EVENTS = 200000
+
+# Elements and equations listed by default when tracking elements
+TOP_ELEMENTS = 20
+
+# Memory profiling: allocation sites listed per phase and overall, and
+# traceback depth kept by tracemalloc (1 = the allocating line)
+TOP_SITES = 10
+MEMORY_FRAMES = 1
+
+# Exporter methods snapshotted by MemoryProfiler.instrument()
+MEMORY_PHASES = {
+    'validate_bin_file': 'load',
+    'parse_xdf': 'parse',
+}
+MEMORY_PHASES.update({method: f'write.{fmt}' for fmt, method in EXPORT_WRITERS.items()})
+_IGNORED_FILES = {tracemalloc.__file__, __file__, '<unknown>'}
+
+
+class PhaseProfiler:
+    """Per-phase call counts, total and self time, plus trace events"""
+
+    def __init__(self, track_elements: bool = False):
+        """
+        Args:
+            track_elements: Also attribute decode/equation/validation time to
+                            individual elements and equations (slower)
+        """
+        self.stats: Dict[str, List[float]] = {}  # phase -> [calls, total_ns, self_ns]
+        self.events: List[Dict[str, Any]] = []
+        self.dropped_events = 0
+        self.track_elements = track_elements
+        self.element_costs: Dict[int, Dict[str, Any]] = {}  # id(element) -> cost record
+        self.equation_costs: Dict[str, List[int]] = {}  # equation -> [calls, ns, errors]
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+        self._first: Optional[int] = None
+        self._last: Optional[int] = None
+        self._exporter = None
+        self._scalar_index: Dict[Tuple[int, int], Tuple[str, Dict]] = {}
+        self._scalar_count = -1
+
+    def instrument(self, exporter) -> Any:
+        """
+        Time the phase methods of one exporter instance
+
+        Returns:
+            The same exporter (for chaining)
+        """
+        self._exporter = exporter
+        for method_name, phase in PHASES.items():
+            original = getattr(exporter, method_name, None)
+            if original is not None:
+                setattr(exporter, method_name, self._wrap(phase, original))
+        return exporter
+
+    @staticmethod
+    def uninstrument(exporter):
+        """Restore the plain methods on an instrumented exporter"""
+        for method_name in PHASES:
+            exporter.__dict__.pop(method_name, None)
+
+    def _wrap(self, phase: str, func):
+        traced = phase not in UNTRACED
+        clock = time.perf_counter_ns
+        enter, leave = self._element_hooks(phase) if self.track_elements else (None, None)
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            stack = getattr(self._local, 'stack', None)
+            if stack is None:
+                stack = self._local.stack = []
+            token = enter(args) if enter is not None else None
+            stack.append(0)  # Time spent in nested phases
+            result = None
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                end = clock()
+                elapsed = end - start
+                if leave is not None:
+                    leave(args, result, elapsed, token)
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                entry = self.stats.get(phase)
+                if entry is None:
+                    entry = self.stats[phase] = [0, 0, 0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - nested
+                if self._first is None or start < self._first:
+                    self._first = start
+                if self._last is None or end > self._last:
+                    self._last = end
+                if traced:
+                    if len(self.events) < MAX_TRACE_EVENTS:
+                        self.events.append({
+                            'name': phase,
+                            'cat': phase.split('.', 1)[0],
+                            'ph': 'X',
+                            'ts': (start - self._origin) / 1000.0,
+                            'dur': elapsed / 1000.0,
+                            'pid': os.getpid(),
+                            'tid': threading.get_ident()
+                        })
+                    else:
+                        self.dropped_events += 1
+        return timed
+
+    # ------------------------------------------------------------------
+    # Element attribution
+    # ------------------------------------------------------------------
+
+    def _element_hooks(self, phase: str):
+        """(enter, leave) callbacks attributing a phase call to an element"""
+        return {
+            'decode.table': (self._enter_table, self._leave_table),
+            'validate.table': (self._enter_table, self._leave_validate),
+            'math.evaluate': (None, self._after_evaluate),
+            'decode.value': (None, self._after_read),
+        }.get(phase, (None, None))
+
+    def _cost(self, kind: str, element: Dict) -> Dict[str, Any]:
+        cost = self.element_costs.get(id(element))
+        if cost is None:
+            if kind == 'table':
+                equation = element['axes'].get('z', {}).get('equation')
+            else:
+                equation = element.get('equation')
+            cost = self.element_costs[id(element)] = {
+                'kind': kind, 'title': element['title'], 'equation': equation or '',
+                'table_ns': 0, 'read_ns': 0, 'eval_ns': 0, 'validate_ns': 0,
+                'cells': 0, 'evaluations': 0, 'errors': 0
+            }
+        return cost
+
+    def _enter_table(self, args):
+        local = self._local
+        previous = getattr(local, 'element', None)
+        local.element = self._cost('table', args[0])
+        return previous
+
+    def _leave_table(self, args, result, elapsed, previous):
+        cost = self._local.element
+        cost['table_ns'] += elapsed
+        if result:
+            cost['cells'] += len(result) * len(result[0])
+        else:
+            cost['errors'] += 1  # Out of range / not readable
+        self._local.element = previous
+
+    def _leave_validate(self, args, result, elapsed, previous):
+        self._local.element['validate_ns'] += elapsed
+        self._local.element = previous
+
+    def _after_evaluate(self, args, result, elapsed, _):
+        failed = result is None or result[0] is None
+        entry = self.equation_costs.get(args[0])
+        if entry is None:
+            entry = self.equation_costs[args[0]] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += failed
+        # Inside a table decode, or right after a scalar read (the writers
+        # read then convert each constant)
+        cost = getattr(self._local, 'element', None)
+        if cost is None:
+            cost = getattr(self._local, 'scalar', None)
+            self._local.scalar = None
+        if cost is not None:
+            cost['eval_ns'] += elapsed
+            cost['evaluations'] += 1
+            cost['errors'] += failed
+
+    def _after_read(self, args, result, elapsed, _):
+        if getattr(self._local, 'element', None) is not None:
+            return  # Cell of the table being decoded
+        scalar = self._scalar_for(args[0], args[1] if len(args) > 1 else 8)
+        self._local.scalar = scalar
+        if scalar is not None:
+            scalar['read_ns'] += elapsed
+            scalar['cells'] += 1
+            scalar['errors'] += result is None
+
+    def _scalar_for(self, address: int, size_bits: int) -> Optional[Dict[str, Any]]:
+        """Cost record of the constant or flag read at an address"""
+        elements = self._exporter.elements
+        count = len(elements['constants']) + len(elements['flags'])
+        if count != self._scalar_count:
+            # Elements appear when the XDF is parsed - index them then
+            self._scalar_index = {}
+            for flag in reversed(elements['flags']):
+                self._scalar_index[(flag['address'], 8)] = ('flag', flag)
+            for const in reversed(elements['constants']):
+                self._scalar_index[(const['address'], const['size'])] = ('constant', const)
+            self._scalar_count = count
+        found = self._scalar_index.get((address, size_bits))
+        return self._cost(*found) if found else None
+
+    def element_report(self, top: int = TOP_ELEMENTS) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Most expensive elements and equations, by total time
+
+        Returns:
+            Dict: 'elements' [{'kind', 'title', 'equation', 'total_ms',
+                  'decode_ms', 'eval_ms', 'validate_ms', 'cells',
+                  'evaluations', 'errors'}] and 'equations' [{'equation',
+                  'calls', 'total_ms', 'mean_us', 'errors'}]
+        """
+        elements = []
+        for cost in self.element_costs.values():
+            # Table decode time includes its cells' equations
+            decode_ns = cost['table_ns'] - cost['eval_ns'] if cost['kind'] == 'table' else cost['read_ns']
+            total_ns = decode_ns + cost['eval_ns'] + cost['validate_ns']
+            elements.append({
+                'kind': cost['kind'],
+                'title': cost['title'],
+                'equation': cost['equation'],
+                'total_ms': round(total_ns / 1e6, 3),
+                'decode_ms': round(decode_ns / 1e6, 3),
+                'eval_ms': round(cost['eval_ns'] / 1e6, 3),
+                'validate_ms': round(cost['validate_ns'] / 1e6, 3),
+                'cells': cost['cells'],
+                'evaluations': cost['evaluations'],
+                'errors': cost['errors']
+            })
+        elements.sort(key=lambda e: -e['total_ms'])
+
+        equations = [{
+            'equation': equation,
+            'calls': calls,
+            'total_ms': round(total_ns / 1e6, 3),
+            'mean_us': round(total_ns / calls / 1e3, 2),
+            'errors': errors
+        } for equation, (calls, total_ns, errors) in self.equation_costs.items()]
+        equations.sort(key=lambda e: -e['total_ms'])
+        return {'elements': elements[:top], 'equations': equations[:top]}
+
+    def format_element_report(self, top: int = TOP_ELEMENTS) -> List[str]:
+        """element_report() as printable lines"""
+        report = self.element_report(top)
+        lines = [f"Top {len(report['elements'])} elements by cost:",
+                 f"  {'Total ms':>9} {'Decode':>8} {'Eval':>8} {'Valid':>8} {'Cells':>7} "
+                 f"{'Errors':>6}  Element"]
+        for e in report['elements']:
+            lines.append(f"  {e['total_ms']:>9.2f} {e['decode_ms']:>8.2f} {e['eval_ms']:>8.2f} "
+                         f"{e['validate_ms']:>8.2f} {e['cells']:>7} {e['errors']:>6}  "
+                         f"[{e['kind']}] {e['title']}")
+        lines.append(f"Top {len(report['equations'])} equations by cost:")
+        lines.append(f"  {'Total ms':>9} {'Calls':>8} {'Mean us':>8} {'Errors':>6}  Equation")
+        for e in report['equations']:
+            lines.append(f"  {e['total_ms']:>9.2f} {e['calls']:>8} {e['mean_us']:>8.1f} "
+                         f"{e['errors']:>6}  {e['equation']}")
+        return lines
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-phase results, most self time first
+
+        Returns:
+            Dict: 'wall_ms' (first phase start to last phase end) and
+                  'phases' [{'phase', 'calls', 'total_ms', 'self_ms',
+                  'mean_us', 'self_percent'}]
+        """
+        wall_ns = (self._last - self._first) if self._first is not None else 0
+        phases = []
+        for phase, (calls, total_ns, self_ns) in self.stats.items():
+            phases.append({
+                'phase': phase,
+                'calls': calls,
+                'total_ms': round(total_ns / 1e6, 3),
+                'self_ms': round(self_ns / 1e6, 3),
+                'mean_us': round(total_ns / calls / 1e3, 2),
+                'self_percent': round(100.0 * self_ns / wall_ns, 1) if wall_ns else 0.0
+            })
+        phases.sort(key=lambda p: -p['self_ms'])
+        return {'wall_ms': round(wall_ns / 1e6, 3), 'phases': phases}
+
+    def to_json(self, top: int = TOP_ELEMENTS) -> Dict[str, Any]:
+        """summary() plus element_report() when elements are tracked"""
+        result = self.summary()
+        if self.track_elements:
+            result.update(self.element_report(top))
+        return result
+
+    def format_summary(self) -> List[str]:
+        """Summary as printable lines"""
+        summary = self.summary()
+        lines = [f"Profile: {summary['wall_ms']:.1f} ms in profiled phases",
+                 f"  {'Phase':<24} {'Calls':>8} {'Total ms':>10} {'Self ms':>10} "
+                 f"{'Mean us':>10} {'Self %':>7}"]
+        for p in summary['phases']:
+            lines.append(f"  {p['phase']:<24} {p['calls']:>8} {p['total_ms']:>10.1f} "
+                         f"{p['self_ms']:>10.1f} {p['mean_us']:>10.1f} {p['self_percent']:>6.1f}%")
+        return lines
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace-event JSON (complete 'X' events, microseconds)"""
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                     'args': {'name': 'tunerpro_exporter'}}]
+        return {
+            'traceEvents': metadata + self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'summary': self.summary(),
+                'dropped_events': self.dropped_events
+            }
+        }
+
+    def write_json(self, path: str, top: int = TOP_ELEMENTS):
+        """Write to_json() to a file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(top), f, indent=2)
+
+    def write_trace(self, path: str):
+        """Write chrome_trace() to a file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _deep_size(obj: Any, seen: set) -> int:
+    """sys.getsizeof of an object and everything it contains (each object once)"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots around export phases"""
+
+    def __init__(self, top: int = TOP_SITES):
+        self.top = top
+        self.phases: List[Dict[str, Any]] = []
+        self.element_bytes: Dict[str, int] = {}
+        self._exporter = None
+        self._snapshot = None
+        self._depth = 0
+        self._started_here = False
+
+    def start(self):
+        """Start tracing (tracemalloc slows allocation-heavy code 2-3x)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_FRAMES)
+            self._started_here = True
+        self._snapshot = self._take_snapshot()
+
+    def stop(self):
+        """Stop tracing if start() started it"""
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    @staticmethod
+    def _take_snapshot():
+        return tracemalloc.take_snapshot()
+
+    @staticmethod
+    def _sites(stats, top: int) -> List[Dict[str, Any]]:
+        """
+        Largest allocation sites, leaving out the profiler's own bookkeeping
+        (filtered per line here - Snapshot.filter_traces is far too slow)
+        """
+        sites = []
+        for stat in stats:
+            frame = stat.traceback[0]
+            if frame.filename in _IGNORED_FILES or frame.filename.startswith('<frozen importlib'):
+                continue
+            sites.append({
+                'site': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                'bytes': getattr(stat, 'size_diff', stat.size),
+                'count': getattr(stat, 'count_diff', stat.count)
+            })
+            if len(sites) == top:
+                break
+        return sites
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measure one phase: peak while it ran, bytes it left allocated, and
+        the allocation sites that grew (nested phases count in the outer one)
+        """
+        if not tracemalloc.is_tracing() or self._depth:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+
+        self._depth += 1
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = self._take_snapshot()
+            grown = [stat for stat in snapshot.compare_to(self._snapshot, 'lineno')
+                     if stat.size_diff > 0]
+            self._snapshot = snapshot
+            self.phases.append({
+                'phase': name,
+                'seconds': round(seconds, 4),
+                'peak_bytes': peak,
+                'phase_peak_bytes': peak - before,
+                'retained_bytes': current - before,
+                'current_bytes': current,
+                'top_sites': self._sites(grown, self.top)
+            })
+            self._measure_elements()
+            if self._exporter is not None:
+                self._exporter.memory_profile = self.report(sites=False)
+
+    def instrument(self, exporter) -> Any:
+        """
+        Snapshot BIN load, parse and each writer of one exporter instance
+
+        Returns:
+            The same exporter (for chaining)
+        """
+        self._exporter = exporter
+        for method_name, name in MEMORY_PHASES.items():
+            original = getattr(exporter, method_name, None)
+            if original is not None:
+                setattr(exporter, method_name, self._wrap(name, original))
+        return exporter
+
+    def _wrap(self, name: str, func):
+        @wraps(func)
+        def measured(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+        return measured
+
+    def evaluate(self, exporter):
+        """Decode, convert and validate every table as its own phase"""
+        with self.phase('evaluate'):
+            for table in exporter.elements['tables']:
+                exporter.table_analysis(table)
+
+    def _measure_elements(self):
+        """Bytes kept alive by each element type and the decoded-table cache"""
+        exporter = self._exporter
+        if exporter is None:
+            return
+        seen: set = set()
+        sizes = {kind: _deep_size(items, seen) for kind, items in exporter.elements.items()}
+        if exporter._table_cache:
+            sizes['decoded_tables'] = _deep_size(exporter._table_cache, seen)
+        if exporter._axis_cache:
+            sizes['decoded_axes'] = _deep_size(exporter._axis_cache, seen)
+        self.element_bytes = sizes
+
+    def report(self, sites: bool = True) -> Dict[str, Any]:
+        """
+        Results so far
+
+        Args:
+            sites: Include allocation sites (per phase and overall)
+
+        Returns:
+            Dict: 'peak_bytes', 'current_bytes', 'element_bytes',
+                  'phases' and, with sites, 'top_sites'
+        """
+        phases = self.phases if sites else [
+            {k: v for k, v in p.items() if k != 'top_sites'} for p in self.phases]
+        result = {
+            'peak_bytes': max((p['peak_bytes'] for p in self.phases), default=0),
+            'current_bytes': self.phases[-1]['current_bytes'] if self.phases else 0,
+            'element_bytes': dict(self.element_bytes),
+            'phases': phases
+        }
+        if sites and self._snapshot is not None:
+            result['top_sites'] = self._sites(self._snapshot.statistics('lineno'), self.top)
+        return result
+
+    def format_report(self) -> List[str]:
+        """report() as printable lines"""
+        def mb(n: int) -> str:
+            return f"{n / 1048576:.2f} MB"
+
+        report = self.report()
+        lines = [f"Memory: peak {mb(report['peak_bytes'])}, "
+                 f"{mb(report['current_bytes'])} still allocated",
+                 f"  {'Phase':<14} {'Peak':>10} {'Phase peak':>11} {'Retained':>10}  Top site"]
+        for p in report['phases']:
+            site = p['top_sites'][0] if p['top_sites'] else None
+            top = f"{site['site']} (+{site['bytes'] / 1024:.0f} KB)" if site else ""
+            lines.append(f"  {p['phase']:<14} {mb(p['peak_bytes']):>10} "
+                         f"{mb(p['phase_peak_bytes']):>11} {mb(p['retained_bytes']):>10}  {top}")
+        lines.append("Retained by element type:")
+        for kind, size in report['element_bytes'].items():
+            lines.append(f"  {kind:<16} {mb(size):>10}")
+        lines.append("Top allocation sites (still allocated):")
+        for site in report.get('top_sites', []):
+            lines.append(f"  {site['bytes'] / 1024:>9.0f} KB {site['count']:>8} blocks  {site['site']}")
+        return lines
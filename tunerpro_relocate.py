@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Table Relocation Search
+===============================================================================
+
+ Find tables that exist in a BIN but not at the XDF's addresses (another
+ OS revision, an "enhanced" BIN with code inserted, ...), and write an
+ offset map the exporter applies without editing the XDF.
+
+ - Reference mode: each table's data block is taken from a known-good BIN
+   for the same XDF and searched for in the target BIN
+     * exact block matches and chunk votes (bytes.find, in C)
+     * with NumPy, FFT cross-correlation over the whole image for every
+       byte phase, which also finds retuned tables
+   Candidates are scored by Pearson correlation of the raw cell values
+   and the share of identical cells
+ - Shape mode (no reference BIN): windows near the XDF address are ranked
+   by how smooth and non-constant they look (sliding prefix sums, O(1)
+   per window). Only a hint - confidence is capped at SHAPE_CONFIDENCE
+ - Ambiguous tables (duplicated data) prefer the delta most other tables
+   moved by, since a shifted calibration usually moves in a few blocks
+
+ Usage:
+   python tunerpro_exporter.py relocate <xdf> <target_bin> --reference <good_bin>
+       [-o offsets.json] [--table TITLE ...] [--min-confidence C]
+   python tunerpro_exporter.py relocate <xdf> <target_bin> --radius 0x2000
+   python tunerpro_exporter.py <xdf> <target_bin> export.txt --relocations offsets.json
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import math
+import struct
+import sys
+from collections import Counter
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+
+# Optional NumPy acceleration (FFT correlation over the whole image)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Candidates below this correlation are not proposed
+MIN_CORRELATION = 0.9
+
+# Offset map entries below this confidence are left out of the map file
+MIN_CONFIDENCE = 0.8
+
+# Runner-up within this correlation of the best: the table is ambiguous
+AMBIGUITY_MARGIN = 0.02
+
+# Tables with fewer cells can't be located reliably
+MIN_CELLS = 4
+
+# Chunk voting: reference blocks are cut into CHUNK_BYTES pieces; pieces
+# found more than MAX_CHUNK_HITS times (fill, common words) carry no signal
+CHUNK_BYTES = 8
+MAX_CHUNKS = 32
+MAX_CHUNK_HITS = 64
+
+# Candidates kept per table (per phase for the FFT search)
+TOP_CANDIDATES = 5
+
+# Shape mode: search radius around the XDF address, and the confidence a
+# perfectly smooth window gets (smoothness alone can't pin a table down)
+SHAPE_RADIUS = 0x1000
+SHAPE_CONFIDENCE = 0.5
+
+# Shape mode: rougher windows are not kept as candidates
+SHAPE_MIN_SMOOTHNESS = 0.5
+
+# Mean |a - b| of two independent samples is 2/sqrt(pi) standard deviations
+# (normal data) - the roughness of noise, i.e. code rather than calibration
+NOISE_ROUGHNESS = 2 / math.sqrt(math.pi)
+
+
+def _struct_code(size_bytes: int, signed: bool, lsb_first: bool) -> Optional[str]:
+    code = {1: 'b', 2: 'h', 4: 'i'}.get(size_bytes)
+    if code is None:
+        return None
+    return ('<' if lsb_first else '>') + (code if signed else code.upper())
+
+
+def _decode(data: bytes, offset: int, count: int, code: str) -> List[int]:
+    return list(struct.unpack_from(f'{code[0]}{count}{code[1]}', data, offset))
+
+
+def _find_all(data: bytes, pattern: bytes, limit: int) -> List[int]:
+    """Offsets of pattern in data (stops after limit hits)"""
+    hits = []
+    pos = data.find(pattern)
+    while pos >= 0 and len(hits) < limit:
+        hits.append(pos)
+        pos = data.find(pattern, pos + 1)
+    return hits
+
+
+def _similarity(a: List[int], b: List[int]) -> Tuple[float, float]:
+    """
+    Pearson correlation, and the same scaled by the ratio of the spreads
+
+    Correlation alone can't tell a table from the same table read one byte
+    off (16-bit cells with a zero high byte scale by 256); the spread ratio
+    can, while barely touching retuned tables.
+
+    Returns:
+        Tuple: (correlation, score) - identical constant sequences are 1.0
+    """
+    n = len(a)
+    mean_a = sum(a) / n
+    mean_b = sum(b) / n
+    cov = var_a = var_b = 0.0
+    for x, y in zip(a, b):
+        dx = x - mean_a
+        dy = y - mean_b
+        cov += dx * dy
+        var_a += dx * dx
+        var_b += dy * dy
+    if var_a == 0 or var_b == 0:
+        return (1.0, 1.0) if a == b else (0.0, 0.0)
+    correlation = cov / math.sqrt(var_a * var_b)
+    return correlation, correlation * math.sqrt(min(var_a, var_b) / max(var_a, var_b))
+
+
+def table_blocks(exporter: UniversalXDFExporter) -> Dict[str, Dict[str, Any]]:
+    """
+    Z data block of every table that can be searched for, by title
+
+    Returns:
+        Dict: title -> 'start', 'end' (file offsets), 'table', 'size',
+              'code' (struct format), 'rows', 'cols'
+    """
+    blocks: Dict[str, Dict[str, Any]] = {}
+    duplicates = set()
+    for iv in exporter.element_intervals():
+        if iv['kind'] != 'table':
+            continue
+        table = iv['element']
+        z_axis = table['axes'].get('z', {})
+        size = max(1, z_axis.get('size_bits', 8) // 8)
+        code = _struct_code(size, z_axis.get('signed', False), z_axis.get('lsb_first', False))
+        rows, cols = exporter._table_dimensions(table)
+        if code is None or rows * cols < MIN_CELLS or iv['start'] < 0:
+            continue
+        if iv['title'] in blocks:
+            duplicates.add(iv['title'])
+            continue
+        blocks[iv['title']] = {
+            'start': iv['start'],
+            'end': iv['start'] + (iv['end'] - iv['start']) // size * size,
+            'table': table,
+            'size': size,
+            'code': code,
+            'rows': rows,
+            'cols': cols
+        }
+    for title in duplicates:
+        # Offset maps are keyed by title - a shared title can't be told apart
+        logging.getLogger(__name__).warning(f"Table title '{title}' is not unique, skipped")
+        del blocks[title]
+    return blocks
+
+
+class RelocationSearch:
+    """Locate XDF tables in a target BIN"""
+
+    def __init__(self, target: bytes, reference: Optional[bytes] = None,
+                 radius: int = SHAPE_RADIUS):
+        """
+        Set up a search
+
+        Args:
+            target: BIN image whose table addresses are in question
+            reference: Known-good BIN for the same XDF (None = shape mode)
+            radius: Shape mode search radius in bytes around the XDF address
+        """
+        self.target = target
+        self.reference = reference
+        self.radius = radius
+
+        # Target spectrum and running sums per (struct code, phase), shared
+        # by every table with the same cell type
+        self._spectra: Dict[Tuple[str, int], Tuple[Any, Any, Any, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Candidate generation
+    # ------------------------------------------------------------------
+
+    def _byte_candidates(self, block: bytes) -> List[int]:
+        """Target offsets from exact matches and chunk votes"""
+        last = len(self.target) - len(block)
+        candidates = set(_find_all(self.target, block, MAX_CHUNK_HITS))
+
+        votes: Counter = Counter()
+        for pos in range(0, len(block) - CHUNK_BYTES + 1, CHUNK_BYTES)[:MAX_CHUNKS]:
+            chunk = block[pos:pos + CHUNK_BYTES]
+            if chunk.count(chunk[:1]) == CHUNK_BYTES:
+                continue
+            hits = _find_all(self.target, chunk, MAX_CHUNK_HITS + 1)
+            if len(hits) > MAX_CHUNK_HITS:
+                continue
+            votes.update(hit - pos for hit in hits if 0 <= hit - pos <= last)
+        if votes:
+            # Everything within half the best vote count (duplicated tables tie)
+            floor = max(1, votes.most_common(1)[0][1] // 2)
+            candidates.update(offset for offset, count in votes.most_common(MAX_CHUNK_HITS)
+                              if count >= floor)
+        return sorted(candidates)
+
+    def _target_spectrum(self, code: str, size: int, phase: int) -> Tuple[Any, Any, Any, int]:
+        """FFT, running sum and running sum of squares of the target's cells"""
+        key = (code, phase)
+        if key not in self._spectra:
+            dtype = np.dtype(code[0] + ('i' if code[1].islower() else 'u') + str(size))
+            count = (len(self.target) - phase) // size
+            series = np.frombuffer(self.target, dtype=dtype, count=count, offset=phase).astype(np.float64)
+            length = 1 << (count - 1).bit_length()
+            self._spectra[key] = (
+                np.fft.rfft(series, length),
+                np.concatenate(([0.0], np.cumsum(series))),
+                np.concatenate(([0.0], np.cumsum(series * series))),
+                length
+            )
+        return self._spectra[key]
+
+    def _fft_candidates(self, values: List[int], block: Dict[str, Any]) -> List[int]:
+        """Target offsets with the highest normalized cross-correlation (NumPy)"""
+        code, size = block['code'], block['size']
+        ref = np.asarray(values, dtype=np.float64)
+        n = len(ref)
+        centered = ref - ref.mean()
+        ref_norm = math.sqrt(float((centered * centered).sum()))
+        if ref_norm == 0:
+            return []
+
+        candidates = []
+        for phase in range(size):
+            count = (len(self.target) - phase) // size
+            if count < n:
+                continue
+            spectrum, sums, squares, length = self._target_spectrum(code, size, phase)
+            cross = np.fft.irfft(spectrum * np.conj(np.fft.rfft(centered, length)),
+                                 length)[:count - n + 1]
+
+            window_sum = sums[n:] - sums[:-n]
+            spread = np.maximum(squares[n:] - squares[:-n] - window_sum * window_sum / n, 0.0)
+            denom = np.sqrt(spread) * ref_norm
+            corr = np.divide(cross, denom, out=np.zeros_like(cross), where=denom > 0)
+
+            top = min(TOP_CANDIDATES, len(corr))
+            for index in np.argpartition(-corr, top - 1)[:top]:
+                if corr[index] >= MIN_CORRELATION - AMBIGUITY_MARGIN:
+                    candidates.append(phase + int(index) * size)
+        return candidates
+
+    def _shape_candidates(self, block: Dict[str, Any]) -> List[Tuple[float, int]]:
+        """(smoothness, offset) of windows near the XDF address, smoothest first"""
+        size, rows, cols = block['size'], block['rows'], block['cols']
+        n = rows * cols
+        results = []
+        for phase in range(size):
+            # Element-aligned region around the XDF address for this phase
+            first = max(0, block['start'] - self.radius) // size * size + phase
+            last = min(len(self.target) - n * size, block['start'] + self.radius)
+            if last < first:
+                continue
+            count = (last - first) // size + n
+            t = _decode(self.target, first, count, block['code'])
+
+            sums = [0] + list(accumulate(t))
+            squares = [0] + list(accumulate(v * v for v in t))
+            # Horizontal steps, and the same sampled at row ends (to remove)
+            steps = [abs(b - a) for a, b in zip(t, t[1:])] + [0]
+            step_sums = [0] + list(accumulate(steps))
+            row_ends = steps[:]
+            for i in range(cols, len(row_ends)):
+                row_ends[i] += row_ends[i - cols]
+            # Vertical steps
+            vsteps = [abs(b - a) for a, b in zip(t, t[cols:])]
+            vstep_sums = [0] + list(accumulate(vsteps))
+
+            pairs = rows * (cols - 1) + (rows - 1) * cols
+            for k in range(count - n + 1):
+                total = sums[k + n] - sums[k]
+                variance = (squares[k + n] - squares[k]) / n - (total / n) ** 2
+                if variance <= 0:
+                    continue
+                horizontal = step_sums[k + n - 1] - step_sums[k]
+                if rows > 1:
+                    # Row-end steps at k + r*cols - 1 for r = 1..rows-1
+                    horizontal -= row_ends[k - 1 + (rows - 1) * cols] - (row_ends[k - 1] if k else 0)
+                vertical = vstep_sums[k + n - cols] - vstep_sums[k] if rows > 1 else 0
+                roughness = (horizontal + vertical) / pairs / math.sqrt(variance)
+                smoothness = 1.0 - roughness / NOISE_ROUGHNESS
+                if smoothness >= SHAPE_MIN_SMOOTHNESS:
+                    results.append((smoothness, first + k * size))
+
+        results.sort(key=lambda r: (-r[0], abs(r[1] - block['start'])))
+        return results
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search_table(self, block: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ranked candidate offsets for one table block
+
+        Returns:
+            Dict: 'xdf_offset' and 'candidates' (all of them, best first),
+                  each with 'offset', 'delta', 'correlation', 'match', 'score'
+        """
+        start, end, code = block['start'], block['end'], block['code']
+        candidates = []
+
+        if self.reference is None:
+            for smoothness, offset in self._shape_candidates(block):
+                candidates.append({'offset': offset, 'delta': offset - start,
+                                   'correlation': None, 'match': None,
+                                   'score': round(smoothness, 4)})
+        elif end <= len(self.reference):
+            ref_bytes = self.reference[start:end]
+            values = _decode(self.reference, start, (end - start) // block['size'], code)
+            offsets = set(self._byte_candidates(ref_bytes))
+            offsets.add(start)
+            if np is not None:
+                offsets.update(self._fft_candidates(values, block))
+            candidates = self._score(block, offsets)
+
+        return {'xdf_offset': start, 'candidates': candidates}
+
+    def _score(self, block: Dict[str, Any], offsets) -> List[Dict[str, Any]]:
+        """Reference-mode candidates at the given target offsets, best first"""
+        start, code = block['start'], block['code']
+        count = (block['end'] - start) // block['size']
+        last = len(self.target) - (block['end'] - start)
+        values = _decode(self.reference, start, count, code)
+        candidates = []
+        for offset in offsets:
+            if not 0 <= offset <= last:
+                continue
+            found = _decode(self.target, offset, count, code)
+            correlation, score = _similarity(values, found)
+            match = sum(map(int.__eq__, values, found)) / count
+            candidates.append({'offset': offset, 'delta': offset - start,
+                               'correlation': round(correlation, 4),
+                               'match': round(match, 4),
+                               'score': round(score, 4)})
+        candidates.sort(key=lambda c: (-c['score'], -c['match'], abs(c['delta'])))
+        return candidates
+
+    def _pick_reference(self, searches: Dict[str, Dict],
+                        blocks: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[Dict, bool, float]]:
+        """Best candidate per table in reference mode: (candidate, ambiguous, confidence)"""
+        def contenders(search):
+            top = search['candidates']
+            if not top or top[0]['score'] < MIN_CORRELATION:
+                return []
+            return [c for c in top if c['score'] >= top[0]['score'] - AMBIGUITY_MARGIN]
+
+        # Ties are broken by the delta most tables could have moved by
+        popular = Counter()
+        for search in searches.values():
+            popular.update({c['delta'] for c in contenders(search)})
+
+        # Tables no byte search found (every cell retuned) get a look at
+        # the deltas the others moved by
+        common = [delta for delta, _ in popular.most_common(TOP_CANDIDATES)]
+        for title, search in searches.items():
+            if not contenders(search) and common and blocks[title]['end'] <= len(self.reference):
+                extra = self._score(blocks[title], [blocks[title]['start'] + d for d in common])
+                search['candidates'] = sorted(
+                    search['candidates'] + extra,
+                    key=lambda c: (-c['score'], -c['match'], abs(c['delta'])))
+
+        picks = {}
+        for title, search in searches.items():
+            close = contenders(search)
+            if not close:
+                continue
+            best = min(close, key=lambda c: (-popular[c['delta']], -c['score'], abs(c['delta'])))
+            ambiguous = len(close) > 1
+            confidence = max(0.0, best['score'])
+            if ambiguous and popular[best['delta']] < 2:
+                confidence *= 0.5
+            picks[title] = (best, ambiguous, confidence)
+        return picks
+
+    def _pick_shape(self, searches: Dict[str, Dict],
+                    blocks: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[Dict, bool, float]]:
+        """
+        Best candidate per table in shape mode: (candidate, ambiguous, confidence)
+
+        A window's own smoothness is averaged with the mean smoothness all
+        tables reach at the same delta - a whole calibration that moved
+        lines up at one delta, a lucky smooth stretch doesn't.
+        """
+        support: Counter = Counter()
+        for search in searches.values():
+            for candidate in search['candidates']:
+                support[candidate['delta']] += candidate['score']
+
+        picks = {}
+        for title, search in searches.items():
+            ranked = [((c['score'] + support[c['delta']] / len(searches)) / 2, c)
+                      for c in search['candidates']]
+            ranked.sort(key=lambda item: (-item[0], abs(item[1]['delta'])))
+            if not ranked:
+                continue
+            combined, best = ranked[0]
+            span = blocks[title]['end'] - blocks[title]['start']
+            # Runner-up that is a different place, not the same window shifted
+            runner_up = next((value for value, c in ranked[1:]
+                              if abs(c['offset'] - best['offset']) >= span), 0.0)
+            picks[title] = (best, combined - runner_up < AMBIGUITY_MARGIN,
+                            combined * SHAPE_CONFIDENCE)
+        return picks
+
+    def run(self, blocks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Search every block and pick one offset per table
+
+        Returns:
+            Dict: title -> 'status' ('in_place', 'moved', 'not_found'),
+                  'xdf_offset', 'offset', 'delta', 'confidence',
+                  'correlation', 'match', 'ambiguous', 'candidates'
+        """
+        searches = {title: self.search_table(block) for title, block in blocks.items()}
+        if self.reference is None:
+            picks = self._pick_shape(searches, blocks)
+        else:
+            picks = self._pick_reference(searches, blocks)
+
+        results = {}
+        for title, search in searches.items():
+            result = {'status': 'not_found', 'xdf_offset': search['xdf_offset'],
+                      'offset': None, 'delta': None, 'confidence': 0.0,
+                      'correlation': None, 'match': None, 'ambiguous': False,
+                      'candidates': search['candidates'][:TOP_CANDIDATES]}
+            if title in picks:
+                best, ambiguous, confidence = picks[title]
+                result.update({
+                    'status': 'in_place' if best['delta'] == 0 else 'moved',
+                    'offset': best['offset'],
+                    'delta': best['delta'],
+                    'confidence': round(confidence, 4),
+                    'correlation': best['correlation'],
+                    'match': best['match'],
+                    'ambiguous': ambiguous
+                })
+            results[title] = result
+        return results
+
+
+def offset_map(results: Dict[str, Dict[str, Any]],
+               min_confidence: float = MIN_CONFIDENCE) -> Dict[str, Dict[str, Any]]:
+    """Moved tables with enough confidence, in offset map file form"""
+    return {
+        title: {key: result[key] for key in
+                ('delta', 'xdf_offset', 'offset', 'confidence', 'correlation', 'match')}
+        for title, result in sorted(results.items())
+        if result['status'] == 'moved' and result['confidence'] >= min_confidence
+    }
+
+
+def read_relocations(path: str) -> Dict[str, int]:
+    """
+    Table title -> byte delta from an offset map file
+
+    Accepts the file written by 'relocate -o' ({"tables": {title: {"delta":
+    ...}}}) or a plain {title: delta} object.
+
+    Raises:
+        ValueError: The file isn't an offset map
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = json.load(f)
+    tables = content.get('tables', content) if isinstance(content, dict) else None
+    if not isinstance(tables, dict):
+        raise ValueError(f"{path}: not an offset map")
+    deltas = {}
+    for title, entry in tables.items():
+        delta = entry.get('delta') if isinstance(entry, dict) else entry
+        if not isinstance(delta, int):
+            raise ValueError(f"{path}: no integer delta for '{title}'")
+        deltas[title] = delta
+    return deltas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Relocation search command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py relocate",
+        description="Find tables at shifted addresses and write an offset map"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bin', help="Target BIN (tables possibly moved)")
+    parser.add_argument('--reference', metavar='BIN',
+                        help="Known-good BIN for this XDF (without it: shape mode)")
+    parser.add_argument('--table', action='append', default=[], metavar='TITLE',
+                        help="Only search these tables (wildcards allowed, repeatable)")
+    parser.add_argument('--radius', type=lambda text: int(text, 0), default=SHAPE_RADIUS,
+                        help=f"Shape mode search radius in bytes (default: 0x{SHAPE_RADIUS:X})")
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE,
+                        help=f"Minimum confidence for the offset map (default: {MIN_CONFIDENCE})")
+    parser.add_argument('-o', '--output', metavar='FILE', help="Write the offset map (JSON)")
+    parser.add_argument('--limit', type=int, default=50, help="Max tables listed (default: 50)")
+    parser.add_argument('--json', action='store_true', help="Print full results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    target = UniversalXDFExporter(args.xdf, args.bin)
+    if not target.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+    if not target.validate_bin_file():
+        print(f"❌ Binary validation failed: {args.bin}")
+        return 1
+
+    reference_data = None
+    if args.reference:
+        reference = target.for_bin(args.reference)
+        if not reference.validate_bin_file():
+            print(f"❌ Binary validation failed: {args.reference}")
+            return 1
+        reference_data = reference.bin_data
+
+    blocks = table_blocks(target)
+    if args.table:
+        patterns = [p.lower() for p in args.table]
+        blocks = {title: block for title, block in blocks.items()
+                  if any(title.lower() == p or fnmatch.fnmatch(title.lower(), p) for p in patterns)}
+        if not blocks:
+            print("❌ No table matches --table")
+            return 1
+
+    search = RelocationSearch(target.bin_data, reference_data, args.radius)
+    results = search.run(blocks)
+    moved = offset_map(results, args.min_confidence)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'definition': target.definition_name,
+                'target': str(target.bin_path),
+                'reference': args.reference,
+                'mode': 'reference' if reference_data is not None else 'shape',
+                'tables': moved
+            }, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    counts = Counter(result['status'] for result in results.values())
+    mode = "reference BIN" if reference_data is not None else "shape (hint only)"
+    print(f"Definition: {target.definition_name}")
+    print(f"Mode:       {mode}")
+    print(f"Tables:     {len(results)} searched - {counts['in_place']} in place, "
+          f"{counts['moved']} moved, {counts['not_found']} not found")
+    print()
+    listed = [(title, r) for title, r in results.items() if r['status'] != 'in_place']
+    listed.sort(key=lambda item: (item[1]['status'] != 'moved', -item[1]['confidence'], item[0]))
+    for title, result in listed[:args.limit]:
+        if result['status'] == 'moved':
+            flag = " (ambiguous)" if result['ambiguous'] else ""
+            print(f"  → {title}: 0x{result['xdf_offset']:06X} -> 0x{result['offset']:06X} "
+                  f"(delta {result['delta']:+#x}, confidence {result['confidence']:.2f}){flag}")
+        else:
+            print(f"  ✗ {title}: not found")
+    if len(listed) > args.limit:
+        print(f"  ... {len(listed) - args.limit} more")
+    if args.output:
+        print(f"\nOffset map ({len(moved)} tables): {args.output}")
+        print(f"Apply with: python tunerpro_exporter.py {args.xdf} {args.bin} <output> "
+              f"--relocations {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
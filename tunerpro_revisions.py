@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Revision Store
+===============================================================================
+
+ Keep every revision of every tune without keeping every full BIN.
+
+ - Content-addressed: revisions are keyed by the BIN MD5 (the same hash
+   validate_bin_file reports), identical saves are stored once
+ - Block-level deltas: a revision stores only the fixed-size blocks that
+   differ from its parent, zlib-compressed; a full keyframe is written for
+   new roots, size changes, large rewrites and every MAX_CHAIN_DEPTH deltas
+ - The index records which blocks each revision changed, so history queries
+   ("revisions touching table T", "which revision changed cell [r,c]") only
+   decode the revisions that could possibly have touched the element
+
+ Store layout:
+   <store>/revisions.json            index (config + revision records)
+   <store>/objects/ab/<md5>.rev      full image or delta per revision
+
+ Usage:
+   python tunerpro_exporter.py revisions [--store DIR] add <bin> [--tune NAME] [--label TEXT]
+   python tunerpro_exporter.py revisions list [--tune NAME]
+   python tunerpro_exporter.py revisions export <rev> <xdf> <output> [-f formats]
+   python tunerpro_exporter.py revisions cat <rev> <output.bin>
+   python tunerpro_exporter.py revisions touching <xdf> "<table title>"
+   python tunerpro_exporter.py revisions blame <xdf> "<table title>" <row> <col>
+   python tunerpro_exporter.py revisions stats
+
+ <rev> is a revision number, an MD5 or a unique MD5 prefix.
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from tunerpro_exporter import (
+    UniversalXDFExporter, EXPORT_WRITERS, resolve_formats, __version__
+)
+
+
+STORE_VERSION = 1
+INDEX_FILENAME = "revisions.json"
+DEFAULT_STORE = "tune_store"
+DEFAULT_BLOCK_SIZE = 256
+
+# Write a full keyframe after this many chained deltas (bounds read cost)
+MAX_CHAIN_DEPTH = 16
+
+# Write a full keyframe when more than this fraction of blocks changed
+FULL_REWRITE_FRACTION = 0.5
+
+# Reconstructed images kept in memory
+CACHE_SIZE = 8
+
+MAGIC_FULL = b'KTRF'
+MAGIC_DELTA = b'KTRD'
+DELTA_HEADER = struct.Struct('<4sIII')  # magic, block_size, image size, block count
+
+
+def _to_ranges(indices: List[int]) -> List[List[int]]:
+    """Compress sorted block indices into [start, end] inclusive runs"""
+    ranges = []
+    for i in indices:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return ranges
+
+
+def _ranges_intersect(ranges: List[List[int]], blocks: List[int]) -> bool:
+    return any(start <= b <= end for start, end in ranges for b in blocks)
+
+
+def _changed_blocks(parent: bytes, data: bytes, block_size: int) -> List[int]:
+    """Indices of blocks that differ (images must be the same size)"""
+    a, b = memoryview(parent), memoryview(data)
+    return [
+        i for i, start in enumerate(range(0, len(data), block_size))
+        if a[start:start + block_size] != b[start:start + block_size]
+    ]
+
+
+class RevisionStore:
+    """Content-addressed BIN revision store with block-level delta compression"""
+
+    def __init__(self, root: str = DEFAULT_STORE, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Open (or create) a revision store
+
+        Args:
+            root: Store folder
+            block_size: Delta block size for a NEW store (existing stores keep theirs)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / INDEX_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('store_version') != STORE_VERSION:
+                raise ValueError(f"Unsupported revision store version in {self.index_path}")
+            self.block_size = index['block_size']
+            self.revisions: List[Dict] = index['revisions']
+        else:
+            self.block_size = block_size
+            self.revisions = []
+
+        self._by_md5 = {r['md5']: r for r in self.revisions}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _object_path(self, md5: str) -> Path:
+        return self.objects_dir / md5[:2] / f"{md5}.rev"
+
+    def _write_atomic(self, path: Path, payload: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    def _save_index(self):
+        index = {
+            'store_version': STORE_VERSION,
+            'exporter_version': __version__,
+            'block_size': self.block_size,
+            'revisions': self.revisions
+        }
+        self._write_atomic(self.index_path,
+                           json.dumps(index, indent=1).encode('utf-8'))
+
+    def _cache_put(self, md5: str, data: bytes):
+        self._cache[md5] = data
+        self._cache.move_to_end(md5)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def get(self, ref: Union[int, str]) -> Dict:
+        """
+        Find a revision record by number, MD5 or unique MD5 prefix
+
+        Raises:
+            KeyError: If no single revision matches
+        """
+        ref = str(ref).strip().lower()
+        if ref.isdigit() and len(ref) < 8:
+            number = int(ref)
+            if 1 <= number <= len(self.revisions):
+                return self.revisions[number - 1]
+        if ref in self._by_md5:
+            return self._by_md5[ref]
+        matches = [r for r in self.revisions if r['md5'].startswith(ref)]
+        if len(matches) == 1:
+            return matches[0]
+        raise KeyError(f"No unique revision for '{ref}'")
+
+    def latest(self, tune: Optional[str] = None) -> Optional[Dict]:
+        """Most recently added revision (optionally of one tune)"""
+        for record in reversed(self.revisions):
+            if tune is None or record['tune'] == tune:
+                return record
+        return None
+
+    def read(self, ref: Union[int, str]) -> bytes:
+        """Reconstruct the full BIN image of a revision"""
+        record = self.get(ref)
+        md5 = record['md5']
+        if md5 in self._cache:
+            self._cache.move_to_end(md5)
+            return self._cache[md5]
+
+        with open(self._object_path(md5), 'rb') as f:
+            payload = zlib.decompress(f.read())
+
+        if payload[:4] == MAGIC_FULL:
+            data = payload[4:]
+        else:
+            magic, block_size, size, count = DELTA_HEADER.unpack_from(payload, 0)
+            if magic != MAGIC_DELTA:
+                raise ValueError(f"Corrupt revision object: {md5}")
+            image = bytearray(self.read(record['parent']))
+            pos = DELTA_HEADER.size
+            indices = struct.unpack_from(f'<{count}I', payload, pos)
+            pos += 4 * count
+            for index in indices:
+                start = index * block_size
+                length = min(block_size, size - start)
+                image[start:start + length] = payload[pos:pos + length]
+                pos += length
+            data = bytes(image)
+
+        if hashlib.md5(data).hexdigest() != md5:
+            raise ValueError(f"Revision {record['rev']} failed MD5 verification")
+        self._cache_put(md5, data)
+        return data
+
+    def add(self, bin_path: str, tune: Optional[str] = None, label: str = "",
+            parent: Optional[Union[int, str]] = None) -> Dict:
+        """Add a BIN file as a new revision (see add_bytes)"""
+        with open(bin_path, 'rb') as f:
+            data = f.read()
+        return self.add_bytes(data, Path(bin_path).name, tune or Path(bin_path).stem,
+                              label, parent)
+
+    def add_bytes(self, data: bytes, source: str, tune: str, label: str = "",
+                  parent: Optional[Union[int, str]] = None) -> Dict:
+        """
+        Add a BIN image as a new revision
+
+        The parent defaults to the latest revision of the same tune, else the
+        latest revision of the same size (e.g. the stock file a tune came from).
+        Content already in the store is not stored again.
+
+        Returns:
+            Dict: The revision record (existing one if the MD5 is known)
+        """
+        md5 = hashlib.md5(data).hexdigest()
+        if md5 in self._by_md5:
+            return self._by_md5[md5]
+
+        if parent is not None:
+            parent_record = self.get(parent)
+        else:
+            parent_record = self.latest(tune)
+            if parent_record is None or parent_record['size'] != len(data):
+                parent_record = next((r for r in reversed(self.revisions)
+                                      if r['size'] == len(data)), None)
+
+        changed = None
+        kind = 'full'
+        depth = 0
+        if parent_record is not None and parent_record['size'] == len(data):
+            changed = _changed_blocks(self.read(parent_record['md5']), data, self.block_size)
+            total_blocks = -(-len(data) // self.block_size)
+            if (parent_record['depth'] + 1 < MAX_CHAIN_DEPTH
+                    and len(changed) <= total_blocks * FULL_REWRITE_FRACTION):
+                kind = 'delta'
+                depth = parent_record['depth'] + 1
+
+        if kind == 'delta':
+            parts = [DELTA_HEADER.pack(MAGIC_DELTA, self.block_size, len(data), len(changed)),
+                     struct.pack(f'<{len(changed)}I', *changed)]
+            parts += [data[i * self.block_size:(i + 1) * self.block_size] for i in changed]
+            payload = b''.join(parts)
+        else:
+            payload = MAGIC_FULL + data
+        stored = zlib.compress(payload, 9)
+        self._write_atomic(self._object_path(md5), stored)
+
+        record = {
+            'rev': len(self.revisions) + 1,
+            'md5': md5,
+            'parent': parent_record['md5'] if parent_record else None,
+            'tune': tune,
+            'label': label,
+            'source': source,
+            'added': datetime.now().isoformat(timespec='seconds'),
+            'size': len(data),
+            'kind': kind,
+            'depth': depth,
+            'stored_bytes': len(stored),
+            'changed_blocks': _to_ranges(changed) if changed is not None else None
+        }
+        self.revisions.append(record)
+        self._by_md5[md5] = record
+        self._save_index()
+        self._cache_put(md5, bytes(data))
+        return record
+
+    def stats(self) -> Dict:
+        """Raw vs stored size for the whole store"""
+        raw = sum(r['size'] for r in self.revisions)
+        stored = sum(r['stored_bytes'] for r in self.revisions)
+        return {
+            'revisions': len(self.revisions),
+            'tunes': len({r['tune'] for r in self.revisions}),
+            'raw_bytes': raw,
+            'stored_bytes': stored,
+            'ratio': round(raw / stored, 1) if stored else None,
+            'block_size': self.block_size
+        }
+
+    # ------------------------------------------------------------------
+    # Exporter integration
+    # ------------------------------------------------------------------
+
+    def exporter(self, ref: Union[int, str],
+                 template: UniversalXDFExporter) -> UniversalXDFExporter:
+        """Exporter for a revision, reusing a parsed XDF definition"""
+        record = self.get(ref)
+        exporter = template.for_bin(f"r{record['rev']:04d}_{record['source']}")
+        if not exporter.load_bin_bytes(self.read(record['md5'])):
+            raise ValueError(f"Could not load revision {record['rev']}")
+        return exporter
+
+    def export_revision(self, ref: Union[int, str], xdf_path: str,
+                        output_base: str, formats: List[str]) -> List[str]:
+        """
+        Export revision N through an XDF
+
+        Returns:
+            List[str]: Written output files
+        """
+        template = _load_template(xdf_path)
+        exporter = self.exporter(ref, template)
+        outputs = []
+        for fmt in formats:
+            path = f"{output_base}.{fmt}"
+            if getattr(exporter, EXPORT_WRITERS[fmt])(path):
+                outputs.append(path)
+        return outputs
+
+    def _table_blocks(self, template: UniversalXDFExporter, table: Dict,
+                      cells: Optional[List[int]] = None) -> Tuple[List[int], List[int]]:
+        """Cell addresses of a table (or selected cells) and the store blocks they occupy"""
+        addresses = template._table_cell_addresses(table) or []
+        if cells is not None:
+            addresses = [addresses[i] for i in cells]
+        size_bytes = table['axes'].get('z', {}).get('size_bits', 8) // 8
+        blocks = set()
+        for address in addresses:
+            offset = template._xdf_addr_to_file_offset(address)
+            blocks.add(offset // self.block_size)
+            blocks.add((offset + size_bytes - 1) // self.block_size)
+        return addresses, sorted(blocks)
+
+    def _candidates(self, blocks: List[int], tune: Optional[str]) -> List[Dict]:
+        """Revisions whose changed blocks could include the given blocks"""
+        return [
+            r for r in self.revisions
+            if (tune is None or r['tune'] == tune)
+            and (r['changed_blocks'] is None or _ranges_intersect(r['changed_blocks'], blocks))
+        ]
+
+    def _raw_cells(self, exporter: UniversalXDFExporter, table: Dict,
+                   addresses: List[int]) -> Optional[List[int]]:
+        """Raw values of table cells in a revision's exporter"""
+        z_axis = table['axes'].get('z', {})
+        return exporter.read_raw_values(addresses, z_axis.get('size_bits', 8),
+                                        signed=z_axis.get('signed', False),
+                                        lsb_first=z_axis.get('lsb_first', False))
+
+    def revisions_touching(self, template: UniversalXDFExporter, title: str,
+                           tune: Optional[str] = None) -> List[Dict]:
+        """
+        Revisions that changed at least one cell of a table (vs their parent)
+
+        Only revisions whose changed blocks overlap the table are decoded.
+
+        Returns:
+            List[Dict]: rev, md5, tune, label, changed_cells, total_cells
+        """
+        table = _find_table(template, title)
+        addresses, blocks = self._table_blocks(template, table)
+        results = []
+        for record in self._candidates(blocks, tune):
+            after = self._raw_cells(self.exporter(record['md5'], template), table, addresses)
+            before = (self._raw_cells(self.exporter(record['parent'], template), table, addresses)
+                      if record['parent'] else None)
+            if after is None:
+                continue
+            if before is None:
+                changed = len(after)  # Root revision introduces the table
+            else:
+                changed = sum(1 for a, b in zip(before, after) if a != b)
+            if changed:
+                results.append({
+                    'rev': record['rev'],
+                    'md5': record['md5'],
+                    'tune': record['tune'],
+                    'label': record['label'],
+                    'initial': before is None,
+                    'changed_cells': changed,
+                    'total_cells': len(addresses)
+                })
+        return results
+
+    def cell_history(self, template: UniversalXDFExporter, title: str, row: int, col: int,
+                     tune: Optional[str] = None) -> List[Dict]:
+        """
+        Revisions that changed one table cell, with converted before/after values
+
+        Each value is converted with its own revision's axis context, so
+        equations using A/B/Y/Z see that BIN's axis breakpoints.
+
+        Returns:
+            List[Dict]: rev, md5, tune, label, before, after (None before = root)
+        """
+        table = _find_table(template, title)
+        rows, cols = template._table_dimensions(table)
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"Cell [{row},{col}] outside {rows}x{cols} table '{table['title']}'")
+        index = row * cols + col
+        addresses, blocks = self._table_blocks(template, table, [index])
+
+        z_axis = table['axes'].get('z', {})
+        equation = z_axis.get('equation', '')
+        decimalpl = z_axis.get('decimalpl', 2)
+
+        def value(md5):
+            exporter = self.exporter(md5, template)
+            raw = self._raw_cells(exporter, table, addresses)
+            if raw is None:
+                return None
+            context = exporter._table_axis_context(table, row, col)
+            return round(exporter.convert_raw_value(equation, raw[0], context), decimalpl)
+
+        history = []
+        for record in self._candidates(blocks, tune):
+            after = value(record['md5'])
+            before = value(record['parent']) if record['parent'] else None
+            if record['parent'] is None or before != after:
+                history.append({
+                    'rev': record['rev'],
+                    'md5': record['md5'],
+                    'tune': record['tune'],
+                    'label': record['label'],
+                    'before': before,
+                    'after': after
+                })
+        return history
+
+
+def _load_template(xdf_path: str) -> UniversalXDFExporter:
+    template = UniversalXDFExporter(xdf_path, "")
+    if not template.parse_xdf():
+        raise ValueError(f"XDF parsing failed: {xdf_path}")
+    return template
+
+
+def _find_table(template: UniversalXDFExporter, title: str) -> Dict:
+    """Find a table by exact title, then case-insensitive title"""
+    for table in template.elements['tables']:
+        if table['title'] == title:
+            return table
+    for table in template.elements['tables']:
+        if table['title'].lower() == title.lower():
+            return table
+    raise KeyError(f"Table not found in XDF: {title}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Revision store command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py revisions",
+        description="Content-addressed BIN revision store with delta compression"
+    )
+    parser.add_argument('--store', default=DEFAULT_STORE,
+                        help=f"Store folder (default: {DEFAULT_STORE})")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    p = sub.add_parser('add', help="Add BIN file(s) as new revisions")
+    p.add_argument('bins', nargs='+')
+    p.add_argument('--tune', help="Tune name (default: BIN file name)")
+    p.add_argument('--label', default="", help="Revision note")
+    p.add_argument('--parent', help="Parent revision (default: latest of this tune)")
+
+    p = sub.add_parser('list', help="List revisions")
+    p.add_argument('--tune')
+
+    p = sub.add_parser('export', help="Export revision N through an XDF")
+    p.add_argument('rev')
+    p.add_argument('xdf')
+    p.add_argument('output', help="Output base path (<output>.<format>)")
+    p.add_argument('-f', '--format', default='txt')
+
+    p = sub.add_parser('cat', help="Write the full BIN of a revision")
+    p.add_argument('rev')
+    p.add_argument('output')
+
+    p = sub.add_parser('touching', help="Revisions that changed a table")
+    p.add_argument('xdf')
+    p.add_argument('table')
+    p.add_argument('--tune')
+
+    p = sub.add_parser('blame', help="Revisions that changed one table cell")
+    p.add_argument('xdf')
+    p.add_argument('table')
+    p.add_argument('row', type=int)
+    p.add_argument('col', type=int)
+    p.add_argument('--tune')
+
+    sub.add_parser('stats', help="Storage statistics")
+
+    args = parser.parse_args(argv)
+    logging.getLogger('tunerpro_exporter').setLevel(logging.WARNING)
+
+    try:
+        store = RevisionStore(args.store)
+
+        if args.action == 'add':
+            for bin_path in args.bins:
+                known = hashlib.md5(Path(bin_path).read_bytes()).hexdigest() in store._by_md5
+                r = store.add(bin_path, args.tune, args.label, args.parent)
+                note = "already stored" if known else f"{r['kind']}, {r['stored_bytes']:,} bytes stored"
+                print(f"r{r['rev']}  {r['md5']}  {r['tune']}  ({note})")
+
+        elif args.action == 'list':
+            for r in store.revisions:
+                if args.tune and r['tune'] != args.tune:
+                    continue
+                parent = store._by_md5[r['parent']]['rev'] if r['parent'] else '-'
+                print(f"r{r['rev']:<4} {r['md5'][:12]}  parent r{parent!s:<4} {r['kind']:<5} "
+                      f"{r['stored_bytes']:>9,}B  {r['added']}  {r['tune']}  {r['label']}")
+
+        elif args.action == 'export':
+            outputs = store.export_revision(args.rev, args.xdf, args.output,
+                                            resolve_formats(args.format))
+            for path in outputs:
+                print(f"Exported: {path}")
+
+        elif args.action == 'cat':
+            Path(args.output).write_bytes(store.read(args.rev))
+            print(f"Wrote revision {store.get(args.rev)['rev']}: {args.output}")
+
+        elif args.action == 'touching':
+            template = _load_template(args.xdf)
+            for r in store.revisions_touching(template, args.table, args.tune):
+                what = "initial" if r['initial'] else f"{r['changed_cells']}/{r['total_cells']} cells"
+                print(f"r{r['rev']:<4} {r['md5'][:12]}  {what:<14} {r['tune']}  {r['label']}")
+
+        elif args.action == 'blame':
+            template = _load_template(args.xdf)
+            for h in store.cell_history(template, args.table, args.row, args.col, args.tune):
+                before = "(initial)" if h['before'] is None else h['before']
+                print(f"r{h['rev']:<4} {h['md5'][:12]}  {before} -> {h['after']}  {h['tune']}  {h['label']}")
+
+        elif args.action == 'stats':
+            s = store.stats()
+            print(f"Revisions:    {s['revisions']} ({s['tunes']} tunes)")
+            print(f"Raw size:     {s['raw_bytes']:,} bytes")
+            print(f"Stored size:  {s['stored_bytes']:,} bytes")
+            print(f"Compression:  {s['ratio']}x (block size {s['block_size']})")
+
+    except (KeyError, ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
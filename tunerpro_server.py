@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Local HTTP Export Service
+===============================================================================
+
+ Long-running export service for internal tools (stdlib only: asyncio).
+
+ - Binds to localhost by default - NOT intended to be exposed to a network
+ - Parsed XDF definitions are kept in an LRU cache (re-parsed when the
+   XDF file changes), so requests skip interpreter startup and XDF parsing
+ - CPU-bound decoding/evaluation runs in a worker pool (processes by
+   default, each with its own definition LRU; threads optional)
+ - Concurrent exports are limited with a semaphore
+
+ Endpoints:
+   GET  /health                                   service status
+   GET  /definitions                              available XDF names
+   POST /export?xdf=NAME&format=json              body = raw BIN upload
+   GET  /export?xdf=NAME&bin=REL_PATH&format=csv  BIN referenced under --bin-dir
+
+   format: json (default), csv, txt, md
+   NAME is the XDF path relative to --xdf-dir, without the .xdf extension
+
+ Usage:
+   python tunerpro_exporter.py serve --xdf-dir DEFS [--bin-dir BINS] [--port 8765]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from tunerpro_exporter import (
+    DefinitionCache, EXPORT_WRITERS, FORMAT_ALIASES, __version__
+)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 16
+MAX_BODY_BYTES = 16 * 1024 * 1024   # Largest accepted BIN upload
+HEADER_TIMEOUT = 30.0               # Seconds to wait for request headers
+
+CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'txt': 'text/plain; charset=utf-8',
+    'md': 'text/markdown; charset=utf-8',
+}
+
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 422: 'Unprocessable Entity', 500: 'Internal Server Error',
+}
+
+
+# Per-process cache used by pool workers (and by thread pools, shared)
+_CACHE = DefinitionCache(DEFAULT_CACHE_SIZE)
+
+
+def _init_worker(cache_size: int):
+    """Pool initializer: size the per-process LRU, keep exporter logs quiet"""
+    _CACHE.capacity = cache_size
+    logging.getLogger('tunerpro_exporter').setLevel(logging.WARNING)
+
+
+def run_export(xdf_path: str, bin_name: str, bin_data: Optional[bytes],
+               bin_path: Optional[str], fmt: str) -> Tuple[bytes, Dict]:
+    """
+    Export one BIN through a cached definition (runs inside the worker pool)
+
+    Args:
+        xdf_path: XDF definition file
+        bin_name: Name shown as SOURCE FILE in the export
+        bin_data: Uploaded BIN bytes (or None to read bin_path)
+        bin_path: BIN file on disk (used when bin_data is None)
+        fmt: Export format (key of EXPORT_WRITERS)
+
+    Returns:
+        Tuple[bytes, Dict]: Export document and timing/metadata
+
+    Raises:
+        ValueError: If the BIN can't be loaded or the export fails
+    """
+    start = time.perf_counter()
+    template = _CACHE.get(xdf_path)
+    parsed = time.perf_counter()
+
+    exporter = template.for_bin(bin_path or bin_name)
+    if bin_data is not None:
+        loaded = exporter.load_bin_bytes(bin_data)
+    else:
+        loaded = exporter.validate_bin_file()
+    if not loaded:
+        raise ValueError(f"Binary validation failed: {bin_name}")
+
+    with tempfile.TemporaryDirectory(prefix="tunerpro_") as tmp:
+        output_path = os.path.join(tmp, f"export.{fmt}")
+        if not getattr(exporter, EXPORT_WRITERS[fmt])(output_path):
+            raise ValueError(f"{fmt.upper()} export failed")
+        with open(output_path, 'rb') as f:
+            document = f.read()
+
+    return document, {
+        'definition_s': round(parsed - start, 4),
+        'export_s': round(time.perf_counter() - parsed, 4),
+        'md5': exporter.bin_md5,
+        'pid': os.getpid()
+    }
+
+
+class HTTPError(Exception):
+    """Error response with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ExportServer:
+    """asyncio HTTP export service with a warm definition cache"""
+
+    def __init__(self, xdf_dir: str, bin_dir: Optional[str] = None,
+                 host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: Optional[int] = None, max_concurrent: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, use_threads: bool = False):
+        """
+        Initialize the service (call start() inside an event loop)
+
+        Args:
+            xdf_dir: Folder of XDF definitions served by name
+            bin_dir: Optional folder BINs may be referenced from (bin=...)
+            host: Bind address (localhost by default)
+            port: TCP port (0 = pick a free port)
+            workers: Worker pool size (default: CPU count)
+            max_concurrent: Max exports in flight (default: workers)
+            cache_size: Parsed definitions kept per worker
+            use_threads: Use a thread pool instead of processes
+        """
+        self.xdf_dir = Path(xdf_dir).resolve()
+        self.bin_dir = Path(bin_dir).resolve() if bin_dir else None
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent or self.workers
+        self.cache_size = cache_size
+        self.use_threads = use_threads
+        self.logger = logging.getLogger(__name__)
+
+        self.pool: Optional[Executor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests_served = 0
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port"""
+        if self.use_threads:
+            _init_worker(self.cache_size)
+            self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            use_fork = 'fork' in methods and sys.platform != 'darwin'
+            ctx = multiprocessing.get_context('fork' if use_fork else 'spawn')
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                            initializer=_init_worker,
+                                            initargs=(self.cache_size,))
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self):
+        """Stop listening and shut down the worker pool"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def definitions(self) -> List[str]:
+        """XDF names (relative path without extension)"""
+        return sorted(
+            p.relative_to(self.xdf_dir).with_suffix('').as_posix()
+            for p in self.xdf_dir.rglob('*')
+            if p.is_file() and p.suffix.lower() == '.xdf'
+        )
+
+    def _resolve_under(self, root: Path, relative: str, suffix: str = "") -> Path:
+        """Resolve a client-supplied name, refusing paths outside root"""
+        path = (root / (relative + suffix)).resolve()
+        try:
+            path.relative_to(root)
+        except ValueError:
+            raise HTTPError(400, f"Path outside served folder: {relative}")
+        if not path.is_file():
+            raise HTTPError(404, f"Not found: {relative}{suffix}")
+        return path
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes, Dict]:
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == '/health':
+            return self._json(200, {
+                'status': 'ok',
+                'version': __version__,
+                'workers': self.workers,
+                'pool': 'threads' if self.use_threads else 'processes',
+                'max_concurrent': self.max_concurrent,
+                'requests_served': self.requests_served
+            })
+
+        if url.path == '/definitions':
+            return self._json(200, {'definitions': self.definitions()})
+
+        if url.path != '/export':
+            raise HTTPError(404, f"Unknown endpoint: {url.path}")
+
+        fmt = params.get('format', 'json').lower()
+        fmt = FORMAT_ALIASES.get(fmt, fmt)
+        if fmt not in EXPORT_WRITERS:
+            raise HTTPError(400, f"Unsupported format: {fmt}")
+        if 'xdf' not in params:
+            raise HTTPError(400, "Missing 'xdf' parameter")
+        xdf_path = self._resolve_under(self.xdf_dir, params['xdf'], '.xdf')
+
+        if method == 'POST':
+            if not body:
+                raise HTTPError(400, "POST /export needs the BIN as the request body")
+            bin_name = Path(params.get('name', 'upload.bin')).name
+            args = (str(xdf_path), bin_name, body, None, fmt)
+        elif method == 'GET':
+            if self.bin_dir is None:
+                raise HTTPError(400, "BIN references are disabled (start with --bin-dir)")
+            if 'bin' not in params:
+                raise HTTPError(400, "Missing 'bin' parameter")
+            bin_path = self._resolve_under(self.bin_dir, params['bin'])
+            args = (str(xdf_path), bin_path.name, None, str(bin_path), fmt)
+        else:
+            raise HTTPError(405, f"Method not allowed: {method}")
+
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            try:
+                document, info = await loop.run_in_executor(self.pool, run_export, *args)
+            except (ValueError, OSError) as e:
+                raise HTTPError(422, str(e))
+
+        headers = {
+            'X-Definition-Time': str(info['definition_s']),
+            'X-Export-Time': str(info['export_s']),
+            'X-BIN-MD5': info['md5'],
+        }
+        return 200, CONTENT_TYPES[fmt], document, headers
+
+    @staticmethod
+    def _json(status: int, payload: Dict) -> Tuple[int, str, bytes, Dict]:
+        return status, CONTENT_TYPES['json'], json.dumps(payload, indent=2).encode('utf-8'), {}
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 (one request per connection)
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        start = time.perf_counter()
+        method, target = '-', '-'
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                raise HTTPError(400, "Malformed request line")
+            method, target = parts[0].upper(), parts[1]
+
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                key, _, value = line.decode('latin-1').partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            # Digits only: int() would also take '-1', '+1' and '1_000'
+            length_text = headers.get('content-length', '0')
+            if not (length_text.isascii() and length_text.isdigit()):
+                raise HTTPError(400, "Invalid Content-Length")
+            length = int(length_text)
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+            body = await reader.readexactly(length) if length else b''
+
+            status, content_type, payload, extra = await self._route(method, target, body)
+        except HTTPError as e:
+            status, content_type, payload, extra = self._json(e.status, {'error': str(e)})
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            self.logger.error(f"Request failed: {e}")
+            status, content_type, payload, extra = self._json(500, {'error': str(e)})
+
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Connection: close",
+            f"Server: KingAI-TunerPro-Exporter/{__version__}",
+        ] + [f"{k}: {v}" for k, v in extra.items()]
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+        self.requests_served += 1
+        self.logger.info(f"{method} {target} -> {status} "
+                         f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Service command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py serve",
+        description="Local HTTP export service with a warm XDF definition cache"
+    )
+    parser.add_argument('--xdf-dir', required=True, help="Folder of XDF definitions")
+    parser.add_argument('--bin-dir', help="Folder BINs may be referenced from (GET /export?bin=...)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Worker pool size (default: CPU count)")
+    parser.add_argument('--max-concurrent', type=int, default=None,
+                        help="Max exports in flight (default: workers)")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Parsed XDFs kept per worker (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--threads', action='store_true',
+                        help="Use a thread pool instead of worker processes")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    logging.getLogger('tunerpro_exporter').setLevel(logging.WARNING)
+
+    server = ExportServer(args.xdf_dir, args.bin_dir, args.host, args.port,
+                          args.workers, args.max_concurrent, args.cache_size, args.threads)
+
+    async def run():
+        port = await server.start()
+        print(f"KingAI TunerPro Exporter v{__version__} - serving http://{args.host}:{port}/")
+        print(f"  XDF folder: {server.xdf_dir} ({len(server.definitions())} definitions)")
+        if server.bin_dir:
+            print(f"  BIN folder: {server.bin_dir}")
+        print(f"  Workers: {server.workers} {'threads' if server.use_threads else 'processes'}, "
+              f"max concurrent: {server.max_concurrent}")
+        print("  Ctrl+C to stop")
+        try:
+            async with server.server:
+                await server.server.serve_forever()
+        finally:
+            if server.pool is not None:
+                server.pool.shutdown(wait=False)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Sharded Jobs
+===============================================================================
+
+ Spread a job manifest over any number of worker processes on any number
+ of machines that can see one shared work directory (SMB/NFS share, ...).
+
+ - 'split' cuts the manifest into shards (grouped by XDF, so workers'
+   definition caches stay warm) and writes them to the work directory
+ - 'work' claims shards one at a time with a lease file, exports their
+   pairs and marks them complete; -j N starts N local worker processes
+ - Leases are created with O_CREAT|O_EXCL and renewed by a heartbeat;
+   a lease that is not renewed in time (crashed worker, lost machine) is
+   taken over by the next worker that finds it expired
+ - Each shard keeps its own pair journal in the work directory, so a
+   taken-over shard resumes where the crashed worker stopped
+ - Ownership is re-checked before every pair, a lease is never renewed
+   once it is close to expiry, and every export run writes its own
+   partial files - so a worker that lost its lease can't clobber the
+   new owner's lease or delete the files it is writing (partials left by
+   a crashed worker, <file>.<run id>.partial, are never read)
+ - Only filesystem primitives are used: exclusive creates, atomic renames
+   (os.replace) and appends - no server or database
+
+ Work directory layout:
+   job.json                 formats, retry policy, shard count
+   shards/<shard>.json      pairs for one shard
+   leases/<shard>.lease     current owner + expiry (present while claimed)
+   journals/<shard>.jsonl   per-pair checkpoint journal
+   done/<shard>.json        completion marker with totals
+
+ Paths in the manifest are stored as absolute paths, so every machine
+ must see the XDFs, BINs and output folder at the same location. Lease
+ expiry compares wall-clock times, so machine clocks must be roughly in
+ sync (well within the lease duration).
+
+ Usage:
+   python tunerpro_exporter.py shards split <manifest> <work_dir> <output_dir> [options]
+   python tunerpro_exporter.py shards work <work_dir> [-j N] [--lease S]
+   python tunerpro_exporter.py shards status <work_dir>
+   python tunerpro_exporter.py shards selftest [-j 4] [--pairs 24]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tunerpro_exporter import resolve_formats, __version__
+from tunerpro_jobs import (
+    JobJournal, load_manifest, make_record, plan_pairs, run_pair,
+    DEFAULT_RETRIES, DEFAULT_BACKOFF, PARTIAL_SUFFIX
+)
+
+
+JOB_FILENAME = "job.json"
+DEFAULT_SHARD_SIZE = 100
+DEFAULT_LEASE_SECONDS = 120.0
+
+# A lease is not renewed once less than this share of it remains: another
+# worker may already see it as expired, and a late renewal would overwrite
+# that worker's fresh lease (the heartbeat renews with 2/3 remaining)
+RENEW_MARGIN = 0.25
+
+
+def _write_json_atomic(path: Path, data: Dict):
+    """Write JSON next to path and rename it into place"""
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}{PARTIAL_SUFFIX}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """Read a JSON file, or None if it is missing or mid-replace"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def split_manifest(manifest_path: str, work_dir: str, output_dir: str,
+                   formats: List[str], shard_size: int = DEFAULT_SHARD_SIZE,
+                   retries: int = DEFAULT_RETRIES,
+                   backoff: float = DEFAULT_BACKOFF) -> Dict:
+    """
+    Cut a manifest into shard files in a shared work directory
+
+    Args:
+        manifest_path: CSV manifest of XDF/BIN pairs (see tunerpro_jobs)
+        work_dir: Shared work directory (created if missing)
+        output_dir: Folder for exports (must be reachable by all workers)
+        formats: Export formats (keys of EXPORT_WRITERS)
+        shard_size: Pairs per shard
+        retries: Attempts per pair before it is left as failed
+        backoff: Base retry delay in seconds, doubled per attempt
+
+    Returns:
+        Dict: Job description (also written to work_dir/job.json)
+
+    Raises:
+        ValueError: If the work directory already holds a job
+    """
+    work = Path(work_dir)
+    if (work / JOB_FILENAME).exists():
+        raise ValueError(f"Work directory already contains a job: {work}")
+
+    pairs = load_manifest(manifest_path, os.path.abspath(output_dir))
+    for pair in pairs:
+        pair['xdf'] = os.path.abspath(pair['xdf'])
+        pair['bin'] = os.path.abspath(pair['bin'])
+    pairs.sort(key=lambda p: (p['xdf'], p['bin']))
+
+    for sub in ('shards', 'leases', 'journals', 'done'):
+        (work / sub).mkdir(parents=True, exist_ok=True)
+
+    shard_size = max(1, shard_size)
+    names = []
+    for index in range(0, len(pairs), shard_size):
+        name = f"shard-{index // shard_size:05d}"
+        _write_json_atomic(work / 'shards' / f"{name}.json",
+                           {'shard': name, 'pairs': pairs[index:index + shard_size]})
+        names.append(name)
+
+    job = {
+        'manifest': os.path.abspath(manifest_path),
+        'output_dir': os.path.abspath(output_dir),
+        'formats': formats,
+        'retries': retries,
+        'backoff': backoff,
+        'pairs': len(pairs),
+        'shards': names,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'exporter_version': __version__
+    }
+    # job.json last: workers treat its presence as "split complete"
+    _write_json_atomic(work / JOB_FILENAME, job)
+    return job
+
+
+class ShardWorker:
+    """
+    Claims, processes and completes shards in a shared work directory
+
+    A worker owns a shard while its lease file names the worker's token.
+    A heartbeat thread rewrites the lease every lease_seconds / 3; if the
+    lease is found missing or owned by someone else the worker stops after
+    the current pair without marking the shard complete.
+    """
+
+    def __init__(self, work_dir: str, worker_id: Optional[str] = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Initialize worker
+
+        Args:
+            work_dir: Shared work directory created by split_manifest()
+            worker_id: Name recorded in leases (default: host-pid)
+            lease_seconds: How long a claim stays valid without renewal
+
+        Raises:
+            ValueError: If work_dir does not contain a job
+        """
+        self.work = Path(work_dir)
+        self.job = _read_json(self.work / JOB_FILENAME)
+        if self.job is None:
+            raise ValueError(f"No job found in work directory: {self.work}")
+
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.logger = logging.getLogger(__name__)
+
+        self._token = None
+        self._expires = 0.0
+        self._lost = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    def _lease_path(self, shard: str) -> Path:
+        return self.work / 'leases' / f"{shard}.lease"
+
+    def _lease_data(self, shard: str) -> Dict:
+        now = time.time()
+        self._expires = now + self.lease_seconds
+        return {
+            'shard': shard,
+            'owner': self.worker_id,
+            'token': self._token,
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'renewed': now,
+            'expires': self._expires
+        }
+
+    def _try_create_lease(self, shard: str) -> bool:
+        """Exclusive-create the lease file; False if someone holds it"""
+        try:
+            fd = os.open(self._lease_path(shard), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._lease_data(shard), f)
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+
+    def try_claim(self, shard: str) -> bool:
+        """
+        Claim a shard, taking over its lease if the holder let it expire
+
+        Returns:
+            bool: True if this worker now owns the shard
+        """
+        if (self.work / 'done' / f"{shard}.json").exists():
+            return False
+
+        self._token = uuid.uuid4().hex
+        if self._try_create_lease(shard):
+            return True
+
+        lease_path = self._lease_path(shard)
+        lease = _read_json(lease_path)
+        if lease is None or lease['expires'] > time.time():
+            return False
+
+        # Expired: rename it out of the way. Only one contender's rename can
+        # succeed; everyone else gets FileNotFoundError and moves on.
+        stale_path = lease_path.with_name(f"{lease_path.name}.{self._token}.stale")
+        try:
+            os.rename(lease_path, stale_path)
+        except OSError:
+            return False
+
+        renamed = _read_json(stale_path)
+        if renamed is not None and (renamed.get('token'), renamed.get('expires')) != \
+                (lease.get('token'), lease.get('expires')):
+            # Another worker took it over (or the holder renewed) between our
+            # read and rename - hand the fresh lease back (link fails if the
+            # slot was refilled)
+            try:
+                os.link(stale_path, lease_path)
+            except OSError:
+                pass
+            os.unlink(stale_path)
+            return False
+        os.unlink(stale_path)
+
+        if not self._try_create_lease(shard):
+            return False  # The old holder renewed in the gap and keeps it
+        self.logger.warning(f"Took over expired lease on {shard} from {lease['owner']}")
+        return True
+
+    def owns(self, shard: str) -> bool:
+        """Check the lease file still carries this worker's token"""
+        lease = _read_json(self._lease_path(shard))
+        return lease is not None and lease.get('token') == self._token
+
+    def renew(self, shard: str) -> bool:
+        """
+        Extend the lease; returns False (and flags the loss) if it was taken
+
+        A lease that is (nearly) expired is never renewed, since another
+        worker may be taking it over at the same moment. The lease is read
+        back after writing to confirm it still carries this worker's token.
+        """
+        if time.time() > self._expires - self.lease_seconds * RENEW_MARGIN or not self.owns(shard):
+            self._lost.set()
+            return False
+        _write_json_atomic(self._lease_path(shard), self._lease_data(shard))
+        if not self.owns(shard):
+            self._lost.set()
+            return False
+        return True
+
+    def release(self, shard: str):
+        """Drop the lease (only if still ours)"""
+        if self.owns(shard):
+            try:
+                os.unlink(self._lease_path(shard))
+            except FileNotFoundError:
+                pass
+
+    def _heartbeat(self, shard: str, stop: threading.Event):
+        """Renew the lease until stopped or lost"""
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.renew(shard):
+                self.logger.warning(f"Lost lease on {shard}")
+                return
+
+    # ------------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------------
+
+    def pending_shards(self) -> List[str]:
+        """Shards without a completion marker"""
+        done = {p.stem for p in (self.work / 'done').glob('*.json')}
+        return [name for name in self.job['shards'] if name not in done]
+
+    def claim_next(self) -> Optional[str]:
+        """Claim any available shard (random order spreads contention)"""
+        candidates = self.pending_shards()
+        random.shuffle(candidates)
+        for shard in candidates:
+            if self.try_claim(shard):
+                return shard
+        return None
+
+    def process(self, shard: str, on_result=None) -> Dict:
+        """
+        Export every pair in a claimed shard and mark it complete
+
+        Args:
+            shard: Shard name returned by claim_next()/try_claim()
+            on_result: Optional callback(pair, record) after each checkpoint
+
+        Returns:
+            Dict: Shard totals; 'completed' is False if the lease was lost
+        """
+        start = time.perf_counter()
+        formats = self.job['formats']
+        retries = self.job['retries']
+        backoff = self.job['backoff']
+
+        pairs = _read_json(self.work / 'shards' / f"{shard}.json")['pairs']
+        journal = JobJournal(self.work / 'journals' / f"{shard}.jsonl")
+        journal.load()
+        plan = plan_pairs(pairs, journal, formats, retries)
+
+        totals = {'shard': shard, 'worker': self.worker_id, 'pairs': len(pairs),
+                  'skipped': len(plan['done']), 'done': 0, 'failed': len(plan['exhausted']),
+                  'attempts': 0, 'completed': False}
+
+        self._lost.clear()
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(shard, stop), daemon=True)
+        heartbeat.start()
+
+        try:
+            for pair in plan['todo']:
+                record = journal.get(pair['id'])
+                attempts = record['attempts'] if record and record['state'] == 'failed' else 0
+                while True:
+                    if self._lost.is_set() or not self.owns(shard):
+                        self.logger.warning(f"Stopping {shard}: lease no longer held")
+                        return totals
+                    # A worker that lost this shard may still be exporting the
+                    # same pair: leave partials alone, they may be its live files
+                    result = run_pair(dict(pair, formats=formats), remove_stale=False)
+                    attempts += 1
+                    totals['attempts'] += 1
+                    record = make_record(pair, result, attempts)
+                    journal.append(record)
+                    if on_result:
+                        on_result(pair, record)
+                    if result['status'] == 'done' or attempts >= retries:
+                        break
+                    time.sleep(backoff * (2 ** (attempts - 1)))
+                totals['done' if record['state'] == 'done' else 'failed'] += 1
+
+            if not self.owns(shard):
+                return totals
+            totals['completed'] = True
+            totals['elapsed_s'] = round(time.perf_counter() - start, 4)
+            totals['finished'] = datetime.now().isoformat(timespec='seconds')
+            _write_json_atomic(self.work / 'done' / f"{shard}.json", totals)
+            return totals
+
+        finally:
+            stop.set()
+            heartbeat.join()
+            self.release(shard)
+
+    def run(self, poll_interval: Optional[float] = None, max_shards: Optional[int] = None,
+            on_result=None, on_shard=None) -> int:
+        """
+        Work until every shard is complete
+
+        Workers wait while other workers hold the remaining shards, so a
+        crashed worker's shards are picked up once its lease expires.
+
+        Args:
+            poll_interval: Seconds between claim attempts when idle
+                           (default: a quarter of the lease, at most 5s)
+            max_shards: Stop after processing this many shards
+            on_result: Optional callback(pair, record) per pair
+            on_shard: Optional callback(totals) per processed shard
+
+        Returns:
+            int: Number of shards this worker completed
+        """
+        if poll_interval is None:
+            poll_interval = min(5.0, self.lease_seconds / 4)
+
+        completed = 0
+        processed = 0
+        while self.pending_shards() and (max_shards is None or processed < max_shards):
+            shard = self.claim_next()
+            if shard is None:
+                time.sleep(poll_interval)
+                continue
+            totals = self.process(shard, on_result=on_result)
+            processed += 1
+            completed += int(totals['completed'])
+            if on_shard:
+                on_shard(totals)
+        return completed
+
+
+def shard_status(work_dir: str) -> Dict:
+    """
+    Summarise a sharded job from the work directory
+
+    Returns:
+        Dict: Shard counts (done/leased/expired/pending), pair counts
+              from the shard journals and the failed pair records
+    """
+    work = Path(work_dir)
+    job = _read_json(work / JOB_FILENAME)
+    if job is None:
+        raise ValueError(f"No job found in work directory: {work}")
+
+    now = time.time()
+    status = {'shards': len(job['shards']), 'done': 0, 'leased': 0, 'expired': 0,
+              'pending': 0, 'pairs': job['pairs'], 'pairs_done': 0, 'pairs_failed': 0,
+              'owners': {}, 'failures': []}
+
+    for shard in job['shards']:
+        if (work / 'done' / f"{shard}.json").exists():
+            status['done'] += 1
+        else:
+            lease = _read_json(work / 'leases' / f"{shard}.lease")
+            if lease is None:
+                status['pending'] += 1
+            elif lease['expires'] < now:
+                status['expired'] += 1
+            else:
+                status['leased'] += 1
+                status['owners'][shard] = lease['owner']
+
+        journal = JobJournal(work / 'journals' / f"{shard}.jsonl")
+        for record in journal.load().values():
+            if record['state'] == 'done':
+                status['pairs_done'] += 1
+            elif record['attempts'] >= job['retries']:
+                status['pairs_failed'] += 1
+                status['failures'].append(record)
+
+    return status
+
+
+def _process_context():
+    """Start method for worker processes (fork where it is safe)"""
+    methods = multiprocessing.get_all_start_methods()
+    use_fork = 'fork' in methods and sys.platform != 'darwin'
+    return multiprocessing.get_context('fork' if use_fork else 'spawn')
+
+
+def _crashing_worker(work_dir: str, lease_seconds: float):
+    """Claim a shard and die without releasing it (selftest)"""
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+    ShardWorker(work_dir, 'selftest-crashed', lease_seconds).claim_next()
+    os._exit(1)
+
+
+def selftest(workers: int = 4, pairs: int = 24, shard_size: int = 3,
+             lease_seconds: float = 2.0) -> List[Dict]:
+    """
+    Run a small sharded job with local worker processes in a temp directory
+
+    Uses copies of one small synthetic XDF/BIN pair. Checks that a stalled
+    worker can't renew a lease another worker took over, that a crashed
+    worker's shard is taken over, and that every pair is exported exactly
+    as a single worker would (no failures, no partial files left).
+
+    Returns:
+        List[Dict]: One entry per check with 'check', 'ok' and 'detail'
+    """
+    from tunerpro_synth import default_spec, write_pair
+
+    checks = []
+
+    def check(name: str, ok: bool, detail: str = ""):
+        checks.append({'check': name, 'ok': bool(ok), 'detail': detail})
+
+    tmp = Path(tempfile.mkdtemp(prefix="shards_selftest_"))
+    try:
+        xdf_path, bin_path = write_pair(default_spec('small'), str(tmp / 'defs'), 'selftest')
+        lines = []
+        for i in range(pairs):
+            copy = tmp / 'bins' / f"pair_{i:03d}.bin"
+            copy.parent.mkdir(exist_ok=True)
+            shutil.copyfile(bin_path, copy)
+            lines.append(f"{xdf_path},{copy}")
+        manifest = tmp / 'manifest.csv'
+        manifest.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        work = tmp / 'work'
+        output = tmp / 'out'
+        job = split_manifest(str(manifest), str(work), str(output), ['txt'],
+                             shard_size, retries=1, backoff=0.0)
+
+        # A worker whose lease ran out must not renew it (another worker may
+        # be taking it over at that moment), and the takeover must succeed
+        shard = job['shards'][0]
+        stalled = ShardWorker(str(work), 'selftest-stalled', lease_seconds / 4)
+        taker = ShardWorker(str(work), 'selftest-taker', lease_seconds)
+        stalled.try_claim(shard)
+        time.sleep(lease_seconds / 4 + 0.05)
+        renewed = stalled.renew(shard)
+        taken = taker.try_claim(shard)
+        check("expired lease is not renewed", not renewed and taken and not stalled.owns(shard),
+              f"late renewal={renewed}, takeover={taken}")
+        taker.release(shard)
+
+        ctx = _process_context()
+        crashed = ctx.Process(target=_crashing_worker, args=(str(work), lease_seconds))
+        crashed.start()
+        crashed.join()
+        leases = list((work / 'leases').glob('*.lease'))
+        check("crashed worker leaves its lease", len(leases) == 1,
+              f"{len(leases)} lease file(s)")
+
+        procs = [
+            ctx.Process(target=_worker_main,
+                        args=(str(work), f"selftest-w{i + 1}", lease_seconds, logging.ERROR, False))
+            for i in range(max(1, workers))
+        ]
+        for proc in procs:
+            proc.start()
+        deadline = time.time() + 60 + pairs * 2
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.time()))
+        hung = [proc for proc in procs if proc.is_alive()]
+        for proc in hung:
+            proc.terminate()
+            proc.join()
+        check("workers finish", not hung, f"{len(hung)} still running at the deadline")
+
+        status = shard_status(str(work))
+        check("every shard completed", status['done'] == status['shards'],
+              f"{status['done']}/{status['shards']}")
+        check("every pair exported", status['pairs_done'] == pairs and not status['failures'],
+              f"{status['pairs_done']}/{pairs} done, {status['pairs_failed']} failed")
+        missing = [p['output_base'] for name in job['shards']
+                   for p in _read_json(work / 'shards' / f"{name}.json")['pairs']
+                   if not os.path.exists(f"{p['output_base']}.txt")]
+        check("every output written", not missing, f"{len(missing)} missing")
+        partials = list(output.rglob(f"*{PARTIAL_SUFFIX}"))
+        check("no partial files left", not partials, f"{len(partials)} left")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return checks
+
+
+def _worker_main(work_dir: str, worker_id: Optional[str], lease_seconds: float,
+                 log_level: int, verbose: bool) -> int:
+    """Entry point for one worker process"""
+    logging.getLogger('tunerpro_exporter').setLevel(log_level)
+    worker = ShardWorker(work_dir, worker_id, lease_seconds)
+
+    def report_shard(totals: Dict):
+        mark = "✓" if totals['completed'] else "↷"
+        print(f"  {mark} [{worker.worker_id}] {totals['shard']}: {totals['done']} done, "
+              f"{totals['failed']} failed, {totals['skipped']} already done", flush=True)
+
+    def report_pair(pair: Dict, record: Dict):
+        if verbose or record['state'] != 'done':
+            mark = "✓" if record['state'] == 'done' else "✗"
+            line = f"    {mark} {Path(pair['bin']).name}"
+            if record['error']:
+                line += f" - {record['error']} [attempt {record['attempts']}]"
+            print(line, flush=True)
+
+    return worker.run(on_result=report_pair, on_shard=report_shard)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Sharded jobs command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py shards",
+        description="Lease-based sharded exports over a shared work directory"
+    )
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    split_p = sub.add_parser('split', help="Cut a manifest into shards in a work directory")
+    split_p.add_argument('manifest', help="CSV manifest: xdf,bin[,output_base]")
+    split_p.add_argument('work_dir', help="Shared work directory for shards and leases")
+    split_p.add_argument('output_dir', help="Folder for exports (shared by all workers)")
+    split_p.add_argument('-f', '--format', default='txt',
+                         help="txt, json, md, csv, comma list, or all (default: txt)")
+    split_p.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                         help=f"Pairs per shard (default: {DEFAULT_SHARD_SIZE})")
+    split_p.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                         help=f"Attempts per pair (default: {DEFAULT_RETRIES})")
+    split_p.add_argument('--backoff', type=float, default=DEFAULT_BACKOFF,
+                         help=f"Base retry delay in seconds (default: {DEFAULT_BACKOFF})")
+
+    work_p = sub.add_parser('work', help="Claim and process shards until all are done")
+    work_p.add_argument('work_dir', help="Shared work directory")
+    work_p.add_argument('-j', '--workers', type=int, default=1,
+                        help="Worker processes to start on this machine (default: 1)")
+    work_p.add_argument('--id', default=None,
+                        help="Worker name recorded in leases (default: host-pid)")
+    work_p.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                        help=f"Lease duration in seconds (default: {DEFAULT_LEASE_SECONDS:g})")
+    work_p.add_argument('-v', '--verbose', action='store_true',
+                        help="Show every pair, not just failures")
+
+    status_p = sub.add_parser('status', help="Show progress of a sharded job")
+    status_p.add_argument('work_dir', help="Shared work directory")
+
+    test_p = sub.add_parser('selftest',
+                            help="Run a small job with local worker processes in a temp directory")
+    test_p.add_argument('-j', '--workers', type=int, default=4,
+                        help="Worker processes (default: 4)")
+    test_p.add_argument('--pairs', type=int, default=24, help="Pairs in the job (default: 24)")
+    test_p.add_argument('--shard-size', type=int, default=3, help="Pairs per shard (default: 3)")
+    test_p.add_argument('--lease', type=float, default=2.0,
+                        help="Lease duration in seconds (default: 2)")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == 'split':
+            job = split_manifest(args.manifest, args.work_dir, args.output_dir,
+                                 resolve_formats(args.format), args.shard_size,
+                                 max(1, args.retries), args.backoff)
+            print(f"Split {job['pairs']} pairs into {len(job['shards'])} shard(s) "
+                  f"in {args.work_dir}")
+            return 0
+
+        if args.action == 'status':
+            status = shard_status(args.work_dir)
+            print(f"Shards: {status['done']}/{status['shards']} done, "
+                  f"{status['leased']} leased, {status['expired']} expired, "
+                  f"{status['pending']} pending")
+            print(f"Pairs:  {status['pairs_done']}/{status['pairs']} done, "
+                  f"{status['pairs_failed']} failed")
+            for shard, owner in sorted(status['owners'].items()):
+                print(f"  {shard}: {owner}")
+            for record in status['failures']:
+                print(f"  ✗ {Path(record['bin']).name} ({Path(record['xdf']).name}) "
+                      f"- {record['error']}")
+            return 0 if status['done'] == status['shards'] and not status['failures'] else 1
+
+        if args.action == 'selftest':
+            checks = selftest(args.workers, max(1, args.pairs), args.shard_size, args.lease)
+            for item in checks:
+                mark = "✓" if item['ok'] else "✗"
+                print(f"  {mark} {item['check']}" + (f" ({item['detail']})" if item['detail'] else ""))
+            return 0 if all(item['ok'] for item in checks) else 1
+
+        ShardWorker(args.work_dir)  # Validate the work directory up front
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    print("=" * 70)
+    print(f"  KingAI TunerPro Exporter v{__version__} - Shard Worker")
+    print("=" * 70)
+
+    workers = max(1, args.workers)
+    if workers == 1:
+        _worker_main(args.work_dir, args.id, args.lease, log_level, args.verbose)
+    else:
+        # Independent processes, exactly like workers on other machines
+        ctx = _process_context()
+        base_id = args.id or f"{socket.gethostname()}-{os.getpid()}"
+        procs = [
+            ctx.Process(target=_worker_main,
+                        args=(args.work_dir, f"{base_id}-w{i + 1}", args.lease,
+                              log_level, args.verbose))
+            for i in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+    status = shard_status(args.work_dir)
+    print()
+    print(f"Shards: {status['done']}/{status['shards']} done; "
+          f"pairs: {status['pairs_done']}/{status['pairs']} done, "
+          f"{status['pairs_failed']} failed")
+    return 0 if status['done'] == status['shards'] and not status['failures'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
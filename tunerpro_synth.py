@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Synthetic XDF/BIN Generator
+===============================================================================
+
+ Builds a matching XDF and BIN of any size from a seed, so the exporter can
+ be benchmarked and regression-checked without anyone's private
+ definitions or tunes.
+
+ - Constants (8/16/32-bit, signed, LSB first), flags, tables with embedded
+   or labelled axes, BMW-style negative major strides, patches (some
+   applied) and a BASEOFFSET (subtract 0 or 1)
+ - Equations are the common TunerPro shapes ("X*0.5-40", "X/100",
+   "(X-32)*5/9", ...); every value is written inside its declared range
+   and tables are smooth, so validation behaves like on real pairs
+ - Same spec + seed = byte-identical XDF and BIN
+
+ Usage:
+   python tunerpro_exporter.py synth <output_dir> [--scale medium]
+       [--constants N] [--flags N] [--tables N] [--patches N]
+       [--base-offset N] [--subtract] [--seed N]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Element counts per named scale
+SCALES = {
+    'small': {'constants': 200, 'flags': 100, 'tables': 50, 'patches': 10},
+    'medium': {'constants': 2000, 'flags': 1000, 'tables': 500, 'patches': 50},
+    'large': {'constants': 10000, 'flags': 5000, 'tables': 2000, 'patches': 200},
+}
+
+# Equations and their Python equivalent (for ranges and expected values)
+EQUATIONS = [
+    ('X', lambda x: x),
+    ('X*0.5-40', lambda x: x * 0.5 - 40),
+    ('X/100', lambda x: x / 100),
+    ('X*0.75', lambda x: x * 0.75),
+    ('(X-32)*5/9', lambda x: (x - 32) * 5 / 9),
+    ('X*100/255', lambda x: x * 100 / 255),
+    ('X*0.1+2', lambda x: x * 0.1 + 2),
+]
+
+# Equations that exercise evaluate_math's edge cases (spec 'edge_fraction'):
+# division by zero, math domain errors, inf/NaN results, int overflow,
+# axis variables, a leading operator, named X variables and stripped
+# XML entities. Most fail for some raw values and fall back to the raw value.
+# 'X*1e200' decodes fine but is too large to square, which the table
+# statistics and anomaly kernels have to survive.
+EDGE_EQUATIONS = [
+    '1000/X',
+    'log(X)',
+    'sqrt(X-100)',
+    '(X+1e400)*0',
+    'X*1e308*10',
+    'X*1e200',
+    '2**X',
+    'X*A+B',
+    'Y+Z*X/1000',
+    '*0.5+1',
+    'X10*2',
+    'X*2&#013;&#010;',
+    '(null)',
+]
+
+# Element size mix (bits, weight) for constants and table cells
+CONSTANT_SIZES = [(8, 0.6), (16, 0.35), (32, 0.05)]
+TABLE_SIZES = [(8, 0.5), (16, 0.5)]
+
+# Image sizes tried in order; the first the layout fits in is used
+BIN_SIZES = [0x20000, 0x40000, 0x80000, 0x100000, 0x200000, 0x400000]
+
+# Share of flags put on the previous flag's byte with another mask bit
+# (packed option bytes, as in most real definitions)
+PACKED_FLAG_FRACTION = 0.3
+
+# Values of spec keys added later that reproduce pairs generated before
+# the key existed (for comparing with old benchmark baselines)
+LEGACY_SPEC = {'edge_fraction': 0.0, 'packed_flag_fraction': 0.0}
+
+CATEGORIES = ['Fuel', 'Spark', 'Idle', 'Transmission', 'Diagnostics', 'Limiters']
+
+
+def default_spec(scale: str = 'medium', **overrides) -> Dict[str, Any]:
+    """
+    Generator spec for a named scale
+
+    Args:
+        scale: Key of SCALES
+        overrides: Any spec key (counts, 'seed', 'base_offset', 'subtract',
+                   'lsb_fraction', 'signed_fraction', 'negative_stride_fraction',
+                   'edge_fraction', 'packed_flag_fraction')
+
+    Raises:
+        ValueError: Unknown scale or spec key
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}' (choose from {', '.join(SCALES)})")
+    spec = dict(SCALES[scale], seed=1, base_offset=0, subtract=0, lsb_fraction=0.2,
+                signed_fraction=0.1, negative_stride_fraction=0.05, edge_fraction=0.0,
+                packed_flag_fraction=PACKED_FLAG_FRACTION)
+    unknown = set(overrides) - set(spec)
+    if unknown:
+        raise ValueError(f"Unknown spec keys: {', '.join(sorted(unknown))}")
+    spec.update(overrides)
+    return spec
+
+
+def _pick(rng: random.Random, choices: List[Tuple[Any, float]]) -> Any:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def _raw_limits(size_bits: int, signed: bool) -> Tuple[int, int]:
+    if signed:
+        return -(1 << (size_bits - 1)), (1 << (size_bits - 1)) - 1
+    return 0, (1 << size_bits) - 1
+
+
+def _fmt(size_bits: int, signed: bool, lsb_first: bool) -> str:
+    code = {8: 'b', 16: 'h', 32: 'i'}[size_bits]
+    return ('<' if lsb_first else '>') + (code if signed else code.upper())
+
+
+def _type_flags(signed: bool, lsb_first: bool) -> str:
+    return f"0x{(0x02 if signed else 0) | (0x01 if lsb_first else 0):02X}"
+
+
+def _equation(rng: random.Random, spec: Dict[str, Any], raw_min: int, raw_max: int) -> Tuple[str, float, float]:
+    """Equation and its rangelow/rangehigh (edge equations get the raw range)"""
+    # No extra draw when edge_fraction is 0 (same pairs as before it existed)
+    if spec['edge_fraction'] and rng.random() < spec['edge_fraction']:
+        return rng.choice(EDGE_EQUATIONS), raw_min, raw_max
+    equation, func = rng.choice(EQUATIONS)
+    low, high = sorted((func(raw_min), func(raw_max)))
+    return equation, low, high
+
+
+def _category(rng: random.Random) -> str:
+    return f'<CATEGORYMEM index="0" category="{rng.randrange(len(CATEGORIES))}" />'
+
+
+class _Layout:
+    """Bump allocator over file offsets, converted to XDF addresses"""
+
+    def __init__(self, start: int, base_offset: int, subtract: int):
+        self.pos = start
+        self.base_offset = base_offset
+        self.subtract = subtract
+        self.writes: List[Tuple[int, bytes]] = []
+
+    def alloc(self, length: int, align: int = 1) -> int:
+        self.pos = -(-self.pos // align) * align
+        offset = self.pos
+        self.pos += length
+        return offset
+
+    def address(self, offset: int) -> int:
+        """XDF address for a file offset (inverse of the exporter's BASEOFFSET)"""
+        return offset + self.base_offset if self.subtract else offset - self.base_offset
+
+    def write(self, offset: int, data: bytes):
+        self.writes.append((offset, data))
+
+
+def generate(spec: Dict[str, Any]) -> Tuple[str, bytes]:
+    """
+    Build an XDF (text) and BIN (bytes) from a default_spec() spec
+
+    Returns:
+        Tuple: (xdf_text, bin_data)
+    """
+    rng = random.Random(spec['seed'])
+    base_offset, subtract = spec['base_offset'], 1 if spec['subtract'] else 0
+    # subtract=0 maps XDF address 0 to file offset base_offset
+    layout = _Layout(0x100 + (0 if subtract else base_offset), base_offset, subtract)
+    parts = [
+        '<XDFFORMAT version="1.60"><XDFHEADER>',
+        f'<deftitle>Synthetic {spec["constants"]}c/{spec["flags"]}f/{spec["tables"]}t '
+        f'seed {spec["seed"]}</deftitle>',
+        f'<BASEOFFSET offset="{base_offset}" subtract="{subtract}" />',
+    ]
+    parts.extend(f'<CATEGORY index="0x{i:X}" name="{name}" />' for i, name in enumerate(CATEGORIES))
+    parts.append('</XDFHEADER>')
+    uid = 0
+
+    for i in range(spec['constants']):
+        size_bits = _pick(rng, CONSTANT_SIZES)
+        signed = rng.random() < spec['signed_fraction']
+        lsb_first = size_bits > 8 and rng.random() < spec['lsb_fraction']
+        raw_min, raw_max = _raw_limits(size_bits, signed)
+        equation, low, high = _equation(rng, spec, raw_min, raw_max)
+        offset = layout.alloc(size_bits // 8)
+        layout.write(offset, struct.pack(_fmt(size_bits, signed, lsb_first),
+                                         rng.randint(raw_min, raw_max)))
+        uid += 1
+        parts.append(
+            f'<XDFCONSTANT uniqueid="0x{uid:X}"><title>Const {i}</title>{_category(rng)}'
+            f'<EMBEDDEDDATA mmedaddress="0x{layout.address(offset):X}" '
+            f'mmedelementsizebits="{size_bits}" mmedtypeflags="{_type_flags(signed, lsb_first)}" />'
+            f'<units>u</units><decimalpl>2</decimalpl><rangelow>{low:.10g}</rangelow>'
+            f'<rangehigh>{high:.10g}</rangehigh><MATH equation="{equation}"><VAR id="X" /></MATH>'
+            f'</XDFCONSTANT>'
+        )
+
+    flag_byte, used_bits = None, 0
+    for i in range(spec['flags']):
+        # No extra draw when packed_flag_fraction is 0 (same pairs as before it existed)
+        if (flag_byte is not None and used_bits != 0xFF and spec['packed_flag_fraction']
+                and rng.random() < spec['packed_flag_fraction']):
+            offset = flag_byte
+            category = _category(rng)
+            bit = rng.choice([b for b in range(8) if not used_bits >> b & 1])
+        else:
+            offset = layout.alloc(1)
+            layout.write(offset, bytes([rng.randrange(256)]))
+            category = _category(rng)
+            bit = rng.randrange(8)
+            flag_byte, used_bits = offset, 0
+        used_bits |= 1 << bit
+        uid += 1
+        parts.append(
+            f'<XDFFLAG uniqueid="0x{uid:X}"><title>Flag {i}</title>{category}'
+            f'<EMBEDDEDDATA mmedaddress="0x{layout.address(offset):X}" mmedelementsizebits="8" />'
+            f'<mask>0x{1 << bit:02X}</mask></XDFFLAG>'
+        )
+
+    for i in range(spec['tables']):
+        parts.append(_table(rng, spec, layout, i, uid + 1 + i))
+    uid += spec['tables']
+
+    for i in range(spec['patches']):
+        entries = []
+        applied = rng.random() < 0.5
+        for j in range(rng.randint(1, 4)):
+            length = rng.randint(2, 16)
+            offset = layout.alloc(length)
+            base = bytes(rng.randrange(256) for _ in range(length))
+            patch = bytes(rng.randrange(256) for _ in range(length))
+            layout.write(offset, patch if applied else base)
+            entries.append(
+                f'<XDFPATCHENTRY name="e{j}" address="0x{layout.address(offset):X}" '
+                f'datasize="0x{length:X}" patchdata="{patch.hex()}" basedata="{base.hex()}" />'
+            )
+        uid += 1
+        parts.append(
+            f'<XDFPATCH uniqueid="0x{uid:X}"><title>[PATCH] Patch {i}</title>'
+            f'<description>Synthetic patch {i}</description>{"".join(entries)}</XDFPATCH>'
+        )
+    parts.append('</XDFFORMAT>')
+
+    size = next((s for s in BIN_SIZES if s >= layout.pos), -(-layout.pos // 0x10000) * 0x10000)
+    data = bytearray(b'\xff') * size
+    for offset, chunk in layout.writes:
+        data[offset:offset + len(chunk)] = chunk
+    return ''.join(parts), bytes(data)
+
+
+def _table(rng: random.Random, spec: Dict[str, Any], layout: _Layout, index: int, uid: int) -> str:
+    """One XDFTABLE with smooth data (and maybe an embedded X axis) written to the layout"""
+    rows, cols = rng.randint(2, 16), rng.randint(2, 17)
+    size_bits = _pick(rng, TABLE_SIZES)
+    signed = rng.random() < spec['signed_fraction']
+    lsb_first = size_bits > 8 and rng.random() < spec['lsb_fraction']
+    negative = rng.random() < spec['negative_stride_fraction']
+    raw_min, raw_max = _raw_limits(size_bits, signed)
+    equation, low, high = _equation(rng, spec, raw_min, raw_max)
+    size = size_bits // 8
+    fmt = _fmt(size_bits, signed, lsb_first)
+
+    # Smooth surface scaled into the middle of the raw range
+    span = (raw_max - raw_min) * rng.uniform(0.2, 0.8)
+    base = raw_min + (raw_max - raw_min - span) * rng.random()
+    curve = rng.uniform(0.5, 2.0)
+    cells = [[int(base + span * ((r / max(rows - 1, 1)) * 0.6 + (c / max(cols - 1, 1)) ** curve * 0.4))
+              for c in range(cols)] for r in range(rows)]
+
+    data_offset = layout.alloc(rows * cols * size, size)
+    block = bytearray(rows * cols * size)
+    for r in range(rows):
+        # Negative major stride stores the rows last-to-first
+        stored = rows - 1 - r if negative else r
+        for c in range(cols):
+            struct.pack_into(fmt, block, (stored * cols + c) * size, cells[r][c])
+    layout.write(data_offset, bytes(block))
+
+    x_axis = f'<XDFAXIS id="x" uniqueid="0x0"><indexcount>{cols}</indexcount>'
+    if rng.random() < 0.5:
+        axis_offset = layout.alloc(cols * 2, 2)
+        layout.write(axis_offset, struct.pack(f'>{cols}H', *(500 + 250 * c for c in range(cols))))
+        x_axis += (f'<EMBEDDEDDATA mmedaddress="0x{layout.address(axis_offset):X}" '
+                   f'mmedelementsizebits="16" mmedmajorstridebits="0" mmedminorstridebits="0" />'
+                   f'<units>RPM</units><MATH equation="X"><VAR id="X" /></MATH></XDFAXIS>')
+    else:
+        x_axis += (''.join(f'<LABEL index="{c}" value="{400 * c}" />' for c in range(cols))
+                   + '<units>RPM</units><MATH equation="X"><VAR id="X" /></MATH></XDFAXIS>')
+    y_axis = (f'<XDFAXIS id="y" uniqueid="0x0"><indexcount>{rows}</indexcount>'
+              + ''.join(f'<LABEL index="{r}" value="{10 * r}" />' for r in range(rows))
+              + '<units>kPa</units><MATH equation="X"><VAR id="X" /></MATH></XDFAXIS>')
+    stride = f' mmedmajorstridebits="-{size_bits}"' if negative else ''
+    z_axis = (f'<XDFAXIS id="z"><EMBEDDEDDATA mmedaddress="0x{layout.address(data_offset):X}" '
+              f'mmedelementsizebits="{size_bits}" mmedtypeflags="{_type_flags(signed, lsb_first)}" '
+              f'mmedrowcount="{rows}" mmedcolcount="{cols}"{stride} /><units>u</units>'
+              f'<decimalpl>2</decimalpl><rangelow>{low:.10g}</rangelow><rangehigh>{high:.10g}</rangehigh>'
+              f'<MATH equation="{equation}"><VAR id="X" /></MATH></XDFAXIS>')
+    return (f'<XDFTABLE uniqueid="0x{uid:X}"><title>Table {index}</title>'
+            f'{_category(rng)}{x_axis}{y_axis}{z_axis}</XDFTABLE>')
+
+
+def write_pair(spec: Dict[str, Any], directory: str, stem: Optional[str] = None) -> Tuple[Path, Path]:
+    """
+    Generate and write <stem>.xdf and <stem>.bin into a directory
+
+    Returns:
+        Tuple: (xdf_path, bin_path)
+    """
+    xdf_text, bin_data = generate(spec)
+    folder = Path(directory)
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = stem or (f"synth_{spec['constants']}c_{spec['flags']}f_{spec['tables']}t_"
+                    f"{spec['patches']}p_s{spec['seed']}")
+    xdf_path = folder / f"{stem}.xdf"
+    bin_path = folder / f"{stem}.bin"
+    xdf_path.write_text(xdf_text, encoding='utf-8')
+    bin_path.write_bytes(bin_data)
+    return xdf_path, bin_path
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    """Generator options shared by the synth and bench commands"""
+    parser.add_argument('--scale', choices=list(SCALES), default='medium',
+                        help="Element counts preset (default: medium)")
+    for kind in ('constants', 'flags', 'tables', 'patches'):
+        parser.add_argument(f'--{kind}', type=int, help=f"Number of {kind} (overrides --scale)")
+    parser.add_argument('--base-offset', type=lambda text: int(text, 0), default=0,
+                        help="BASEOFFSET written to the XDF (default: 0)")
+    parser.add_argument('--subtract', action='store_true', help="BASEOFFSET subtract=\"1\"")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument('--edge-fraction', type=float, default=0.0,
+                        help="Share of equations that hit evaluate_math edge cases (default: 0)")
+    parser.add_argument('--packed-flag-fraction', type=float, default=PACKED_FLAG_FRACTION,
+                        help=f"Share of flags sharing a byte with another flag "
+                             f"(default: {PACKED_FLAG_FRACTION})")
+
+
+def spec_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """default_spec() from add_spec_arguments() options"""
+    overrides = {kind: getattr(args, kind) for kind in ('constants', 'flags', 'tables', 'patches')
+                 if getattr(args, kind) is not None}
+    return default_spec(args.scale, seed=args.seed, base_offset=args.base_offset,
+                        subtract=1 if args.subtract else 0, edge_fraction=args.edge_fraction,
+                        packed_flag_fraction=args.packed_flag_fraction, **overrides)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Synthetic XDF/BIN generator command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py synth",
+        description="Write a synthetic XDF + BIN pair of any size"
+    )
+    parser.add_argument('output_dir', help="Directory for the .xdf and .bin")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    xdf_path, bin_path = write_pair(spec, args.output_dir)
+    print(f"XDF: {xdf_path} ({xdf_path.stat().st_size:,} bytes)")
+    print(f"BIN: {bin_path} ({bin_path.stat().st_size:,} bytes)")
+    print(f"Elements: {spec['constants']} constants, {spec['flags']} flags, "
+          f"{spec['tables']} tables, {spec['patches']} patches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
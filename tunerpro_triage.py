@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Pairing Triage
+===============================================================================
+
+ Answer "is this the right XDF for this BIN?" before running a full export.
+
+ - Scalars are checked against their declared rangelow/rangehigh
+ - Tables are spot-checked on a handful of sampled cells (corners + evenly
+   spaced) against the Z-axis range, the all-zero / all-same heuristics and
+   a neighbouring-cell smoothness test
+ - Patches count as evidence when the BIN matches their patch or base bytes;
+   they are shuffled in with the scalars and tables, and early rejection
+   waits for MIN_CHECKS calibration (scalar/table) checks, so a patchlist
+   written for another OS revision can't reject a pairing on its own
+ - Erased tables (all 0xFF) and addresses past the end of the BIN fail;
+   single 0xFF scalars are skipped (a legitimate value as often as not)
+ - Checks run in a shuffled order and stop as soon as the pairing is
+   clearly bad, so a wrong XDF is usually rejected after a few dozen reads
+
+ Verdicts:
+   plausible   score >= 0.85
+   doubtful    score >= 0.60
+   mismatch    score <  0.60 (or stopped early)
+   unknown     not enough declared ranges / samples to judge
+
+ Usage:
+   python tunerpro_exporter.py triage <xdf> <bin> [--json] [--budget MS]
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from tunerpro_exporter import UniversalXDFExporter
+
+
+# Verdict thresholds on the weighted pass rate
+PLAUSIBLE_SCORE = 0.85
+MISMATCH_SCORE = 0.60
+
+# Early stop: once this many scalar/table checks have run, stop if even the
+# optimistic (99% Wilson upper bound) pass rate is below MISMATCH_SCORE
+MIN_CHECKS = 20
+WILSON_Z = 2.58
+
+# Below this much evidence (sum of weights) the verdict is 'unknown'
+MIN_EVIDENCE = 5.0
+
+# Evidence weights per check kind
+WEIGHTS = {
+    'scalar_range': 1.0,    # Scalar with an informative declared range
+    'scalar': 0.25,         # Scalar without a range (out-of-bounds only)
+    'table_range': 1.0,     # Sampled table cells against the Z-axis range
+    'table': 0.5,           # Sampled table cells, heuristics only
+    'patch': 1.0,           # Patch bytes match patch or base data
+}
+
+TABLE_SAMPLE_CELLS = 8
+
+# Fraction of sampled cells that must be in range for a table to pass
+TABLE_IN_RANGE_FRACTION = 0.75
+
+# Mean neighbour step relative to the sampled spread above which a table is
+# treated as noise (uniform random bytes average ~0.33, smooth maps ~0.1)
+MAX_NEIGHBOUR_ROUGHNESS = 0.25
+MIN_SMOOTH_COLS = 4
+
+
+def _raw_extremes(size_bits: int, signed: bool) -> Tuple[int, int]:
+    """Smallest and largest raw value for an element size"""
+    if signed:
+        return -(1 << (size_bits - 1)), (1 << (size_bits - 1)) - 1
+    return 0, (1 << size_bits) - 1
+
+
+def _is_erased(raw: int, size_bits: int) -> bool:
+    """True for erased flash (all bits set), signed or unsigned"""
+    mask = (1 << size_bits) - 1
+    return (raw & mask) == mask
+
+
+def _in_range(value: float, low: Optional[float], high: Optional[float]) -> bool:
+    tolerance = 1e-9 * max(1.0, abs(value))
+    if low is not None and value < low - tolerance:
+        return False
+    if high is not None and value > high + tolerance:
+        return False
+    return True
+
+
+def _sample_indices(count: int, samples: int) -> List[int]:
+    """First, last and evenly spaced cell indices"""
+    if count <= samples:
+        return list(range(count))
+    step = (count - 1) / (samples - 1)
+    return sorted({round(i * step) for i in range(samples)})
+
+
+def _wilson_upper(passed: float, total: float, z: float = WILSON_Z) -> float:
+    """Upper confidence bound of a pass rate"""
+    if total <= 0:
+        return 1.0
+    p = passed / total
+    denom = 1 + z * z / total
+    centre = p + z * z / (2 * total)
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total))
+    return min(1.0, (centre + margin) / denom)
+
+
+class PairingTriage:
+    """Fast XDF/BIN plausibility scoring with early stopping"""
+
+    def __init__(self, exporter: UniversalXDFExporter, samples: int = TABLE_SAMPLE_CELLS,
+                 seed: int = 0):
+        """
+        Initialize triage
+
+        Args:
+            exporter: Exporter with the XDF parsed and the BIN loaded
+            samples: Table cells sampled per table
+            seed: Shuffle seed (fixed so results are reproducible)
+        """
+        self.exporter = exporter
+        self.samples = max(2, samples)
+        self.seed = seed
+        # (equation, size, signed, min, max) -> range rejects some raw values
+        self._informative: Dict[Tuple, bool] = {}
+
+    def _range_informative(self, equation: Optional[str], size_bits: int, signed: bool,
+                           low: Optional[float], high: Optional[float]) -> bool:
+        """
+        Whether a declared range can reject anything
+
+        A range that contains the converted value of both raw extremes
+        (e.g. 0-255 on an unscaled byte) says nothing about the pairing.
+        """
+        if low is None and high is None:
+            return False
+        key = (equation, size_bits, signed, low, high)
+        cached = self._informative.get(key)
+        if cached is None:
+            raw_lo, raw_hi = _raw_extremes(size_bits, signed)
+            cached = not all(
+                _in_range(self.exporter.convert_raw_value(equation, raw, quiet=True), low, high)
+                for raw in (raw_lo, raw_hi)
+            )
+            self._informative[key] = cached
+        return cached
+
+    def _check_scalar(self, const: Dict) -> Optional[Tuple[str, bool, str]]:
+        """Check one scalar; returns (kind, passed, reason) or None to skip"""
+        ex = self.exporter
+        size_bits = const['size']
+        informative = size_bits in (8, 16, 32) and self._range_informative(
+            const.get('equation'), size_bits, const.get('signed', False),
+            const.get('min'), const.get('max'))
+        kind = 'scalar_range' if informative else 'scalar'
+
+        raw = ex.read_value_from_bin(const['address'], size_bits,
+                                     signed=const.get('signed', False),
+                                     lsb_first=const.get('lsb_first', False))
+        if raw is None:
+            return kind, False, "address out of range"
+        if _is_erased(raw, size_bits):
+            return None  # 0xFF is a legitimate scalar value as often as erased flash
+        if informative:
+            value = ex.convert_raw_value(const.get('equation'), raw, quiet=True)
+            if not _in_range(value, const.get('min'), const.get('max')):
+                return kind, False, f"{value:g} outside {const.get('min')}..{const.get('max')}"
+        return kind, True, ""
+
+    def _check_table(self, table: Dict) -> Optional[Tuple[str, bool, str]]:
+        """Check sampled cells of one table; None if it has no data cells"""
+        ex = self.exporter
+        addresses = ex._table_cell_addresses(table)
+        if not addresses:
+            return None
+
+        z_axis = table['axes'].get('z', {})
+        size_bits = z_axis.get('size_bits', 8)
+        signed = z_axis.get('signed', False)
+        equation = z_axis.get('equation')
+        low, high = z_axis.get('min'), z_axis.get('max')
+        informative = size_bits in (8, 16, 32) and self._range_informative(
+            equation, size_bits, signed, low, high)
+        kind = 'table_range' if informative else 'table'
+
+        # Each sampled cell is read together with its right-hand neighbour
+        # (the one to its left on the last column) for the smoothness check;
+        # single-column tables have no row neighbour
+        _, cols = ex._table_dimensions(table)
+        indices = _sample_indices(len(addresses), self.samples)
+        neighbours = ([i + 1 if (i % cols) < cols - 1 else i - 1 for i in indices]
+                      if cols >= 2 else [])
+        cells = indices + neighbours
+        raws = ex.read_raw_values([addresses[i] for i in cells], size_bits,
+                                  signed=signed, lsb_first=z_axis.get('lsb_first', False))
+        if raws is None:
+            return kind, False, "cells out of range"
+        if all(_is_erased(raw, size_bits) for raw in raws):
+            return kind, False, "erased (0xFF)"
+
+        converted = [
+            ex.convert_raw_value(equation, raw,
+                                 ex._table_axis_context(table, i // cols, i % cols), quiet=True)
+            for i, raw in zip(cells, raws)
+        ]
+        values = converted[:len(indices)]
+        if all(v == 0.0 for v in converted):
+            return kind, False, "sampled cells all zero"
+        if len(addresses) > 4 and len(set(converted)) == 1:
+            return kind, False, f"sampled cells all {values[0]:g}"
+
+        # Calibration tables change gradually between neighbouring cells;
+        # bytes read through the wrong definition look like noise
+        spread = max(converted) - min(converted)
+        if cols >= MIN_SMOOTH_COLS and spread > 0:
+            steps = [abs(a - b) for a, b in zip(values, converted[len(indices):])]
+            roughness = sum(steps) / len(steps) / spread
+            if roughness > MAX_NEIGHBOUR_ROUGHNESS:
+                return kind, False, f"neighbouring cells jump {roughness:.0%} of the sampled spread"
+        if informative:
+            inside = sum(1 for v in values if _in_range(v, low, high))
+            if inside < TABLE_IN_RANGE_FRACTION * len(values):
+                return kind, False, f"{len(values) - inside}/{len(values)} sampled cells outside {low}..{high}"
+        return kind, True, ""
+
+    def _check_patch(self, patch: Dict) -> Tuple[str, bool, str]:
+        status = self.exporter.patch_status(patch)
+        if status in ('applied', 'not_applied'):
+            return 'patch', True, ""
+        return 'patch', False, f"patch bytes match neither patch nor base ({status})"
+
+    def run(self, budget_ms: Optional[float] = None, early_stop: bool = True) -> Dict:
+        """
+        Score the pairing
+
+        Args:
+            budget_ms: Optional time budget; stops with the score so far
+            early_stop: Stop once the pairing is clearly a mismatch
+
+        Returns:
+            Dict: score, verdict, checks, evidence, stopped ('early',
+                  'budget' or None), elapsed_ms, per-kind counts and
+                  up to 10 example failures
+        """
+        start = time.perf_counter()
+        elements = self.exporter.elements
+
+        # Scalars, tables and patches interleaved in a reproducible random
+        # order, so no single element kind decides an early stop alone
+        queue = ([('scalar', c) for c in elements['constants']] +
+                 [('table', t) for t in elements['tables']] +
+                 [('patch', p) for p in elements['patches']])
+        random.Random(self.seed).shuffle(queue)
+
+        checkers = {'scalar': self._check_scalar, 'table': self._check_table,
+                    'patch': self._check_patch}
+        by_kind = {kind: {'passed': 0, 'total': 0} for kind in WEIGHTS}
+        failures = []
+        passed_weight = 0.0
+        total_weight = 0.0
+        checks = 0
+        calibration_checks = 0
+        stopped = None
+
+        for source, element in queue:
+            outcome = checkers[source](element)
+            if outcome is None:
+                continue
+            kind, passed, reason = outcome
+            weight = WEIGHTS[kind]
+            checks += 1
+            if kind != 'patch':
+                calibration_checks += 1
+            total_weight += weight
+            by_kind[kind]['total'] += 1
+            if passed:
+                passed_weight += weight
+                by_kind[kind]['passed'] += 1
+            elif len(failures) < 10:
+                failures.append({'kind': kind, 'title': element.get('title', ''),
+                                 'reason': reason})
+
+            if (early_stop and calibration_checks >= MIN_CHECKS and total_weight >= MIN_EVIDENCE
+                    and _wilson_upper(passed_weight, total_weight) < MISMATCH_SCORE):
+                stopped = 'early'
+                break
+            if budget_ms is not None and (time.perf_counter() - start) * 1000 >= budget_ms:
+                stopped = 'budget'
+                break
+
+        score = passed_weight / total_weight if total_weight else 0.0
+        if stopped == 'early':
+            verdict = 'mismatch'
+        elif total_weight < MIN_EVIDENCE:
+            verdict = 'unknown'
+        elif score >= PLAUSIBLE_SCORE:
+            verdict = 'plausible'
+        elif score >= MISMATCH_SCORE:
+            verdict = 'doubtful'
+        else:
+            verdict = 'mismatch'
+
+        return {
+            'score': round(score, 4),
+            'verdict': verdict,
+            'checks': checks,
+            'available': len(queue),
+            'evidence': round(total_weight, 2),
+            'stopped': stopped,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+            'by_kind': {k: v for k, v in by_kind.items() if v['total']},
+            'failures': failures
+        }
+
+
+def triage_pair(xdf_path: str, bin_path: str, budget_ms: Optional[float] = None,
+                samples: int = TABLE_SAMPLE_CELLS,
+                exporter: Optional[UniversalXDFExporter] = None) -> Dict:
+    """
+    Parse (or reuse) a definition, load a BIN and triage the pairing
+
+    Args:
+        xdf_path: XDF definition file
+        bin_path: BIN file
+        budget_ms: Optional time budget for the checks
+        samples: Table cells sampled per table
+        exporter: Optional already-parsed definition to reuse via for_bin()
+
+    Returns:
+        Dict: PairingTriage.run() result plus 'xdf', 'bin', 'definition'
+              and 'parse_ms'
+
+    Raises:
+        ValueError: If the XDF or BIN cannot be loaded
+    """
+    start = time.perf_counter()
+    if exporter is None:
+        exporter = UniversalXDFExporter(xdf_path, bin_path)
+        if not exporter.parse_xdf():
+            raise ValueError(f"XDF parsing failed: {xdf_path}")
+    else:
+        exporter = exporter.for_bin(bin_path)
+    if not exporter.validate_bin_file():
+        raise ValueError(f"Binary validation failed: {bin_path}")
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    result = PairingTriage(exporter, samples=samples).run(budget_ms=budget_ms)
+    result.update({
+        'xdf': str(xdf_path),
+        'bin': str(bin_path),
+        'definition': exporter.definition_name,
+        'parse_ms': round(parse_ms, 2)
+    })
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Triage command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py triage",
+        description="Quickly score whether an XDF plausibly matches a BIN"
+    )
+    parser.add_argument('xdf', help="XDF definition file")
+    parser.add_argument('bins', nargs='+', help="BIN file(s) to check")
+    parser.add_argument('--budget', type=float, default=None, metavar='MS',
+                        help="Stop checking after this many milliseconds per BIN")
+    parser.add_argument('--samples', type=int, default=TABLE_SAMPLE_CELLS,
+                        help=f"Table cells sampled per table (default: {TABLE_SAMPLE_CELLS})")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('tunerpro_exporter').setLevel(logging.ERROR)
+
+    template = UniversalXDFExporter(args.xdf, "")
+    if not template.parse_xdf():
+        print(f"❌ XDF parsing failed: {args.xdf}")
+        return 1
+
+    results = []
+    for bin_path in args.bins:
+        try:
+            results.append(triage_pair(args.xdf, bin_path, args.budget, args.samples,
+                                       exporter=template))
+        except ValueError as e:
+            results.append({'bin': bin_path, 'verdict': 'error', 'error': str(e)})
+
+    if args.json:
+        print(json.dumps(results if len(results) > 1 else results[0], indent=2))
+    else:
+        marks = {'plausible': "✓", 'doubtful': "?", 'mismatch': "✗",
+                 'unknown': "·", 'error': "❌"}
+        print(f"Definition: {template.definition_name}")
+        for result in results:
+            name = Path(result['bin']).name
+            if result['verdict'] == 'error':
+                print(f"  {marks['error']} {name}: {result['error']}")
+                continue
+            note = " (stopped early)" if result['stopped'] == 'early' else ""
+            if result['stopped'] == 'budget':
+                note = " (time budget reached)"
+            print(f"  {marks[result['verdict']]} {name}: {result['verdict']} "
+                  f"score {result['score']:.2f} - {result['checks']}/{result['available']} "
+                  f"checks in {result['elapsed_ms']:.1f} ms{note}")
+            for failure in result['failures'][:5]:
+                print(f"      {failure['kind']}: {failure['title']} - {failure['reason']}")
+
+    return 0 if all(r['verdict'] == 'plausible' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ KingAI TunerPro XDF + BIN Universal Exporter - Watch Mode
+===============================================================================
+
+ Re-export automatically whenever a BIN (or its XDF) is saved.
+
+ - Pure polling (os.stat) - no platform-specific file watcher dependencies
+ - Debounced: waits until a file has stopped changing before exporting,
+   so TunerPro's multi-step saves only trigger one export
+ - Parsed XDFs are kept warm in memory and only re-parsed when the XDF
+   itself changes; a BIN save costs one BIN read + the requested writers
+ - Saves that don't change the BIN contents (same MD5) are skipped
+
+ Usage:
+   python tunerpro_exporter.py watch <xdf> <bin> <output> [<xdf> <bin> <output> ...]
+                                     [-f formats] [--interval S] [--debounce S]
+
+   <output> is a base path; each format is written as <output>.<format>
+
+===============================================================================
+ Author:       Jason King
+ GitHub:       https://github.com/KingAiCodeForge
+===============================================================================
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from tunerpro_exporter import (
+    UniversalXDFExporter, EXPORT_WRITERS, resolve_formats, __version__
+)
+
+
+# (mtime_ns, size) - None when the file is missing
+FileSignature = Optional[Tuple[int, int]]
+
+
+def _file_signature(path: Path) -> FileSignature:
+    """Cheap change signature for polling"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ExportWatcher:
+    """Polls XDF/BIN pairs and re-exports them when they change"""
+
+    def __init__(self, formats: List[str], debounce: float = 0.5):
+        """
+        Initialize watcher
+
+        Args:
+            formats: Export formats to write (keys of EXPORT_WRITERS)
+            debounce: Seconds a file must be unchanged before re-exporting
+        """
+        self.formats = formats
+        self.debounce = debounce
+        self.logger = logging.getLogger(__name__)
+
+        self.pairs: List[Dict] = []
+
+        # Warm definition cache: xdf path -> {'signature', 'template'}
+        self.definitions: Dict[str, Dict] = {}
+
+    def add_pair(self, xdf_path: str, bin_path: str, output_base: str):
+        """Register an XDF/BIN pair to watch"""
+        self.pairs.append({
+            'xdf': Path(xdf_path),
+            'bin': Path(bin_path),
+            'output_base': str(output_base),
+            'signature': None,      # (xdf sig, bin sig) last seen
+            'changed_at': None,     # monotonic time of last detected change
+            'exported': None,       # (xdf sig, bin md5) of last export
+        })
+
+    def _get_definition(self, xdf_path: Path) -> Optional[UniversalXDFExporter]:
+        """Return the parsed XDF, re-parsing only if the file changed"""
+        key = str(xdf_path)
+        signature = _file_signature(xdf_path)
+        cached = self.definitions.get(key)
+        if cached is not None and cached['signature'] == signature:
+            return cached['template']
+
+        template = UniversalXDFExporter(key, "")
+        if not template.parse_xdf():
+            self.definitions.pop(key, None)
+            return None
+        self.definitions[key] = {'signature': signature, 'template': template}
+        return template
+
+    def export_pair(self, pair: Dict) -> Dict:
+        """
+        Export one pair now using the warm definition
+
+        Returns:
+            Dict: status ('ok', 'unchanged', 'failed'), outputs, elapsed_s, error
+        """
+        start = time.perf_counter()
+        result = {'bin': str(pair['bin']), 'status': 'failed', 'outputs': [], 'error': None}
+
+        template = self._get_definition(pair['xdf'])
+        if template is None:
+            result['error'] = f"XDF parsing failed: {pair['xdf']}"
+        else:
+            exporter = template.for_bin(str(pair['bin']))
+            if not exporter.validate_bin_file():
+                result['error'] = f"Binary validation failed: {pair['bin']}"
+            else:
+                xdf_sig = self.definitions[str(pair['xdf'])]['signature']
+                state = (xdf_sig, exporter.bin_md5)
+                if state == pair['exported']:
+                    result['status'] = 'unchanged'
+                else:
+                    failed = []
+                    for fmt in self.formats:
+                        output_path = f"{pair['output_base']}.{fmt}"
+                        if getattr(exporter, EXPORT_WRITERS[fmt])(output_path):
+                            result['outputs'].append(output_path)
+                        else:
+                            failed.append(fmt)
+                    if failed:
+                        result['error'] = f"Export failed for: {', '.join(failed)}"
+                    else:
+                        result['status'] = 'ok'
+                        pair['exported'] = state
+
+        result['elapsed_s'] = round(time.perf_counter() - start, 4)
+        return result
+
+    def poll(self, now: Optional[float] = None) -> List[Dict]:
+        """
+        Check all pairs once and export those whose changes have settled
+
+        Args:
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            List[Dict]: Export results for pairs processed during this poll
+        """
+        now = time.monotonic() if now is None else now
+        results = []
+
+        for pair in self.pairs:
+            signature = (_file_signature(pair['xdf']), _file_signature(pair['bin']))
+
+            if signature != pair['signature']:
+                # Still being written (or first sighting) - restart debounce timer
+                pair['signature'] = signature
+                pair['changed_at'] = now
+                continue
+
+            if pair['changed_at'] is None or now - pair['changed_at'] < self.debounce:
+                continue
+
+            pair['changed_at'] = None
+            if None in signature:
+                continue  # File missing - wait for it to reappear
+
+            results.append(self.export_pair(pair))
+
+        return results
+
+    def run(self, interval: float = 0.25, max_polls: Optional[int] = None):
+        """
+        Poll until interrupted (Ctrl+C) or max_polls is reached
+
+        Args:
+            interval: Seconds between polls
+            max_polls: Optional poll limit (None = run forever)
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                for result in self.poll():
+                    self._report(result)
+                polls += 1
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nWatch stopped.")
+
+    def _report(self, result: Dict):
+        """Print a one-line status for an export"""
+        stamp = datetime.now().strftime('%H:%M:%S')
+        name = Path(result['bin']).name
+        if result['status'] == 'ok':
+            print(f"[{stamp}] ✓ {name} re-exported in {result['elapsed_s']:.3f}s "
+                  f"({', '.join(Path(p).name for p in result['outputs'])})")
+        elif result['status'] == 'unchanged':
+            print(f"[{stamp}] = {name} saved without changes - skipped")
+        else:
+            print(f"[{stamp}] ✗ {name}: {result['error']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Watch command-line interface"""
+    parser = argparse.ArgumentParser(
+        prog="tunerpro_exporter.py watch",
+        description="Re-export XDF/BIN pairs whenever the BIN or XDF is saved"
+    )
+    parser.add_argument('pairs', nargs='+', metavar='XDF BIN OUTPUT',
+                        help="One or more XDF/BIN/output-base triples")
+    parser.add_argument('-f', '--format', default='txt',
+                        help="txt, json, md, comma list, or all (default: txt)")
+    parser.add_argument('--interval', type=float, default=0.25,
+                        help="Seconds between polls (default: 0.25)")
+    parser.add_argument('--debounce', type=float, default=0.5,
+                        help="Seconds a file must be unchanged before exporting (default: 0.5)")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show per-export log messages")
+    args = parser.parse_args(argv)
+
+    if len(args.pairs) % 3 != 0:
+        parser.error("pairs must be given as XDF BIN OUTPUT triples")
+    try:
+        formats = resolve_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not args.verbose:
+        logging.getLogger('tunerpro_exporter').setLevel(logging.WARNING)
+
+    watcher = ExportWatcher(formats, debounce=args.debounce)
+    for i in range(0, len(args.pairs), 3):
+        watcher.add_pair(*args.pairs[i:i + 3])
+
+    print("=" * 70)
+    print(f"  KingAI TunerPro Exporter v{__version__} - Watch Mode")
+    print("=" * 70)
+    for pair in watcher.pairs:
+        print(f"  {pair['xdf'].name} + {pair['bin'].name} -> {pair['output_base']}.*")
+    print(f"Formats: {', '.join(formats)}  (Ctrl+C to stop)")
+    print()
+
+    watcher.run(interval=args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())